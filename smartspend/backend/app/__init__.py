@@ -1,7 +1,15 @@
 from flask import Flask, jsonify
+from werkzeug.middleware.proxy_fix import ProxyFix
 from .config import Config
 from .extensions import db, cors
 from .errors import register_error_handlers
+from .cli import register_commands
+from .utils.compression import register_compression
+from .utils.db_pool import engine_options, instrument, is_memory_sqlite, pool_status
+from .utils.db_routing import register_db_routing
+from .utils.json_provider import register_json_provider
+from .utils.request_metrics import register_request_metrics
+from .utils.sql_profile import register_sql_profiling
 
 
 def register_blueprints(app: Flask):
@@ -31,8 +39,28 @@ def register_blueprints(app: Flask):
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    if app.config["TRUSTED_PROXIES"]:
+        hops = app.config["TRUSTED_PROXIES"]
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+    register_json_provider(app)
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
+    # Flask-SQLAlchemy gives URL-only binds none of SQLALCHEMY_ENGINE_OPTIONS;
+    # the replica gets the same pool settings as the primary
+    app.config["SQLALCHEMY_BINDS"] = {
+        key: ({"url": uri, **engine_options({**app.config, "SQLALCHEMY_DATABASE_URI": uri})}
+              if isinstance(uri, str) else uri)
+        for key, uri in (app.config.get("SQLALCHEMY_BINDS") or {}).items()
+    }
 
     db.init_app(app)
+    with app.app_context():
+        for bind_key, engine in db.engines.items():
+            instrument(engine, bind_key or "default")
+        if is_memory_sqlite(app.config["SQLALCHEMY_DATABASE_URI"]):
+            # a private in-memory DB starts empty every time (tests, benches)
+            from . import models  # noqa: F401
+
+            db.create_all()
 
     cors.init_app(
         app,
@@ -41,11 +69,53 @@ def create_app():
         allow_headers=["Content-Type", "Authorization"],
     )
 
+    from .services.identity import register_identity
+
+    register_compression(app)   # first registered after_request runs last: sees the final body
+    register_request_metrics(app)  # before identity: its before_request starts the clock
+    register_identity(app)
+    register_db_routing(app)    # after identity: routing reads g.claims
+    register_sql_profiling(app)
     register_blueprints(app)
     register_error_handlers(app)
+    register_commands(app)
 
     @app.get("/")
     def health():
         return jsonify({"ok": True, "service": "smartspend-backend"})
 
+    @app.get("/health/db-pool")
+    def health_db_pool():
+        """This worker's pool state plus checkout-wait / in-use metrics."""
+        from .services.metrics import REGISTRY
+
+        return jsonify({"pool": pool_status(db.engine), "metrics": REGISTRY.snapshot(prefix="db_pool_")})
+
+    @app.get("/ready")
+    def ready():
+        """
+        Readiness: 200 once this worker is warmed up (services/warmup.py)
+        and the DB answers, 503 before. `/` stays a plain liveness check.
+        """
+        from sqlalchemy import text
+
+        from .services.warmup import warm_up
+
+        st = warm_up(blocking=False)
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            st["db"] = True
+        except Exception as e:
+            st["db"], st["errors"]["db"] = False, f"{type(e).__name__}: {e}"
+        st["ready"] = st["ready"] and st["db"]
+        return jsonify(st), 200 if st["ready"] else 503
+
+    if app.config.get("WARMUP_ON_START"):
+        from .services.warmup import warm_up
+
+        with app.app_context():
+            st = warm_up()
+        app.logger.info("warm-up: %s", st)
+
     return app
@@ -8,24 +8,38 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple, Dict, Any
 
 import jwt
-from passlib.hash import pbkdf2_sha256 as pwd_hasher
 
 from .config import Config
+from .services import password_pool
+from .utils.cache import LRUCache
 
 
 # ---------------------------
 # Password hashing utilities
 # ---------------------------
 
+# PBKDF2 runs in services.password_pool (a bounded process pool) so a burst
+# of logins cannot pin every request thread; both raise
+# password_pool.PasswordPoolBusy when the pool is full.
+
 def hash_password(plain: str) -> str:
     """
-    Strong, bcrypt-free (no 72-byte limit). Safe defaults from passlib.
+    Strong, bcrypt-free (no 72-byte limit). pbkdf2_sha256 at
+    PASSWORD_PBKDF2_ROUNDS.
     """
-    return pwd_hasher.hash(plain)
+    return password_pool.hash_password(plain)
 
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_hasher.verify(plain, hashed)
+    return password_pool.verify_and_update(plain, hashed)[0]
+
+
+def verify_and_update(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """
+    (ok, new_hash). new_hash is set when `hashed` was made with other
+    parameters than the current ones; store it in place of the old hash.
+    """
+    return password_pool.verify_and_update(plain, hashed)
 
 
 # ---------------------------
@@ -75,6 +89,33 @@ def decode_access(token: str, verify_exp: bool = True) -> Dict[str, Any]:
     )
 
 
+# Verified token -> claims. A token's claims never change, so an entry is
+# good until the token's own exp (capped at ACCESS_CACHE_MAX_TTL_SEC); only
+# tokens that passed full verification are stored.
+_claims_cache = LRUCache(maxsize=max(Config.ACCESS_CACHE_SIZE, 1), name="access_token")
+
+
+def decode_access_cached(token: str) -> Dict[str, Any]:
+    """
+    decode_access() with a per-process cache of verified tokens.
+    Same exceptions; ACCESS_CACHE_SIZE=0 disables the cache.
+    """
+    if Config.ACCESS_CACHE_SIZE <= 0:
+        return decode_access(token)
+    hit = _claims_cache.get(token)
+    if hit is not None:
+        return dict(hit)
+    claims = decode_access(token)
+    ttl = min(float(claims["exp"]) - time.time(), Config.ACCESS_CACHE_MAX_TTL_SEC)
+    if ttl > 0:
+        _claims_cache.set(token, claims, ttl=ttl)
+    return dict(claims)
+
+
+def access_cache_stats() -> dict:
+    return _claims_cache.stats()
+
+
 # ---------------------------
 # Refresh token (opaque)
 # ---------------------------
@@ -2,10 +2,12 @@
 from __future__ import annotations
 from datetime import datetime
 from flask import Blueprint, request
-from sqlalchemy import text
+from sqlalchemy import DateTime, text
 
 from ..extensions import db
 from ..errors import problem
+from ..services.identity import require_user, token_claims
+from ..utils.fields import sparse
 
 bp = Blueprint("achievements", __name__)
 
@@ -14,15 +16,6 @@ TBL_ACH = "achievement"         # or "acheivements"
 TBL_USER_ACH = "user_achievement"  # or "user_acheivement"
 
 # ------------------------ helpers ------------------------
-def _require_user(user_id: int):
-    row = db.session.execute(
-        text("SELECT id FROM `user` WHERE id=:uid"),
-        {"uid": user_id}
-    ).mappings().first()
-    if not row:
-        raise ValueError("user_not_found")
-    return row
-
 def _get_achievement_by_code(code: str):
     return db.session.execute(
         text(f"""
@@ -48,7 +41,7 @@ def achievements_catalog():
                 SELECT id, code, name, description, icon, is_active, created_at
                 FROM `{TBL_ACH}`
                 ORDER BY is_active DESC, created_at DESC
-            """)
+            """).columns(created_at=DateTime)
         ).mappings().all()
     else:
         rows = db.session.execute(
@@ -57,10 +50,10 @@ def achievements_catalog():
                 FROM `{TBL_ACH}`
                 WHERE is_active = 1
                 ORDER BY created_at DESC
-            """)
+            """).columns(created_at=DateTime)
         ).mappings().all()
 
-    return {"items": [dict(r) for r in rows]}, 200
+    return {"items": sparse(dict(r) for r in rows)}, 200
 
 
 @bp.get("/achievements/user")
@@ -71,9 +64,9 @@ def user_achievements():
     """
     try:
         user_id = int(request.args.get("user_id", "0"))
-        if not user_id:
+        if not user_id and not token_claims():
             return problem(400, "validation_error", "user_id required")
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except ValueError:
         return problem(400, "validation_error", "user_id invalid")
     except Exception:
@@ -92,7 +85,7 @@ def user_achievements():
             JOIN `{TBL_ACH}` a ON a.id = ua.achievement_id
             WHERE ua.user_id = :uid
             ORDER BY ua.earned_at DESC, ua.id DESC
-        """),
+        """).columns(earned_at=DateTime),
         {"uid": user_id}
     ).mappings().all()
 
@@ -110,9 +103,9 @@ def earn_achievement():
     try:
         user_id = int(d.get("user_id") or 0)
         code = (d.get("code") or "").strip()
-        if not user_id or not code:
+        if (not user_id and not token_claims()) or not code:
             raise ValueError
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except ValueError:
         return problem(400, "validation_error", "valid user_id & code required")
     except Exception:
@@ -131,7 +124,7 @@ def earn_achievement():
             FROM `{TBL_USER_ACH}`
             WHERE user_id=:uid AND achievement_id=:aid
             LIMIT 1
-        """),
+        """).columns(earned_at=DateTime),
         {"uid": user_id, "aid": ach["id"]}
     ).mappings().first()
     if owned:
@@ -176,7 +169,7 @@ def earn_achievement():
                 FROM `{TBL_USER_ACH}`
                 WHERE user_id=:uid AND achievement_id=:aid
                 LIMIT 1
-            """),
+            """).columns(earned_at=DateTime),
             {"uid": user_id, "aid": ach["id"]}
         ).mappings().first()
         if owned2:
@@ -200,7 +193,7 @@ def earn_achievement():
             SELECT ua.id AS user_achievement_id, ua.earned_at
             FROM `{TBL_USER_ACH}` ua
             WHERE ua.id = :id
-        """),
+        """).columns(earned_at=DateTime),
         {"id": user_ach_id}
     ).mappings().first()
 
@@ -224,10 +217,9 @@ def revoke_user_achievement(user_achievement_id: int):
     Query/body may include user_id to ensure ownership (safety).
     """
     uid = request.args.get("user_id") or (request.get_json(silent=True) or {}).get("user_id")
-    if uid:
+    if uid or token_claims():
         try:
-            uid = int(uid)
-            _require_user(uid)
+            uid = require_user(int(uid or 0)).id
         except Exception:
             return problem(400, "validation_error", "valid user_id required (if provided)")
 
@@ -9,16 +9,27 @@ from ..extensions import db
 from ..models import User, RefreshToken
 from ..auth_utils import (
     hash_password,
-    verify_password,
+    verify_and_update,
     mint_access,
     mint_refresh,
     hash_refresh,
     refresh_expiry,
 )
 from ..errors import problem
+from ..services.password_pool import PasswordPoolBusy
+from ..services.rate_limit import auth_wait
+from ..services.refresh_tokens import find_active
+from ..utils.db_routing import acting_user
 
 bp = Blueprint("auth", __name__)
 
+
+@bp.errorhandler(PasswordPoolBusy)
+def _password_pool_busy(e):
+    body, status, headers = problem(503, "busy", "Too many sign-ins right now, retry shortly")
+    headers["Retry-After"] = "1"
+    return body, status, headers
+
 # ---------- helpers ----------
 
 def weak_password(pw: str) -> bool:
@@ -31,12 +42,22 @@ def weak_password(pw: str) -> bool:
     )
 
 def _client_ip():
-    # simple best-effort
-    return request.headers.get("X-Forwarded-For", "").split(",")[0].strip() or request.remote_addr
+    # X-Forwarded-For is only honoured for TRUSTED_PROXIES hops (ProxyFix in
+    # create_app); the raw header is client-controlled and must not key limits
+    return request.remote_addr
 
 def _ua():
     return request.headers.get("User-Agent")
 
+def _throttled(email: str):
+    """429 problem if this IP or email is over its auth budget, else None."""
+    wait = auth_wait(_client_ip(), email)
+    if not wait:
+        return None
+    body, status, headers = problem(429, "rate_limited", "Too many attempts, retry later")
+    headers["Retry-After"] = str(wait)
+    return body, status, headers
+
 def _user_json(u: User) -> dict:
     return {"id": u.id, "name": u.name, "email": u.email, "status": u.status}
 
@@ -51,6 +72,9 @@ def signup():
 
     if not name or not email or not pw:
         return problem(400, "validation_error", "name, email, password required")
+    limited = _throttled(email)
+    if limited:
+        return limited
     if weak_password(pw):
         return problem(400, "weak_password", "Use ≥8 chars incl. upper, number, special")
 
@@ -68,6 +92,7 @@ def signup():
         return problem(409, "email_exists", "Email already registered")
 
     access = mint_access(user.id, scope="onboarding")
+    acting_user(user.id)   # its next GETs read from the primary
 
     # FE convenience: return user object + default onboarding step
     return {
@@ -84,13 +109,25 @@ def login():
     email = (data.get("email") or "").lower().strip()
     pw = data.get("password") or ""
 
+    # before any lookup or PBKDF2 work
+    limited = _throttled(email)
+    if limited:
+        return limited
+
     user = User.query.filter_by(email=email).first()
-    if not user or not verify_password(pw, user.password_hash):
+    if not user:
         return problem(401, "invalid_credentials", "Email or password is incorrect")
+    ok, new_hash = verify_and_update(pw, user.password_hash)
+    if not ok:
+        return problem(401, "invalid_credentials", "Email or password is incorrect")
+    if new_hash:
+        # rounds changed since this hash was made; committed with the refresh row below
+        user.password_hash = new_hash
 
     # Access for everyone
     scope = "onboarding" if user.status == "pending_onboarding" else "app"
     access = mint_access(user.id, scope)
+    acting_user(user.id)
 
     res = {
         "access": access,
@@ -118,6 +155,8 @@ def login():
     else:
         # pending_onboarding: tell FE which screen to show
         res["onboarding"] = {"step": "balance"}
+        if new_hash:
+            db.session.commit()
 
     return res, 200
 
@@ -141,21 +180,11 @@ def refresh():
     if not user or user.status != "active":
         return problem(401, "invalid_user", "User not active")
 
-    # find latest valid refresh token for this user that matches hash
+    # point lookup on the unique token_hash index; owner/revoked/expiry checked on the row
     hashed_in = hash_refresh(plain_in)
     now = datetime.utcnow()
 
-    row = (
-        RefreshToken.query
-        .filter(
-            RefreshToken.user_id == user.id,
-            RefreshToken.token_hash == hashed_in,
-            RefreshToken.revoked_at.is_(None),
-            RefreshToken.expires_at > now,
-        )
-        .order_by(RefreshToken.id.desc())
-        .first()
-    )
+    row = find_active(hashed_in, user.id, now)
 
     if not row:
         return problem(401, "invalid_refresh", "Refresh token is invalid or expired")
@@ -8,7 +8,8 @@ from flask import Blueprint, request
 
 from ..extensions import db
 from ..errors import problem
-from ..models import User, Bill, Transaction, MonthlyPeriod
+from ..services.identity import require_user, token_claims
+from ..models import Bill, Transaction, MonthlyPeriod
 try:
     from ..models import BillPayment, BillOccurrence  # optional models
 except Exception:  # pragma: no cover
@@ -16,7 +17,9 @@ except Exception:  # pragma: no cover
     BillOccurrence = None  # type: ignore
 
 from ..services.periods import get_or_create_period
+from ..services.power_save import reevaluate_after_write
 from ..services.category_service import resolve_category_id_or_default
+from ..utils.fields import sparse
 from ..utils.tz import get_zoneinfo
 
 bp = Blueprint("bills", __name__)
@@ -26,13 +29,6 @@ _VALID_RULES = {"weekly", "biweekly", "monthly"}
 _STATUS = {"active", "paused"}
 
 
-def _require_user(user_id: int) -> User:
-    u = User.query.get(user_id)
-    if not u:
-        raise ValueError("user_not_found")
-    return u
-
-
 def _ymd(d: date) -> str:
     return d.strftime("%Y-%m-%d")
 
@@ -111,9 +107,9 @@ def list_bills():
     """
     try:
         user_id = int(request.args.get("user_id", "0"))
-        if not user_id:
+        if not user_id and not token_claims():
             return problem(400, "validation_error", "user_id required")
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except ValueError:
         return problem(400, "validation_error", "user_id invalid")
     except Exception:
@@ -203,7 +199,7 @@ def list_bills():
         }
         items.append(item)
 
-    return {"total": total, "page": page, "per_page": per_page, "items": items}, 200
+    return {"total": total, "page": page, "per_page": per_page, "items": sparse(items)}, 200
 
 
 # ------------------------------ POST /bills ------------------------------
@@ -218,7 +214,8 @@ def create_bill():
     d = request.get_json(silent=True) or {}
     try:
         user_id = int(d.get("user_id") or 0)
-        user = _require_user(user_id)
+        user = require_user(user_id)
+        user_id = user.id
     except Exception:
         return problem(400, "validation_error", "valid user_id required")
 
@@ -392,7 +389,8 @@ def pay_bill(bill_id: int):
 
     try:
         user_id = int(d.get("user_id") or 0)
-        u = _require_user(user_id)
+        u = require_user(user_id)
+        user_id = u.id
         if b.user_id != user_id:
             return problem(403, "forbidden", "Bill does not belong to user")
     except Exception:
@@ -517,6 +515,7 @@ def pay_bill(bill_id: int):
         b.next_due_date = _advance_next_due(b.next_due_date, b.recurrence_rule)
 
     db.session.commit()
+    reevaluate_after_write(user_id, u.timezone)
 
     occurred_utc = t.occurred_at.replace(tzinfo=get_zoneinfo("UTC"))
     tz = get_zoneinfo(u.timezone)
@@ -569,7 +568,8 @@ def unpay_bill(bill_id: int):
     # auth
     try:
         user_id = int(d.get("user_id") or 0)
-        _require_user(user_id)
+        u = require_user(user_id)
+        user_id = u.id
         if b.user_id != user_id:
             return problem(403, "forbidden", "Bill does not belong to user")
     except Exception:
@@ -626,6 +626,7 @@ def unpay_bill(bill_id: int):
         b.next_due_date = _rewind_prev_due(b.next_due_date, b.recurrence_rule)
 
     db.session.commit()
+    reevaluate_after_write(user_id, u.timezone)
 
     return {
         "ok": True,
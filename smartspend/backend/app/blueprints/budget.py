@@ -5,8 +5,11 @@ from typing import Optional, Tuple
 from flask import Blueprint, request
 from ..extensions import db
 from ..errors import problem
-from ..models import User, Transaction
+from ..services.identity import require_user, token_claims
+from ..models import Transaction
 from ..models import BudgetPref  # if you have it; else guard it like your other optional imports
+from ..services.periods import get_or_create_period
+from ..services.power_save import reevaluate_after_write
 from ..utils.tz import get_zoneinfo
 
 bp = Blueprint("budget", __name__)
@@ -87,10 +90,12 @@ def get_pref():
     """
     try:
         user_id = int(request.args.get("user_id", "0"))
-        if not user_id:
+        if not user_id and not token_claims():
             return problem(400, "validation_error", "user_id required")
-        u = User.query.get(user_id)
-        if not u:
+        try:
+            u = require_user(user_id)
+            user_id = u.id
+        except ValueError:
             return problem(404, "not_found", "user")
     except Exception:
         return problem(400, "validation_error", "valid user_id required")
@@ -174,31 +179,33 @@ def payday_log_income():
     Body: { user_id: number, amount_cents: number }
     Creates an 'income' transaction at 'now' (UTC). Keep it simple.
     """
-    from sqlalchemy import text
     try:
         d = request.get_json(silent=True) or {}
         user_id = int(d.get("user_id") or 0)
         amount_cents = int(d.get("amount_cents") or 0)
-        if not user_id or amount_cents <= 0:
+        if (not user_id and not token_claims()) or amount_cents <= 0:
             return problem(400, "validation_error", "user_id & positive amount_cents required")
         # sanity check user
-        u = User.query.get(user_id)
-        if not u:
+        try:
+            user = require_user(user_id)
+            user_id = user.id
+        except ValueError:
             return problem(404, "not_found", "user")
     except Exception:
         return problem(400, "validation_error", "invalid payload")
 
-    # Minimal insert (using raw SQL to avoid ORM details)
-    db.session.execute(
-        text("""
-          INSERT INTO `transaction`
-            (user_id, type, amount_cents, occurred_at, note)
-          VALUES
-            (:uid, 'income', :amt, UTC_TIMESTAMP(), 'Logged from payday modal')
-        """),
-        {"uid": user_id, "amt": amount_cents}
-    )
+    now = datetime.utcnow()
+    db.session.add(Transaction(
+        user_id=user_id,
+        period_id=get_or_create_period(user_id, now).id,
+        type="income",
+        amount_cents=amount_cents,
+        occurred_at=now,
+        timezone=user["timezone"] or "America/New_York",
+        memo="Logged from payday modal",
+    ))
     db.session.commit()
+    reevaluate_after_write(user_id, user["timezone"])
     return {"ok": True}, 200
 
 
@@ -212,10 +219,11 @@ def pref_update_default_income():
         d = request.get_json(silent=True) or {}
         user_id = int(d.get("user_id") or 0)
         default_income_cents = int(d.get("default_income_cents") or 0)
-        if not user_id:
+        if not user_id and not token_claims():
             return problem(400, "validation_error", "user_id required")
-        u = User.query.get(user_id)
-        if not u:
+        try:
+            user_id = require_user(user_id).id
+        except ValueError:
             return problem(404, "not_found", "user")
     except Exception:
         return problem(400, "validation_error", "invalid payload")
@@ -2,19 +2,14 @@
 from __future__ import annotations
 from flask import Blueprint, request
 from ..extensions import db
-from ..models.user import User
 from ..models.category import Category
 from ..errors import problem
+from ..services.identity import require_user
 from ..services.category_service import ensure_default_categories, list_categories
+from ..services import spend_forecast
 
 bp = Blueprint("categories", __name__)
 
-def _require_user(user_id: int) -> User:
-    u = User.query.get(user_id)
-    if not u:
-        raise ValueError("user_not_found")
-    return u
-
 @bp.get("/categories")
 def get_categories():
     """
@@ -25,7 +20,7 @@ def get_categories():
     """
     try:
         user_id = int(request.args.get("user_id", "0"))
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except Exception:
         return problem(400, "validation_error", "valid user_id required")
 
@@ -56,7 +51,7 @@ def create_category():
     d = request.get_json(silent=True) or {}
     try:
         user_id = int(d.get("user_id") or 0)
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except Exception:
         return problem(400, "validation_error", "valid user_id required")
 
@@ -87,6 +82,7 @@ def create_category():
     c = Category(user_id=user_id, name=name, kind=kind, parent_id=parent.id if parent else None)
     db.session.add(c)
     db.session.commit()
+    spend_forecast.invalidate(user_id)
     return {"id": c.id}, 201
 
 @bp.patch("/categories/<int:cat_id>")
@@ -109,6 +105,7 @@ def update_category(cat_id: int):
         return problem(409, "conflict", "category name already exists for this user")
     c.name = name
     db.session.commit()
+    spend_forecast.invalidate(c.user_id)
     return {"ok": True}, 200
 
 @bp.delete("/categories/<int:cat_id>")
@@ -120,4 +117,5 @@ def soft_delete_category(cat_id: int):
         return problem(409, "conflict", "cannot delete default category")
     c.deleted_at = db.func.now()
     db.session.commit()
+    spend_forecast.invalidate(c.user_id)
     return {"ok": True}, 200
@@ -1,42 +1,20 @@
 # app/blueprints/dashboard.py
 from __future__ import annotations
-from datetime import date, timedelta, datetime
+from datetime import timedelta, datetime
 
 from flask import Blueprint, request
-from sqlalchemy import text
+from sqlalchemy import Date, DateTime, text
 
 from ..extensions import db
 from ..errors import problem
+from ..services.identity import require_user
+from ..services.runway_shadow import shadow_runway
+from ..utils.dates import days_ago, days_ahead, since_utc, today as utc_today
 
 bp = Blueprint("dashboard", __name__)
 
 # ------------------------ helpers ------------------------
 
-def _require_user(user_id: int):
-    row = db.session.execute(
-        text("SELECT id, timezone FROM `user` WHERE id=:uid"),
-        {"uid": user_id},
-    ).mappings().first()
-    if not row:
-        raise ValueError("user_not_found")
-    return row
-
-
-def _current_goal_days(user_id: int) -> int:
-    v = db.session.execute(
-        text("""
-            SELECT target_days
-            FROM goal_runway
-            WHERE user_id=:uid
-              AND (effective_to IS NULL OR effective_to >= CURRENT_DATE)
-            ORDER BY effective_from DESC
-            LIMIT 1
-        """),
-        {"uid": user_id},
-    ).scalar()
-    return int(v or 30)
-
-
 def _estimate_current_balance_cents(user_id: int) -> int:
     v = db.session.execute(
         text("""
@@ -66,9 +44,9 @@ def _avg_daily_burn_cents(user_id: int, window_days: int = 30) -> int:
             ), 0) AS exp_c
             FROM `transaction`
             WHERE user_id=:uid
-              AND DATE(txn_date_local) >= (CURRENT_DATE - INTERVAL :win DAY)
+              AND txn_date_local >= :since
         """),
-        {"uid": user_id, "win": window_days},
+        {"uid": user_id, "since": days_ago(window_days)},
     ).mappings().first()
 
     total_exp = max(int(agg["exp_c"] or 0), 0)
@@ -94,11 +72,9 @@ def _last7_burn_cents(user_id: int) -> int:
             FROM `transaction`
             WHERE user_id = :uid
               AND type = 'expense'
-              AND DATE(txn_date_local)
-                    BETWEEN (CURRENT_DATE - INTERVAL 7 DAY)
-                        AND (CURRENT_DATE - INTERVAL 1 DAY)
+              AND txn_date_local BETWEEN :start AND :end
         """),
-        {"uid": user_id},
+        {"uid": user_id, "start": days_ago(7), "end": days_ago(1)},
     ).scalar()
 
     return int(rows or 0)
@@ -119,12 +95,11 @@ def _upcoming_bills(user_id: int, within_days: int = 7):
             FROM bill b
             WHERE b.user_id = :uid
               AND b.next_due_date IS NOT NULL
-              AND b.next_due_date BETWEEN CURRENT_DATE
-                                      AND (CURRENT_DATE + INTERVAL :d DAY)
+              AND b.next_due_date BETWEEN :today AND :until
               AND (b.status IS NULL OR b.status = 'active')
             ORDER BY b.next_due_date ASC, b.id ASC
-        """),
-        {"uid": user_id, "d": within_days},
+        """).columns(due_date=Date),
+        {"uid": user_id, "today": utc_today(), "until": days_ahead(within_days)},
     ).mappings().all()
 
     return [dict(r) for r in rows]
@@ -138,10 +113,10 @@ def _nwg_breakdown(user_id: int, days: int):
             SELECT spend_class, COALESCE(SUM(amount_cents),0) AS cents
             FROM `transaction`
             WHERE user_id=:uid AND type='expense'
-              AND txn_date_local >= CURRENT_DATE - INTERVAL :d DAY
+              AND txn_date_local >= :since
             GROUP BY spend_class
         """),
-        {"uid": user_id, "d": days},
+        {"uid": user_id, "since": days_ago(days)},
     ).mappings().all()
 
     base = {"need": 0, "want": 0, "guilt": 0}
@@ -163,7 +138,8 @@ def _nwg_breakdown(user_id: int, days: int):
 def dashboard_kpis():
     try:
         user_id = int(request.args.get("user_id", "0"))
-        _require_user(user_id)
+        user = require_user(user_id)
+        user_id = user.id
     except:
         return problem(400, "validation_error", "valid user_id required")
 
@@ -197,6 +173,8 @@ def dashboard_kpis():
     if days_power < days_regular:
         days_power = days_regular
 
+    shadow_runway(user_id, "dashboard_kpis", balance, burn, days_regular, user["timezone"])
+
     return {
         "balance_cents": balance,
         "avg_daily_burn_cents": burn,
@@ -217,27 +195,27 @@ def dashboard_burn_series():
         days = int(request.args.get("days", "31"))
         if days < 1 or days > 120:
             days = 31
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except:
         return problem(400, "validation_error", "valid params")
 
     agg = db.session.execute(
         text("""
             SELECT
-              DATE(txn_date_local) AS d,
+              txn_date_local AS d,
               COALESCE(SUM(CASE WHEN type='expense' THEN amount_cents END),0) AS exp_c
             FROM `transaction`
             WHERE user_id=:uid
-              AND txn_date_local >= CURRENT_DATE - INTERVAL :win DAY
-            GROUP BY d
-            ORDER BY d
-        """),
-        {"uid": user_id, "win": days},
+              AND txn_date_local >= :since
+            GROUP BY txn_date_local
+            ORDER BY txn_date_local
+        """).columns(d=Date),
+        {"uid": user_id, "since": days_ago(days)},
     ).mappings().all()
 
     by_day = {r["d"]: int(r["exp_c"] or 0) for r in agg}
 
-    today = date.today()
+    today = utc_today()
     points = []
     for i in range(days - 1, -1, -1):
         d = today - timedelta(days=i)
@@ -257,7 +235,7 @@ def dashboard_nwg():
         user_id = int(request.args.get("user_id", "0"))
         r = (request.args.get("range") or "7d").lower()
         days = 1 if r == "today" else 30 if r == "30d" else 7
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except:
         return problem(400, "validation_error", "invalid params")
 
@@ -273,7 +251,7 @@ def dashboard_insights_preview():
         days = int(request.args.get("days", "7"))
         if days not in (7, 30):
             days = 7
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except:
         return problem(400, "validation_error", "invalid params")
 
@@ -282,11 +260,11 @@ def dashboard_insights_preview():
             SELECT id, source, code, title, message, severity, created_at
             FROM insight_alert
             WHERE user_id=:uid
-              AND created_at >= (UTC_TIMESTAMP() - INTERVAL :win DAY)
+              AND created_at >= :since
             ORDER BY created_at DESC
             LIMIT 3
-        """),
-        {"uid": user_id, "win": days},
+        """).columns(created_at=DateTime),
+        {"uid": user_id, "since": since_utc(days)},
     ).mappings().all()
 
     alerts = [dict(r) for r in items]
@@ -299,9 +277,9 @@ def dashboard_insights_preview():
               COALESCE(SUM(CASE WHEN type='expense' AND spend_class='want' THEN amount_cents END),0) AS wants_exp
             FROM `transaction`
             WHERE user_id=:uid
-              AND txn_date_local >= CURRENT_DATE - INTERVAL :win DAY
+              AND txn_date_local >= :since
         """),
-        {"uid": user_id, "win": days},
+        {"uid": user_id, "since": days_ago(days)},
     ).mappings().first()
 
     total = int(wants_row["total_exp"] or 0)
@@ -329,8 +307,41 @@ def dashboard_achievements_recent():
         user_id = int(request.args.get("user_id", "0"))
         limit = int(request.args.get("limit", "6"))
         limit = max(1, min(limit, 20))
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except:
         return problem(400, "validation_error", "invalid params")
 
     return {"items": []}, 200
+
+
+# ------------------------ Daily risks (batch-scored) ------------------------
+
+@bp.get("/dashboard/risks")
+def dashboard_risks():
+    """
+    Tier-3 risks precomputed by `flask score-daily-risk` (daily_risk table),
+    so the dashboard does not need a /ml/predict round-trip.
+    """
+    try:
+        user_id = int(request.args.get("user_id", "0"))
+        days = int(request.args.get("days", "7"))
+        days = max(1, min(days, 90))
+        user_id = require_user(user_id).id
+    except:
+        return problem(400, "validation_error", "invalid params")
+
+    rows = db.session.execute(
+        text("""
+            SELECT day, risk_late_night, risk_overspend, risk_guilt,
+                   need_ratio, want_ratio, guilt_ratio,
+                   spend_d, burn7_d, burn30_d, runway_days
+            FROM daily_risk
+            WHERE user_id=:uid
+              AND day >= :since
+            ORDER BY day ASC
+        """).columns(day=Date),
+        {"uid": user_id, "since": days_ago(days)},
+    ).mappings().all()
+
+    points = [dict(r, day=r["day"].isoformat()) for r in rows]
+    return {"latest": points[-1] if points else None, "points": points}, 200
@@ -1,44 +1,25 @@
 # app/blueprints/goals.py
 from __future__ import annotations
-from datetime import date, datetime, timedelta
+from datetime import datetime, timedelta
 from typing import Optional
 
 from flask import Blueprint, request
-from sqlalchemy import text
+from sqlalchemy import Date, text
 
 from ..extensions import db
 from ..errors import problem
+from ..services.identity import require_user, current_goal_days, invalidate_goal_days, token_claims
+from ..models import PowerSaveEvent
+from ..services.power_save import event_payload, reevaluate_after_write
+from ..services.runway_shadow import shadow_runway
+from ..utils.dates import days_ago, today as utc_today
+from ..utils.tz import get_zoneinfo
 
 bp = Blueprint("goals", __name__)
 
 
 # ========================= HELPERS =========================
 
-def _require_user(user_id: int):
-    row = db.session.execute(
-        text("SELECT id, timezone FROM `user` WHERE id=:uid"),
-        {"uid": user_id}
-    ).mappings().first()
-    if not row:
-        raise ValueError("user_not_found")
-    return row
-
-
-def _current_goal_days(user_id: int) -> int:
-    row = db.session.execute(
-        text("""
-            SELECT target_days
-            FROM goal_runway
-            WHERE user_id=:uid
-              AND (effective_to IS NULL OR effective_to >= CURRENT_DATE)
-            ORDER BY effective_from DESC
-            LIMIT 1
-        """),
-        {"uid": user_id}
-    ).scalar()
-    return int(row or 30)
-
-
 # ---- THIS IS THE OFFICIAL BURN RATE (MATCHING DASHBOARD) ----
 def _dashboard_burn_cents(user_id: int, window_days: int = 30) -> int:
     """
@@ -53,9 +34,9 @@ def _dashboard_burn_cents(user_id: int, window_days: int = 30) -> int:
               ), 0) AS exp_c
             FROM `transaction`
             WHERE user_id=:uid
-              AND txn_date_local >= CURRENT_DATE - INTERVAL :win DAY
+              AND txn_date_local >= :since
         """),
-        {"uid": user_id, "win": window_days},
+        {"uid": user_id, "since": days_ago(window_days)},
     ).mappings().first()
 
     total_exp = max(int(agg["exp_c"] or 0), 0)
@@ -111,15 +92,16 @@ def goals_snapshot():
     """
     try:
         user_id = int(request.args.get("user_id", "0"))
-        if not user_id:
+        if not user_id and not token_claims():
             return problem(400, "validation_error", "user_id required")
-        _require_user(user_id)
+        user = require_user(user_id)
+        user_id = user.id
     except ValueError:
         return problem(400, "validation_error", "invalid user_id")
     except Exception:
         return problem(404, "not_found", "user")
 
-    goal_days = _current_goal_days(user_id)
+    goal_days = current_goal_days(user_id)
 
     balance_cents = _estimate_current_balance_cents(user_id)
 
@@ -142,6 +124,8 @@ def goals_snapshot():
         },
         "model_burn_rate": model_burn_rate,       # <-- NEW FIELD
     }
+    shadow_runway(user_id, "goals_snapshot", balance_cents, burn_cents,
+                  out["days_left_regular"], user["timezone"])
     return out, 200
 
 
@@ -153,9 +137,10 @@ def goals_target_update():
     try:
         user_id = int(d.get("user_id") or 0)
         target_days = int(d.get("target_days") or 0)
-        if not user_id or target_days <= 0:
+        if (not user_id and not token_claims()) or target_days <= 0:
             raise ValueError
-        _require_user(user_id)
+        user = require_user(user_id)
+        user_id = user.id
     except ValueError:
         return problem(400, "validation_error", "valid user_id & target_days required")
     except Exception:
@@ -165,23 +150,25 @@ def goals_target_update():
     db.session.execute(
         text("""
             UPDATE goal_runway
-            SET effective_to = CURRENT_DATE - INTERVAL 1 DAY
+            SET effective_to = :yesterday
             WHERE user_id=:uid
-              AND (effective_to IS NULL OR effective_to >= CURRENT_DATE)
+              AND (effective_to IS NULL OR effective_to >= :today)
         """),
-        {"uid": user_id}
+        {"uid": user_id, "today": utc_today(), "yesterday": days_ago(1)}
     )
 
     # Insert new
     db.session.execute(
         text("""
             INSERT INTO goal_runway (user_id, target_days, effective_from)
-            VALUES (:uid, :days, CURRENT_DATE)
+            VALUES (:uid, :days, :today)
         """),
-        {"uid": user_id, "days": target_days}
+        {"uid": user_id, "days": target_days, "today": utc_today()}
     )
 
     db.session.commit()
+    invalidate_goal_days(user_id)
+    reevaluate_after_write(user_id, user["timezone"])
     return {"ok": True, "goal_days": target_days}, 200
 
 
@@ -195,9 +182,9 @@ def goals_history():
     try:
         user_id = int(request.args.get("user_id", "0"))
         days_back = int(request.args.get("days", "120"))
-        if not user_id:
+        if not user_id and not token_claims():
             return problem(400, "validation_error", "user_id required")
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except ValueError:
         return problem(400, "validation_error", "invalid")
     except Exception:
@@ -206,7 +193,7 @@ def goals_history():
     # ⭐ Correct burn
     burn_cents = _dashboard_burn_cents(user_id, window_days=30)
     burn_ps_cents = _power_save_lift(burn_cents)
-    goal_days = _current_goal_days(user_id)
+    goal_days = current_goal_days(user_id)
 
     # Try daily_balance table
     rows = db.session.execute(
@@ -214,10 +201,10 @@ def goals_history():
             SELECT day_local, balance_cents
             FROM daily_balance
             WHERE user_id=:uid
-              AND day_local >= CURRENT_DATE - INTERVAL :win DAY
+              AND day_local >= :since
             ORDER BY day_local ASC
-        """),
-        {"uid": user_id, "win": days_back}
+        """).columns(day_local=Date),
+        {"uid": user_id, "since": days_ago(days_back)}
     ).mappings().all()
 
     points = []
@@ -239,17 +226,17 @@ def goals_history():
                                          WHEN type='expense' THEN -amount_cents END),0) AS delta
                 FROM `transaction`
                 WHERE user_id=:uid
-                  AND txn_date_local >= CURRENT_DATE - INTERVAL :win DAY
+                  AND txn_date_local >= :since
                 GROUP BY txn_date_local
                 ORDER BY txn_date_local
-            """),
-            {"uid": user_id, "win": days_back}
+            """).columns(d=Date),
+            {"uid": user_id, "since": days_ago(days_back)}
         ).mappings().all()
 
         cur_balance = _estimate_current_balance_cents(user_id)
         delta_by_day = {r["d"]: int(r["delta"] or 0) for r in changes}
 
-        today = date.today()
+        today = utc_today()
         day_list = [today - timedelta(days=i) for i in range(days_back - 1, -1, -1)]
 
         total_delta = sum(delta_by_day.get(d, 0) for d in day_list)
@@ -265,3 +252,33 @@ def goals_history():
             })
 
     return {"points": points}, 200
+
+
+# ========================= POWER-SAVE =========================
+
+@bp.get("/goals/power-save")
+def goals_power_save():
+    """
+    Today's Power-Save suggestion, as last recorded by a transaction or goal write
+    or the nightly `flask evaluate-power-save` job. Never rescans txns.
+    """
+    try:
+        user_id = int(request.args.get("user_id", "0"))
+        if not user_id and not token_claims():
+            return problem(400, "validation_error", "user_id required")
+        user = require_user(user_id)
+        user_id = user.id
+    except ValueError:
+        return problem(400, "validation_error", "invalid user_id")
+    except Exception:
+        return problem(404, "not_found", "user")
+
+    today = datetime.now(get_zoneinfo(user["timezone"])).date()
+    ev = (
+        PowerSaveEvent.query
+        .filter(PowerSaveEvent.user_id == user_id, PowerSaveEvent.day == today)
+        .first()
+    )
+    if not ev:
+        return {"triggered": False, "day": today.isoformat()}, 200
+    return event_payload(ev), 200
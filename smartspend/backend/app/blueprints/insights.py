@@ -3,39 +3,18 @@ from __future__ import annotations
 from datetime import datetime
 
 from flask import Blueprint, request
-from sqlalchemy import text
+from sqlalchemy import Date, DateTime, text
 
 from ..extensions import db
 from ..errors import problem
+from ..services.identity import require_user, current_goal_days
+from ..utils.dates import days_ago, days_ahead, since_utc, today as utc_today
+from ..utils.fields import sparse
 
 bp = Blueprint("insights", __name__)
 
 # ------------------------ helpers ------------------------
 
-def _require_user(user_id: int):
-    row = db.session.execute(
-        text("SELECT id, timezone FROM `user` WHERE id=:uid"),
-        {"uid": user_id}
-    ).mappings().first()
-    if not row:
-        raise ValueError("user_not_found")
-    return row
-
-def _current_goal_days(user_id: int) -> int:
-    """Latest active runway goal; default 30 (month-oriented)."""
-    val = db.session.execute(
-        text("""
-            SELECT target_days
-            FROM goal_runway
-            WHERE user_id=:uid
-              AND (effective_to IS NULL OR effective_to >= CURRENT_DATE)
-            ORDER BY effective_from DESC
-            LIMIT 1
-        """),
-        {"uid": user_id}
-    ).scalar()
-    return int(val or 30)
-
 def _estimate_current_balance_cents(user_id: int) -> int:
     """Sum(income) - sum(expense) over all time (UTC)."""
     val = db.session.execute(
@@ -58,15 +37,15 @@ def _avg_daily_burn_cents(user_id: int, window_days: int = 30) -> int:
     """
     v = db.session.execute(
         text("""
-            SELECT GREATEST(ROUND(AVG(GREATEST(burn_rate_cents, 0))), 0)
+            SELECT AVG(CASE WHEN burn_rate_cents > 0 THEN burn_rate_cents ELSE 0 END)
             FROM insight_daily
             WHERE user_id=:uid
-              AND day >= CURRENT_DATE - INTERVAL :win DAY
+              AND day >= :since
         """),
-        {"uid": user_id, "win": window_days}
+        {"uid": user_id, "since": days_ago(window_days)}
     ).scalar()
     if v is not None:
-        return max(int(v), 1)
+        return max(int(round(v)), 1)
 
     # Fallback: compute from transactions (UTC window)
     agg = db.session.execute(
@@ -76,9 +55,9 @@ def _avg_daily_burn_cents(user_id: int, window_days: int = 30) -> int:
               COALESCE(SUM(CASE WHEN type='income'  THEN amount_cents END),0) AS inc_c
             FROM `transaction`
             WHERE user_id=:uid
-              AND occurred_at >= (UTC_TIMESTAMP() - INTERVAL :win DAY)
+              AND occurred_at >= :since
         """),
-        {"uid": user_id, "win": window_days}
+        {"uid": user_id, "since": since_utc(window_days)}
     ).mappings().first()
     total_burn = max(int((agg["exp_c"] or 0) - (agg["inc_c"] or 0)), 0)
     return max(total_burn // max(window_days, 1), 1)
@@ -98,9 +77,9 @@ def _wants_share(user_id: int, days: int):
             COALESCE(SUM(CASE WHEN type='expense' AND spend_class='want' THEN amount_cents END), 0) AS wants_exp
           FROM `transaction`
           WHERE user_id=:uid
-            AND txn_date_local >= CURRENT_DATE - INTERVAL :win DAY
+            AND txn_date_local >= :since
         """),
-        {"uid": user_id, "win": days}
+        {"uid": user_id, "since": days_ago(days)}
     ).mappings().first()
     total = int(row["total_exp"] or 0)
     wants = int(row["wants_exp"] or 0)
@@ -115,9 +94,9 @@ def _late_night_count(user_id: int, days: int):
           WHERE user_id=:uid
             AND type='expense'
             AND day_part_local='late_night'
-            AND txn_date_local >= CURRENT_DATE - INTERVAL :win DAY
+            AND txn_date_local >= :since
         """),
-        {"uid": user_id, "win": days}
+        {"uid": user_id, "since": days_ago(days)}
     ).scalar()
     return int(val or 0)
 
@@ -130,10 +109,10 @@ def _mood_avg_spend(user_id: int, days: int):
           WHERE user_id=:uid
             AND type='expense'
             AND mood IS NOT NULL
-            AND txn_date_local >= CURRENT_DATE - INTERVAL :win DAY
+            AND txn_date_local >= :since
           GROUP BY mood
         """),
-        {"uid": user_id, "win": days}
+        {"uid": user_id, "since": days_ago(days)}
     ).mappings().all()
     base = {"happy": 0, "neutral": 0, "stressed": 0}
     for r in rows:
@@ -157,10 +136,10 @@ def _upcoming_bills(user_id: int, within_days: int = 7):
           JOIN bill_occurrence bo ON bo.bill_id = b.id
           WHERE b.user_id = :uid
             AND bo.status = 'due'
-            AND bo.due_date BETWEEN CURRENT_DATE AND (CURRENT_DATE + INTERVAL :d DAY)
+            AND bo.due_date BETWEEN :today AND :until
           ORDER BY bo.due_date ASC, bo.id ASC
-        """),
-        {"uid": user_id, "d": within_days}
+        """).columns(due_date=Date),
+        {"uid": user_id, "today": utc_today(), "until": days_ahead(within_days)}
     ).mappings().all()
     return [dict(r) for r in rows]
 
@@ -171,10 +150,10 @@ def _stored_alerts(user_id: int, days: int):
           SELECT id, source, code, title, message, severity, is_read, created_at
           FROM insight_alert
           WHERE user_id=:uid
-            AND created_at >= (UTC_TIMESTAMP() - INTERVAL :win DAY)
+            AND created_at >= :since
           ORDER BY created_at DESC
-        """),
-        {"uid": user_id, "win": days}
+        """).columns(created_at=DateTime),
+        {"uid": user_id, "since": since_utc(days)}
     ).mappings().all()
     return [dict(r) for r in rows]
 
@@ -191,7 +170,7 @@ def insights_summary():
         days = int(request.args.get("days", "7"))
         if days not in (7, 30):
             days = 7
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except ValueError:
         return problem(400, "validation_error", "valid user_id required")
     except Exception:
@@ -203,7 +182,7 @@ def insights_summary():
     upcoming = _upcoming_bills(user_id, within_days=7)
 
     # Runway with monthly cap for Regular
-    goal_cap = min(_current_goal_days(user_id), 30)
+    goal_cap = min(current_goal_days(user_id), 30)
     bal = _estimate_current_balance_cents(user_id)
     burn = _avg_daily_burn_cents(user_id, window_days=30)
     burn_ps = _power_save_lift(burn)
@@ -242,7 +221,7 @@ def insights_alerts():
         days = int(request.args.get("days", "7"))
         if days not in (7, 30):
             days = 7
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except ValueError:
         return problem(400, "validation_error", "valid user_id required")
     except Exception:
@@ -272,7 +251,7 @@ def insights_alerts():
             "created_at": datetime.utcnow().isoformat(sep=" "),
         })
 
-    return {"items": alerts}, 200
+    return {"items": sparse(alerts)}, 200
 
 
 @bp.get("/insights/nwg-share")
@@ -281,7 +260,7 @@ def insights_nwg_share():
     try:
         user_id = int(request.args.get("user_id", "0"))
         days = int(request.args.get("days", "30"))
-        _require_user(user_id)
+        user_id = require_user(user_id).id
     except Exception:
         return problem(400, "validation_error", "valid user_id & days required")
 
@@ -292,10 +271,10 @@ def insights_nwg_share():
           FROM `transaction`
           WHERE user_id=:uid
             AND type='expense'
-            AND txn_date_local >= CURRENT_DATE - INTERVAL :win DAY
+            AND txn_date_local >= :since
           GROUP BY spend_class
         """),
-        {"uid": user_id, "win": days}
+        {"uid": user_id, "since": days_ago(days)}
     ).mappings().all()
 
     base = {"need": 0, "want": 0, "guilt": 0}
@@ -1,9 +1,99 @@
-from flask import Blueprint, request, jsonify
-from app.services.ml_loader import models
+from flask import Blueprint, request, jsonify, current_app
+from app.errors import problem
+from app.services.identity import require_user, token_claims
+from app.services.ml_loader import get_models
+from app.services.spend_forecast import forecast_user
+from app.services.runway_shadow import shadow_stats
+from app.services.ml_batcher import InferenceBatcher
+from app.services.metrics import REGISTRY
+from app.utils.request_metrics import metrics_allowed
 import numpy as np
+import time
 
 ml_bp = Blueprint("ml", __name__)
 
+_batcher = None
+
+# (tier, field, model key, output kind) in the order ml_predict reports them
+_OUTPUTS = (
+    ("tier2", "burn_rate", "tier2_burn", "predict"),
+    ("tier2", "runway_days", "tier2_runway", "predict"),
+    ("tier3", "risk_late_night", "tier3_late", "proba"),
+    ("tier3", "risk_overspend", "tier3_over", "proba"),
+    ("tier3", "risk_guilt", "tier3_guilt", "proba"),
+)
+
+_model_latency = REGISTRY.histogram(
+    "ml_model_latency_seconds", "Time per vectorized model call", ["model"]
+)
+_model_rows = REGISTRY.counter("ml_model_rows_total", "Rows scored per model", ["model"])
+_model_errors = REGISTRY.counter("ml_model_errors_total", "Model calls that raised", ["model"])
+_predict_errors = REGISTRY.counter(
+    "ml_predict_errors_total", "/ml/predict requests answered with 500", ["error"]
+)
+
+
+def score_rows(X: np.ndarray) -> list:
+    """
+    Score an (n, features) matrix with one vectorized call per model.
+    Returns one (result, timings_ms) pair per row; timings are for the
+    whole batch the row was scored in.
+    """
+    n = X.shape[0]
+    models = get_models()
+    outputs = {}
+    timings = {"rows": n}
+    for _, _, key, kind in _OUTPUTS:
+        t0 = time.perf_counter()
+        try:
+            if kind == "proba":
+                outputs[key] = models[key].predict_proba(X)[:, 1]
+            else:
+                outputs[key] = models[key].predict(X)
+        except Exception:
+            _model_errors.inc(model=key)
+            raise
+        dt = time.perf_counter() - t0
+        _model_latency.observe(dt, model=key)
+        _model_rows.inc(n, model=key)
+        timings[key] = dt * 1000.0
+
+    results = []
+    for i in range(n):
+        res = {"tier2": {}, "tier3": {}}
+        for tier, field, key, _ in _OUTPUTS:
+            res[tier][field] = float(outputs[key][i])
+        results.append((res, timings))
+    return results
+
+
+def _get_batcher():
+    global _batcher
+    if _batcher is None:
+        cfg = current_app.config
+        _batcher = InferenceBatcher(
+            score_rows,
+            max_rows=cfg.get("ML_BATCH_MAX_ROWS", 32),
+            max_wait_ms=cfg.get("ML_BATCH_MAX_WAIT_MS", 2.0),
+        )
+    return _batcher
+
+
+def _wants_timing() -> bool:
+    if current_app.config.get("ML_TIMING_HEADER", False):
+        return True
+    return request.headers.get("X-ML-Timing") == "1" or request.args.get("timing") == "1"
+
+
+def _server_timing(total_ms: float, timings: dict) -> str:
+    parts = [f'batch;desc="rows={timings.get("rows", 1)}"']
+    for _, _, key, _ in _OUTPUTS:
+        if key in timings:
+            parts.append(f"{key};dur={timings[key]:.3f}")
+    parts.append(f"ml_total;dur={total_ms:.3f}")
+    return ", ".join(parts)
+
+
 @ml_bp.route("/ml/predict", methods=["POST"])  # 👈 KEEP this as /ml/predict
 def ml_predict():
     try:
@@ -12,19 +102,72 @@ def ml_predict():
         if "features" not in data:
             return jsonify({"error": "Missing 'features'"}), 400
 
-        X = np.array(data["features"]).reshape(1, -1)
+        X = np.array(data["features"], dtype=float).reshape(1, -1)
 
-        return jsonify({
-            "tier2": {
-                "burn_rate": float(models["tier2_burn"].predict(X)[0]),
-                "runway_days": float(models["tier2_runway"].predict(X)[0])
-            },
-            "tier3": {
-                "risk_late_night": float(models["tier3_late"].predict_proba(X)[0][1]),
-                "risk_overspend": float(models["tier3_over"].predict_proba(X)[0][1]),
-                "risk_guilt": float(models["tier3_guilt"].predict_proba(X)[0][1])
-            }
-        })
+        t0 = time.perf_counter()
+        if current_app.config.get("ML_BATCH_ENABLED", True):
+            result, timings = _get_batcher().predict(X[0])
+        else:
+            result, timings = score_rows(X)[0]
+        total_ms = (time.perf_counter() - t0) * 1000.0
+
+        resp = jsonify(result)
+        if _wants_timing():
+            resp.headers["Server-Timing"] = _server_timing(total_ms, timings)
+        return resp
 
     except Exception as e:
+        _predict_errors.inc(error=type(e).__name__)
         return jsonify({"error": str(e)}), 500
+
+
+@ml_bp.get("/ml/batch-stats")
+def ml_batch_stats():
+    """Coalescer counters: batch-size distribution and queue-wait latency."""
+    if _batcher is None:
+        return jsonify({"enabled": current_app.config.get("ML_BATCH_ENABLED", True), "batches": 0})
+    return jsonify({"enabled": current_app.config.get("ML_BATCH_ENABLED", True), **_batcher.stats()})
+
+
+@ml_bp.get("/ml/metrics")
+def ml_metrics():
+    """Per-model latency histograms, row/error counters and model load times."""
+    if not metrics_allowed():
+        return problem(403, "forbidden", "metrics are restricted")
+    return jsonify(REGISTRY.snapshot(prefix="ml_"))
+
+
+@ml_bp.get("/ml/spend-forecast")
+def ml_spend_forecast():
+    """
+    Tier-1 spend forecast for each of the user's expense categories over
+    the next `days` days (default 7). One model call per user per local day.
+    """
+    try:
+        user_id = int(request.args.get("user_id", "0"))
+        days = int(request.args.get("days", "7"))
+    except ValueError:
+        return problem(400, "validation_error", "user_id and days must be integers")
+    if not user_id and not token_claims():
+        return problem(400, "validation_error", "user_id required")
+    if not 1 <= days <= 31:
+        return problem(400, "validation_error", "days must be between 1 and 31")
+
+    try:
+        user = require_user(user_id)
+        user_id = user.id
+    except ValueError:
+        return problem(404, "not_found", "user")
+    return forecast_user(user_id, user.timezone, horizon_days=days), 200
+
+
+@ml_bp.get("/ml/runway-shadow")
+def ml_runway_shadow():
+    """Heuristic vs tier2_runway_model error stats from the shadow log."""
+    try:
+        days = int(request.args.get("days", "7"))
+    except ValueError:
+        return problem(400, "validation_error", "days must be an integer")
+    if not 1 <= days <= 90:
+        return problem(400, "validation_error", "days must be between 1 and 90")
+    return shadow_stats(days), 200
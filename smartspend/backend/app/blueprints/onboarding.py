@@ -9,6 +9,8 @@ from ..extensions import db
 from ..models import BudgetPref, MonthlyPeriod, User, Transaction, Bill
 from ..errors import problem
 from ..auth_utils import mint_access
+from ..services.identity import invalidate_identity
+from ..services.power_save import reevaluate_after_write
 
 bp = Blueprint("onboarding", __name__)
 
@@ -279,6 +281,8 @@ def onboarding_complete():
     # Activate user
     user.status = "active"
     db.session.commit()
+    invalidate_identity(user_id)
+    reevaluate_after_write(user_id, user.timezone)
 
     # Issue fresh access token
     access = mint_access(user_id, scope="app")
@@ -7,10 +7,16 @@ from typing import Optional, Tuple
 from sqlalchemy import or_
 
 from ..extensions import db
-from ..models import Transaction, MonthlyPeriod, User
+from ..models import Transaction, MonthlyPeriod
 from ..errors import problem
+from ..services.identity import load_identity, require_user, token_claims
 from ..services.periods import get_or_create_period
 from ..services.category_service import resolve_category_id_or_default
+from ..services.power_save import event_payload, reevaluate_after_write
+from ..services.nwg_classifier import classify
+from ..services import spend_forecast
+from ..utils.fields import sparse
+from ..utils.json_stream import json_list_response
 from ..utils.tz import get_zoneinfo  # timezone helper
 
 bp = Blueprint("transactions", __name__)
@@ -41,12 +47,6 @@ def _date_preset_bounds(preset: str | None) -> Tuple[Optional[datetime], Optiona
         return (start, None)
     return (None, None)
 
-def _require_user(user_id: int) -> User:
-    u = User.query.get(user_id)
-    if not u:
-        raise ValueError("user_not_found")
-    return u
-
 def _to_cents(v: Optional[str]) -> Optional[int]:
     if not v:
         return None
@@ -72,9 +72,10 @@ def list_transactions():
     # user validation
     try:
         user_id = int(request.args.get("user_id", "0"))
-        if not user_id:
+        if not user_id and not token_claims():
             return problem(400, "validation_error", "user_id required")
-        u = _require_user(user_id)
+        u = require_user(user_id)
+        user_id = u.id
     except ValueError:
         return problem(400, "validation_error", "user_id invalid")
     except Exception:
@@ -143,40 +144,45 @@ def list_transactions():
 
     # DB count before local late-night filter (so pagination reflects DB slice)
     total_db = qset.count()
-    rows = qset.limit(per_page).offset((page - 1) * per_page).all()
+    rows = qset.limit(per_page).offset((page - 1) * per_page)
 
-    # local mapping with safe tz loader
+    # local mapping with safe tz loader; the page is built inside the request
+    # so its query counts in Server-Timing and /metrics (per_page <= 100 never
+    # reaches STREAM_JSON_MIN_ITEMS, so streaming would buy nothing here)
     tz = get_zoneinfo(u.timezone)
-    items = []
-    for t in rows:
-        occurred_utc = t.occurred_at.replace(tzinfo=get_zoneinfo("UTC"))
-        occurred_local = occurred_utc.astimezone(tz)
-        dp_local = _local_day_part(occurred_local)
-
-        # apply late-night filter in LOCAL time
-        if late is True and dp_local != "late_night":
-            continue
-        if late is False and dp_local == "late_night":
-            continue
-
-        items.append({
-            "id": t.id,
-            "type": t.type,
-            "amount": round((t.amount_cents or 0) / 100.0, 2),
-            "amount_cents": t.amount_cents,
-            "occurred_at_utc": occurred_utc.isoformat().replace("+00:00", "Z"),
-            "occurred_at_local": occurred_local.isoformat(),
-            "merchant": t.merchant,
-            "note": t.memo,
-            "nwg": (t.spend_class.capitalize() if t.spend_class else None),
-            "mood": t.mood,
-            "category_id": t.category_id,
-            "bill_payment_id": t.bill_payment_id,
-            "late_night_local": (dp_local == "late_night"),
-            "day_part_local": dp_local,
-        })
-
-    return {"total": total_db, "page": page, "per_page": per_page, "items": items}, 200
+
+    def _items():
+        for t in rows:
+            occurred_utc = t.occurred_at.replace(tzinfo=get_zoneinfo("UTC"))
+            occurred_local = occurred_utc.astimezone(tz)
+            dp_local = _local_day_part(occurred_local)
+
+            # apply late-night filter in LOCAL time
+            if late is True and dp_local != "late_night":
+                continue
+            if late is False and dp_local == "late_night":
+                continue
+
+            yield {
+                "id": t.id,
+                "type": t.type,
+                "amount": round((t.amount_cents or 0) / 100.0, 2),
+                "amount_cents": t.amount_cents,
+                "occurred_at_utc": occurred_utc.isoformat().replace("+00:00", "Z"),
+                "occurred_at_local": occurred_local.isoformat(),
+                "merchant": t.merchant,
+                "note": t.memo,
+                "nwg": (t.spend_class.capitalize() if t.spend_class else None),
+                "mood": t.mood,
+                "category_id": t.category_id,
+                "bill_payment_id": t.bill_payment_id,
+                "late_night_local": (dp_local == "late_night"),
+                "day_part_local": dp_local,
+            }
+
+    return json_list_response(
+        {"total": total_db, "page": page, "per_page": per_page}, "items", sparse(_items())
+    )
 
 
 # -------------------- POST /transactions --------------------
@@ -187,7 +193,8 @@ def create_transaction():
     # user
     try:
         user_id = int(d.get("user_id") or 0)
-        u = _require_user(user_id)
+        u = require_user(user_id)
+        user_id = u.id
     except Exception:
         return problem(400, "validation_error", "valid user_id required")
 
@@ -240,6 +247,13 @@ def create_transaction():
     except ValueError as e:
         return problem(400, "validation_error", str(e))
 
+    # client left NWG empty: fill it from merchant/memo and the guilt rules
+    if typ == "expense" and not spend_class:
+        local_hour = (
+            occurred_at.replace(tzinfo=get_zoneinfo("UTC")).astimezone(get_zoneinfo(u.timezone)).hour
+        )
+        spend_class = classify(merchant, memo, amount_cents, local_hour, mood)
+
     # set per-row timezone (mirrors onboarding behavior)
     t = Transaction(
         user_id=user_id,
@@ -257,6 +271,11 @@ def create_transaction():
     )
     db.session.add(t)
     db.session.commit()
+    spend_forecast.invalidate(user_id)
+
+    # incremental Power-Save check (income can clear today's trigger too)
+    ev = reevaluate_after_write(user_id, u.timezone)
+    power_save = event_payload(ev) if ev else None
 
     occurred_utc = t.occurred_at.replace(tzinfo=get_zoneinfo("UTC"))
     tz = get_zoneinfo(u.timezone)
@@ -273,9 +292,15 @@ def create_transaction():
         "nwg": (t.spend_class.capitalize() if t.spend_class else None),
         "mood": t.mood,
         "category_id": t.category_id,
+        "power_save": power_save,
     }, 201
 
 
+def _user_tz(tx: Transaction) -> Optional[str]:
+    ident = load_identity(tx.user_id)
+    return ident.timezone if ident else tx.timezone
+
+
 # -------------------- PATCH /transactions/<id> --------------------
 @bp.patch("/transactions/<int:tx_id>")
 def update_transaction(tx_id: int):
@@ -353,6 +378,8 @@ def update_transaction(tx_id: int):
             return problem(400, "validation_error", "occurred_at must be ISO datetime")
 
     db.session.commit()
+    spend_forecast.invalidate(tx.user_id)
+    reevaluate_after_write(tx.user_id, _user_tz(tx))
     return {"ok": True}, 200
 
 
@@ -362,6 +389,9 @@ def delete_transaction(tx_id: int):
     tx = Transaction.query.get(tx_id)
     if not tx:
         return problem(404, "not_found", "transaction")
+    user_id, tzname = tx.user_id, _user_tz(tx)
     db.session.delete(tx)
     db.session.commit()
+    spend_forecast.invalidate(user_id)
+    reevaluate_after_write(user_id, tzname)
     return {"ok": True}, 200
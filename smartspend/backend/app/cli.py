@@ -0,0 +1,253 @@
+# app/cli.py
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+import click
+from flask import Flask
+
+
+def _parse_day(s: str | None) -> date:
+    if not s:
+        # the last complete day; the job normally runs shortly after midnight
+        return date.today() - timedelta(days=1)
+    return datetime.strptime(s, "%Y-%m-%d").date()
+
+
+def register_commands(app: Flask):
+    """Batch jobs, run as `flask --app wsgi <command>` (cron / scheduler)."""
+
+    @app.cli.command("score-daily-risk")
+    @click.option("--day", default=None, help="Last local day to score (YYYY-MM-DD). Default: yesterday.")
+    @click.option("--days", default=1, show_default=True, help="Number of days ending at --day (backfill).")
+    @click.option("--chunk-size", default=500, show_default=True, help="Users per feature/scoring chunk.")
+    @click.option("--workers", default=None, type=int, help="Scoring processes (0 = inline). Default: CPU count.")
+    def score_daily_risk(day, days, chunk_size, workers):
+        """Populate daily_risk with tier3 risks for every active user."""
+        from .services.daily_risk import run_daily_risk_job
+
+        end = _parse_day(day)
+        start = end - timedelta(days=max(int(days), 1) - 1)
+        res = run_daily_risk_job(start, end, chunk_size=chunk_size, workers=workers)
+        click.echo(
+            f"daily_risk {start}..{end}: {res['rows']} rows for {res['users']} users "
+            f"in {res['chunks']} chunks ({res['seconds']}s)"
+        )
+
+    @app.cli.command("evaluate-power-save")
+    @click.option("--day", default=None, help="Local day to evaluate (YYYY-MM-DD). Default: each user's local today.")
+    @click.option("--chunk-size", default=1000, show_default=True, help="Users per query chunk.")
+    def evaluate_power_save(day, chunk_size):
+        """Re-evaluate Power-Save for every active user (upsert triggers, clear the rest)."""
+        from .services.power_save import run_power_save_job
+
+        d = datetime.strptime(day, "%Y-%m-%d").date() if day else None
+        res = run_power_save_job(d, chunk_size=chunk_size)
+        click.echo(
+            f"power_save {d or 'local today'}: {res['triggered']} of {res['users']} users triggered "
+            f"in {res['chunks']} chunks ({res['seconds']}s)"
+        )
+
+    @app.cli.command("prune-refresh-tokens")
+    @click.option("--expired-grace-days", default=1, show_default=True, help="Keep expired rows this long.")
+    @click.option("--revoked-grace-days", default=7, show_default=True, help="Keep revoked rows this long.")
+    @click.option("--batch-size", default=5000, show_default=True, help="Rows per DELETE.")
+    @click.option("--pause", default=0.0, show_default=True, help="Seconds to sleep between batches.")
+    @click.option("--max-batches", default=None, type=int, help="Stop after this many batches (bounded runs).")
+    def prune_refresh_tokens_cmd(expired_grace_days, revoked_grace_days, batch_size, pause, max_batches):
+        """Delete expired and long-revoked refresh_token rows in batches."""
+        from .services.refresh_tokens import prune_refresh_tokens
+
+        res = prune_refresh_tokens(expired_grace_days, revoked_grace_days, batch_size, pause, max_batches)
+        click.echo(
+            f"refresh_token: deleted {res['expired']} expired + {res['revoked']} revoked "
+            f"in {res['batches']} batches ({res['seconds']}s)"
+        )
+
+    @app.cli.command("init-db")
+    def init_db():
+        """Create any missing tables from the models (existing tables are left alone)."""
+        from .extensions import db
+        from . import models  # noqa: F401
+
+        db.create_all()
+        click.echo(f"schema ready on {db.engine.url.render_as_string(hide_password=True)}")
+
+    @app.cli.command("migrate-local-fields")
+    @click.option("--batch-size", default=5000, show_default=True, help="Rows per read/update batch.")
+    @click.option("--all", "recompute_all", is_flag=True, help="Recompute every row, not just NULL ones.")
+    def migrate_local_fields(batch_size, recompute_all):
+        """
+        Turn transaction.local_occurred_at / txn_date_local / day_part_local
+        from MySQL CONVERT_TZ generated columns into plain columns, then fill
+        the rows that have no value from occurred_at + timezone.
+        """
+        from sqlalchemy import text, update
+
+        from .extensions import db
+        from .models import Transaction
+        from .utils.schema import generated_local_columns
+        from .utils.tz import local_fields
+
+        if db.engine.dialect.name == "mysql":
+            kinds = generated_local_columns(db.session)
+            ddl = {
+                "local_occurred_at": "DATETIME NULL",
+                "txn_date_local": "DATE NULL",
+                "day_part_local": "ENUM('morning','afternoon','evening','late_night') NULL",
+            }
+            for col, coltype in ddl.items():
+                extra = kinds.get(col, "")
+                if "STORED GENERATED" in extra:
+                    # MySQL keeps the stored values when a STORED column becomes plain
+                    db.session.execute(text(f"ALTER TABLE `transaction` MODIFY COLUMN `{col}` {coltype}"))
+                elif "VIRTUAL GENERATED" in extra:
+                    db.session.execute(text(f"ALTER TABLE `transaction` DROP COLUMN `{col}`"))
+                    db.session.execute(text(f"ALTER TABLE `transaction` ADD COLUMN `{col}` {coltype}"))
+                    recompute_all = True
+                else:
+                    continue
+                click.echo(f"transaction.{col}: generated -> plain column")
+
+        last, filled = 0, 0
+        while True:
+            q = db.session.query(Transaction.id, Transaction.occurred_at, Transaction.timezone).filter(
+                Transaction.id > last
+            )
+            if not recompute_all:
+                q = q.filter(Transaction.txn_date_local.is_(None))
+            rows = q.order_by(Transaction.id.asc()).limit(batch_size).all()
+            if not rows:
+                break
+            last = rows[-1].id
+            db.session.execute(
+                update(Transaction),
+                [{"id": r.id, **local_fields(r.occurred_at, r.timezone)} for r in rows],
+            )
+            db.session.commit()
+            filled += len(rows)
+        click.echo(f"transaction: local fields written for {filled} rows")
+
+    @app.cli.command("migrate-refresh-token-indexes")
+    @click.option("--dry-run", is_flag=True, help="List the missing indexes without creating them.")
+    def migrate_refresh_token_indexes(dry_run):
+        """
+        Create the refresh_token expires_at / revoked_at indexes that
+        prune-refresh-tokens relies on, when the table predates them.
+        Indexes already present (by name or on the same column) are skipped.
+        """
+        from sqlalchemy import inspect
+
+        from .extensions import db
+        from .models import RefreshToken
+
+        table = RefreshToken.__table__
+        live = inspect(db.engine).get_indexes(table.name)
+        names = {ix["name"] for ix in live}
+        leading = {tuple(ix["column_names"][:1]) for ix in live}
+        for index in sorted(table.indexes, key=lambda ix: ix.name):
+            cols = [c.name for c in index.columns]
+            if cols[0] not in ("expires_at", "revoked_at"):
+                continue
+            if index.name in names or tuple(cols[:1]) in leading:
+                click.echo(f"{table.name}.{cols[0]}: index present")
+                continue
+            if not dry_run:
+                index.create(bind=db.engine)
+            click.echo(f"{table.name}.{cols[0]}: {'would create' if dry_run else 'created'} {index.name}")
+
+    @app.cli.command("classify-spend")
+    @click.option("--batch-size", default=5000, show_default=True, help="Rows per read/update batch.")
+    @click.option("--dry-run", is_flag=True, help="Count what would be classified without writing.")
+    def classify_spend(batch_size, dry_run):
+        """Backfill spend_class on expenses that were saved without one."""
+        from sqlalchemy import update
+
+        from .extensions import db
+        from .models import Transaction
+        from .services.nwg_classifier import classify_many
+
+        last, seen, filled = 0, 0, {"need": 0, "want": 0, "guilt": 0}
+        while True:
+            rows = (
+                db.session.query(
+                    Transaction.id, Transaction.merchant, Transaction.memo, Transaction.amount_cents,
+                    Transaction.local_occurred_at, Transaction.mood,
+                )
+                .filter(
+                    Transaction.id > last,
+                    Transaction.type == "expense",
+                    Transaction.spend_class.is_(None),
+                    Transaction.deleted_at.is_(None),
+                )
+                .order_by(Transaction.id.asc())
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            last = rows[-1].id
+            seen += len(rows)
+            labels = classify_many(r._asdict() for r in rows)
+            updates = [{"id": r.id, "spend_class": c} for r, c in zip(rows, labels) if c]
+            for u in updates:
+                filled[u["spend_class"]] += 1
+            if updates and not dry_run:
+                db.session.execute(update(Transaction), updates)
+                db.session.commit()
+        click.echo(
+            f"{'would classify' if dry_run else 'classified'} {sum(filled.values())} of {seen} "
+            f"unlabelled expenses (need {filled['need']}, want {filled['want']}, guilt {filled['guilt']})"
+        )
+
+    @app.cli.command("export-compiled-models")
+    @click.option("--tolerance", default=1e-9, show_default=True, help="Max allowed |sklearn - numpy| on the check set.")
+    @click.option("--rows", default=2048, show_default=True, help="Random rows used to verify each export.")
+    def export_compiled_models(tolerance, rows):
+        """Export the shipped sklearn models to NumPy arrays (ml_models/compiled)."""
+        import os
+
+        import joblib
+        import numpy as np
+
+        from .services.ml_compiled import CompiledModel, export_estimator, max_abs_diff, save_compiled
+        from .services.ml_loader import BASE_PATH, COMPILED_PATH, MODEL_FILES, compiled_path
+
+        os.makedirs(COMPILED_PATH, exist_ok=True)
+        rng = np.random.default_rng(0)
+        failed = False
+        for key, fname in MODEL_FILES.items():
+            est = joblib.load(os.path.join(BASE_PATH, fname))
+            arrays = export_estimator(est)
+            X = rng.normal(0.0, 50.0, size=(rows, int(est.n_features_in_)))
+            diff = max_abs_diff(est, CompiledModel(arrays), X)
+            if diff > tolerance:
+                failed = True
+                click.echo(f"{key}: max diff {diff:.3g} > {tolerance:g}, not written", err=True)
+                continue
+            save_compiled(arrays, compiled_path(fname))
+            click.echo(f"{key}: {type(est).__name__} -> {os.path.basename(compiled_path(fname))} (max diff {diff:.3g})")
+        if failed:
+            raise SystemExit(1)
+
+    @app.cli.command("worker-memory")
+    @click.option("--pid", default=None, type=int, help="gunicorn master pid. Default: auto-detect.")
+    def worker_memory(pid):
+        """Shared vs private memory of the gunicorn master and its workers."""
+        from .utils.memory import find_gunicorn_master, worker_report
+
+        pid = pid or find_gunicorn_master()
+        if not pid:
+            click.echo("no gunicorn master found; pass --pid", err=True)
+            raise SystemExit(1)
+        rep = worker_report(pid)
+        for label, m in [("master", rep["master"])] + [("worker", w) for w in rep["workers"]]:
+            if m:
+                click.echo(
+                    f"{label:<7}{m['pid']:>8}  rss {m.get('rss_kb', 0):>8} kB  pss {m.get('pss_kb', 0):>8} kB  "
+                    f"shared {m['shared_kb']:>8} kB  private {m['private_kb']:>8} kB"
+                )
+        click.echo(
+            f"avg worker: shared {rep['avg_worker_shared_kb']} kB, private {rep['avg_worker_private_kb']} kB; "
+            f"pool pss {rep['total_pss_kb']} kB"
+        )
@@ -6,7 +6,118 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev_secret_change_me")
     SQLALCHEMY_DATABASE_URI = os.getenv("MYSQL_URI")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # response JSON through orjson when installed (app/utils/json_provider.py); "std" = Flask's json
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")
+    # br/gzip for JSON/text bodies >= COMPRESS_MIN_BYTES (app/utils/compression.py);
+    # list responses with >= STREAM_JSON_MIN_ITEMS items stream (app/utils/json_stream.py)
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "1") == "1"
+    COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+    COMPRESS_BR_QUALITY = int(os.getenv("COMPRESS_BR_QUALITY", "4"))
+    STREAM_JSON_MIN_ITEMS = int(os.getenv("STREAM_JSON_MIN_ITEMS", "200"))
+    # per-request SQL count / DB time, a warning for requests slower than
+    # SLOW_REQUEST_MS, and (default: only when app.testing) a warning for SQL
+    # repeated SQL_REPEAT_THRESHOLD+ times in one request. The count and time
+    # go out in Server-Timing only when the client sends X-SQL-Timing: 1 or
+    # ?timing=1, or on every response with SQL_TIMING_HEADER=1
+    SQL_PROFILE_ENABLED = os.getenv("SQL_PROFILE_ENABLED", "1") == "1"
+    SQL_TIMING_HEADER = os.getenv("SQL_TIMING_HEADER", "0") == "1"
+    SQL_PROFILE_REPEATS = (os.getenv("SQL_PROFILE_REPEATS") == "1") if os.getenv("SQL_PROFILE_REPEATS") else None
+    SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))
+    SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+    # per-endpoint latency / status / SQL metrics and cache + pool state at /metrics
+    # (app/utils/request_metrics.py); per worker process
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    # who may read /metrics and /api/v1/ml/metrics: a client address in
+    # METRICS_ALLOW_IPS (comma-separated, after TRUSTED_PROXIES) or
+    # `Authorization: Bearer <METRICS_TOKEN>`; everyone else gets 403
+    METRICS_ALLOW_IPS = os.getenv("METRICS_ALLOW_IPS", "127.0.0.1,::1")
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+    # optional read replica: GET requests read from it (app/utils/db_routing.py);
+    # a user's GETs stay on the primary for REPLICA_STICKY_SEC after they write
+    SQLALCHEMY_BINDS = {"replica": os.getenv("MYSQL_REPLICA_URI")} if os.getenv("MYSQL_REPLICA_URI") else {}
+    REPLICA_STICKY_SEC = float(os.getenv("REPLICA_STICKY_SEC", "5"))
+    # per-worker connection pool (see app/utils/db_pool.py). Keep
+    # WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) under MySQL's
+    # max_connections; recycle below the server's wait_timeout and pre-ping
+    # so idle connections the server dropped are never handed out
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "5"))  # whole seconds (create_engine coerces to int)
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+    # /ready warm-up (app/services/warmup.py): prime the pool, load and exercise
+    # the models, seed per-process caches. WARMUP_ON_START=1 does it in
+    # create_app (and per gunicorn worker) instead of on the first /ready
+    WARMUP_ON_START = os.getenv("WARMUP_ON_START", "0") == "1"
+    WARMUP_POOL_CONNECTIONS = int(os.getenv("WARMUP_POOL_CONNECTIONS", os.getenv("DB_POOL_SIZE", "5")))
+    WARMUP_CACHE_USERS = int(os.getenv("WARMUP_CACHE_USERS", "1000"))
     JWT_ISS = os.getenv("JWT_ISS", "smartspend")
     ACCESS_TTL_MIN = int(os.getenv("ACCESS_TTL_MIN", "30"))
     REFRESH_TTL_DAYS = int(os.getenv("REFRESH_TTL_DAYS", "30"))
     TIMEZONE = os.getenv("TIMEZONE", "America/New_York")
+
+    # /ml/predict micro-batching: coalesce concurrent rows for up to
+    # ML_BATCH_MAX_WAIT_MS or ML_BATCH_MAX_ROWS, whichever comes first
+    ML_BATCH_ENABLED = os.getenv("ML_BATCH_ENABLED", "1") == "1"
+    ML_BATCH_MAX_ROWS = int(os.getenv("ML_BATCH_MAX_ROWS", "32"))
+    ML_BATCH_MAX_WAIT_MS = float(os.getenv("ML_BATCH_MAX_WAIT_MS", "2"))
+
+    # serve models from ml_models/compiled/*.npz (pure NumPy) when present
+    ML_COMPILED = os.getenv("ML_COMPILED", "0") == "1"
+    # serve ml_models/versions/<ML_MODEL_VERSION>/ (written by app/ml/train.py)
+    # instead of the bundled pickles
+    ML_MODEL_VERSION = os.getenv("ML_MODEL_VERSION", "")
+
+    # verified access token -> claims, cached per worker until the token's exp
+    # (0 disables); bounded further by ACCESS_CACHE_MAX_TTL_SEC
+    ACCESS_CACHE_SIZE = int(os.getenv("ACCESS_CACHE_SIZE", "10000"))
+    ACCESS_CACHE_MAX_TTL_SEC = float(os.getenv("ACCESS_CACHE_MAX_TTL_SEC", "300"))
+
+    # pbkdf2_sha256 cost; hashes with any other round count are rehashed on
+    # the next successful login
+    PASSWORD_PBKDF2_ROUNDS = int(os.getenv("PASSWORD_PBKDF2_ROUNDS", "29000"))
+    # hash/verify in a process pool off the request threads (0 = inline);
+    # past PASSWORD_POOL_MAX_PENDING queued jobs auth answers 503 + Retry-After
+    PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", "2"))
+    PASSWORD_POOL_MAX_PENDING = int(os.getenv("PASSWORD_POOL_MAX_PENDING", "64"))
+    PASSWORD_POOL_START_METHOD = os.getenv("PASSWORD_POOL_START_METHOD", "forkserver")
+    # a hash/verify not done within this many seconds also answers 503; 0 = wait
+    PASSWORD_POOL_TIMEOUT_SEC = float(os.getenv("PASSWORD_POOL_TIMEOUT_SEC", "10"))
+
+    # token buckets on /auth/login and /auth/signup, per client IP and per
+    # email (BURST attempts, refilled at PER_MIN a minute); in-process unless
+    # RATE_LIMIT_REDIS_URL points at a Redis shared by all workers
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+    RATE_LIMIT_AUTH_IP_BURST = int(os.getenv("RATE_LIMIT_AUTH_IP_BURST", "20"))
+    RATE_LIMIT_AUTH_IP_PER_MIN = float(os.getenv("RATE_LIMIT_AUTH_IP_PER_MIN", "10"))
+    RATE_LIMIT_AUTH_EMAIL_BURST = int(os.getenv("RATE_LIMIT_AUTH_EMAIL_BURST", "5"))
+    RATE_LIMIT_AUTH_EMAIL_PER_MIN = float(os.getenv("RATE_LIMIT_AUTH_EMAIL_PER_MIN", "2"))
+    RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "")
+    # reverse proxies in front of the app (load balancer, router) whose
+    # X-Forwarded-For / -Proto hop is trusted; request.remote_addr is then the
+    # client as the outermost trusted proxy saw it. 0 = headers ignored, so a
+    # client can never pick its own rate-limit key. The Procfile sets 1 (the
+    # platform router); gunicorn.conf.py refuses to start with rate limiting
+    # on and this unset
+    TRUSTED_PROXIES = int(os.getenv("TRUSTED_PROXIES", "0"))
+
+    # (id, timezone, status) per user, cached in-process by services.identity
+    IDENTITY_CACHE_TTL_SEC = float(os.getenv("IDENTITY_CACHE_TTL_SEC", "30"))
+    IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", "10000"))
+    # per-user forecasts (services.spend_forecast); a write drops only the
+    # entry in the worker that served it, so the TTL bounds the others
+    SPEND_FORECAST_CACHE_TTL_SEC = float(os.getenv("SPEND_FORECAST_CACHE_TTL_SEC", "60"))
+
+    # shadow-score runway with tier2_runway_model next to the balance // burn
+    # heuristic on /goals/snapshot and /dashboard/kpis; results go to
+    # runway_shadow from a background pool that drops work when it is full
+    RUNWAY_SHADOW_ENABLED = os.getenv("RUNWAY_SHADOW_ENABLED", "0") == "1"
+    RUNWAY_SHADOW_SAMPLE_RATE = float(os.getenv("RUNWAY_SHADOW_SAMPLE_RATE", "1.0"))
+    RUNWAY_SHADOW_WORKERS = int(os.getenv("RUNWAY_SHADOW_WORKERS", "2"))
+    RUNWAY_SHADOW_MAX_PENDING = int(os.getenv("RUNWAY_SHADOW_MAX_PENDING", "100"))
+
+    # always attach the per-model Server-Timing breakdown to /ml/predict
+    # (otherwise only when the client sends X-ML-Timing: 1 or ?timing=1)
+    ML_TIMING_HEADER = os.getenv("ML_TIMING_HEADER", "0") == "1"
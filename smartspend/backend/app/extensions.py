@@ -2,5 +2,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 
-db = SQLAlchemy()
+from .utils.db_routing import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})  # GET reads -> replica bind, see utils/db_routing.py
 cors = CORS()  # note: we INIT this in create_app via cors.init_app(app, ...)
@@ -0,0 +1,318 @@
+"""
+Train the tier1/tier2/tier3 models from the bundled CSV datasets.
+
+Run from backend/:
+    python app/ml/train.py [--version 2025.10.1] [--workers 4] [--chunksize 50000]
+
+Writes ml_models/versions/<version>/ with one pickle (+ compiled .npz) per
+model, feature_cols.json and manifest.json (data hashes, row counts,
+evaluation metrics, inference-latency benchmarks). Serve a version with
+ML_MODEL_VERSION=<version>.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, BACKEND)
+
+SEED = 42
+DATA = {
+    "daily": "tier3_daily_risks (1).csv",
+    "alerts": "insight_alert_ml_full_v2 (1).csv",
+    "power": "power_saving_trigger_ml_v1 (1).csv",
+}
+
+TIER1_COLS = ["ma7_spend_d", "ma7_trend_d", "ma7_vol_d", "dow", "is_weekend"]
+TIER2_COLS = ["burn7_d", "burn30_d", "runway_days", "need_ratio", "want_ratio", "guilt_ratio",
+              "days_since_pay", "days_until_pay", "cycle_position", "dow", "is_weekend"]
+TIER3_COLS = ["burn7_d", "burn30_d", "spend_d", "need_ratio", "want_ratio", "guilt_ratio",
+              "days_since_pay", "days_until_pay", "cycle_position", "dow", "is_weekend"]
+
+# alert codes that count as a positive label for each tier3 risk
+TIER3_LABELS = {
+    "tier3_late": ("risk_late_night", ["risk_late_night"]),
+    "tier3_over": ("risk_overspend", ["risk_overspend", "overspend_day", "overspend_week"]),
+    "tier3_guilt": ("risk_guilt", ["risk_guilt_spending", "emotional_spending"]),
+}
+# below this many alert positives, distil from the CSV's stored risk instead
+MIN_POSITIVES = 50
+
+
+# ------------------------ loading ------------------------
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def read_csv_chunked(path: str, dtypes: dict, chunksize: int, date_cols=("day",)) -> pd.DataFrame:
+    """Typed, column-pruned, chunked read so large exports never load untyped."""
+    parts = []
+    for chunk in pd.read_csv(path, usecols=list(dtypes) + list(date_cols),
+                             dtype=dtypes, chunksize=chunksize):
+        for c in date_cols:
+            chunk[c] = pd.to_datetime(chunk[c], format="%Y-%m-%d")
+        parts.append(chunk)
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+
+def load_datasets(data_dir: str, chunksize: int) -> dict:
+    f32 = "float32"
+    daily = read_csv_chunked(
+        os.path.join(data_dir, DATA["daily"]),
+        {"user_id": "int32", "risk_late_night": f32, "risk_overspend": f32, "risk_guilt": f32,
+         "need_ratio": f32, "want_ratio": f32, "guilt_ratio": f32, "spend_d": f32,
+         "burn7_d": f32, "burn30_d": f32, "runway_days": f32},
+        chunksize,
+    )
+    alerts = read_csv_chunked(
+        os.path.join(data_dir, DATA["alerts"]),
+        {"user_id": "int32", "code": "category"},
+        chunksize,
+    )
+    power = read_csv_chunked(
+        os.path.join(data_dir, DATA["power"]),
+        {"user_id": "int32", "goal_days": "int16", "current_days_left": f32, "threshold_ratio": f32},
+        chunksize,
+    )
+    return {"daily": daily, "alerts": alerts, "power": power}
+
+
+# ------------------------ features ------------------------
+
+def engineer(daily: pd.DataFrame, alerts: pd.DataFrame) -> pd.DataFrame:
+    """All feature/label columns, vectorized over the whole frame."""
+    df = daily.sort_values(["user_id", "day"]).reset_index(drop=True)
+    g = df.groupby("user_id", sort=False)
+
+    # calendar + pay cycle (monthly on the 1st, services.payday's default rule)
+    dom = df["day"].dt.day.to_numpy()
+    dim = df["day"].dt.days_in_month.to_numpy()
+    df["dow"] = df["day"].dt.dayofweek.astype("float32")
+    df["is_weekend"] = (df["dow"] >= 5).astype("float32")
+    df["days_since_pay"] = (dom - 1).astype("float32")
+    df["days_until_pay"] = (dim - dom + 1).astype("float32")
+    df["cycle_position"] = ((dom - 1) / dim).astype("float32")
+
+    # tier1: 7-day moving stats of daily spend
+    roll = g["spend_d"].rolling(7, min_periods=3)
+    df["ma7_spend_d"] = roll.mean().reset_index(level=0, drop=True)
+    df["ma7_vol_d"] = roll.std().reset_index(level=0, drop=True)
+    df["ma7_trend_d"] = df.groupby("user_id", sort=False)["ma7_spend_d"].diff()
+
+    # next-day targets
+    df["next_spend_d"] = g["spend_d"].shift(-1)
+    df["next_burn7_d"] = g["burn7_d"].shift(-1)
+    df["next_runway_days"] = g["runway_days"].shift(-1)
+
+    # tier3 labels from alert codes on the same (user, day)
+    flags = (
+        alerts.assign(hit=1)
+        .pivot_table(index=["user_id", "day"], columns="code", values="hit",
+                     aggfunc="max", fill_value=0, observed=True)
+    )
+    flags.columns = [f"alert_{c}" for c in flags.columns]
+    df = df.merge(flags, left_on=["user_id", "day"], right_index=True, how="left")
+    for model, (risk_col, codes) in TIER3_LABELS.items():
+        present = [f"alert_{c}" for c in codes if f"alert_{c}" in df.columns]
+        alert_y = df[present].fillna(0).max(axis=1) if present else pd.Series(0, index=df.index)
+        if int(alert_y.sum()) >= MIN_POSITIVES:
+            df[f"y_{model}"] = alert_y.astype("int8")
+            df.attrs[f"label_{model}"] = "alerts:" + "|".join(c[len("alert_"):] for c in present)
+        else:
+            df[f"y_{model}"] = np.where(df[risk_col].isna(), np.nan, (df[risk_col] >= 0.5).astype("float32"))
+            df.attrs[f"label_{model}"] = f"distilled:{risk_col}>=0.5"
+    return df
+
+
+def time_split(df: pd.DataFrame, test_frac: float = 0.2):
+    """Hold out the most recent days so evaluation never sees the future."""
+    cut = df["day"].quantile(1 - test_frac)
+    return df["day"] <= cut, df["day"] > cut
+
+
+# ------------------------ training ------------------------
+
+def _latency_us(predict, X: np.ndarray, repeat: int = 200) -> dict:
+    one = X[:1]
+    batch = X[: min(len(X), 1000)]
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        predict(one)
+    single = (time.perf_counter() - t0) / repeat * 1e6
+    t0 = time.perf_counter()
+    for _ in range(max(repeat // 20, 5)):
+        predict(batch)
+    per_batch = (time.perf_counter() - t0) / max(repeat // 20, 5) * 1e6
+    return {"single_row_us": round(single, 2), "batch_rows": len(batch),
+            "batch_us": round(per_batch, 2), "batch_per_row_us": round(per_batch / len(batch), 3)}
+
+
+def train_one(task: dict) -> dict:
+    """Fit + evaluate + benchmark one model. Runs in a worker process."""
+    import warnings
+    from sklearn.linear_model import LinearRegression, LogisticRegression
+    from sklearn import metrics as skm
+    from app.services.ml_compiled import CompiledModel, export_estimator
+
+    warnings.filterwarnings("ignore")
+    Xtr, ytr, Xte, yte = task["Xtr"], task["ytr"], task["Xte"], task["yte"]
+    cols = task["cols"]
+
+    if task["kind"] == "classifier":
+        est = LogisticRegression(max_iter=2000, random_state=SEED)
+    else:
+        est = LinearRegression()
+    Xtr_df = pd.DataFrame(Xtr, columns=cols)
+    est.fit(Xtr_df, ytr)
+
+    Xte_df = pd.DataFrame(Xte, columns=cols)
+    if task["kind"] == "classifier":
+        proba = est.predict_proba(Xte_df)[:, 1] if len(est.classes_) == 2 else np.zeros(len(Xte))
+        pred = est.predict(Xte_df)
+        scores = {
+            "accuracy": float(skm.accuracy_score(yte, pred)),
+            "positive_rate": float(np.mean(yte)),
+        }
+        if len(np.unique(yte)) == 2:
+            scores["roc_auc"] = float(skm.roc_auc_score(yte, proba))
+            scores["log_loss"] = float(skm.log_loss(yte, proba, labels=[0, 1]))
+        predict = est.predict_proba
+    else:
+        pred = est.predict(Xte_df)
+        scores = {
+            "mae": float(skm.mean_absolute_error(yte, pred)),
+            "rmse": float(np.sqrt(skm.mean_squared_error(yte, pred))),
+            "r2": float(skm.r2_score(yte, pred)),
+        }
+        predict = est.predict
+
+    arrays = export_estimator(est)
+    comp = CompiledModel(arrays)
+    bench_X = Xte if len(Xte) else Xtr
+    latency = {
+        "sklearn": _latency_us(lambda A: predict(A), bench_X),
+        "numpy": _latency_us(comp.predict_proba if comp.is_classifier else comp.predict, bench_X),
+    }
+    return {
+        "name": task["name"], "estimator": est, "arrays": arrays, "cols": cols,
+        "metrics": scores, "latency": latency,
+        "rows": {"train": int(len(Xtr)), "test": int(len(Xte))},
+        "label": task.get("label"),
+    }
+
+
+def build_tasks(df: pd.DataFrame) -> list:
+    train_mask, test_mask = time_split(df)
+    specs = [
+        ("tier1_spend", "regressor", TIER1_COLS, "next_spend_d", None),
+        ("tier2_burn", "regressor", TIER2_COLS, "next_burn7_d", None),
+        ("tier2_runway", "regressor", TIER2_COLS, "next_runway_days", None),
+    ] + [
+        (m, "classifier", TIER3_COLS, f"y_{m}", df.attrs.get(f"label_{m}"))
+        for m in TIER3_LABELS
+    ]
+    tasks = []
+    for name, kind, cols, target, label in specs:
+        ok = df[cols + [target]].notna().all(axis=1)
+        tr, te = df[ok & train_mask], df[ok & test_mask]
+        tasks.append({
+            "name": name, "kind": kind, "cols": cols, "label": label,
+            "Xtr": tr[cols].to_numpy(np.float64), "ytr": tr[target].to_numpy(),
+            "Xte": te[cols].to_numpy(np.float64), "yte": te[target].to_numpy(),
+        })
+        if kind == "classifier":
+            tasks[-1]["ytr"] = tasks[-1]["ytr"].astype(int)
+            tasks[-1]["yte"] = tasks[-1]["yte"].astype(int)
+    return tasks
+
+
+def write_artifacts(out_dir: str, results: list, manifest: dict) -> None:
+    from app.services.ml_compiled import save_compiled
+
+    os.makedirs(out_dir)
+    feature_cols = {}
+    for r in results:
+        joblib.dump(r["estimator"], os.path.join(out_dir, f"{r['name']}.pkl"))
+        save_compiled(r["arrays"], os.path.join(out_dir, f"{r['name']}.npz"))
+        feature_cols[r["name"]] = r["cols"]
+        manifest["models"][r["name"]] = {
+            "estimator": type(r["estimator"]).__name__,
+            "features": r["cols"], "rows": r["rows"], "label": r["label"],
+            "metrics": r["metrics"], "latency": r["latency"],
+        }
+    with open(os.path.join(out_dir, "feature_cols.json"), "w") as f:
+        json.dump(feature_cols, f, indent=2)
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--data-dir", default=BACKEND)
+    ap.add_argument("--out-dir", default=os.path.join(BACKEND, "ml_models", "versions"))
+    ap.add_argument("--version", default=datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S"))
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--chunksize", type=int, default=50_000)
+    args = ap.parse_args(argv)
+
+    out_dir = os.path.join(args.out_dir, args.version)
+    if os.path.exists(out_dir):
+        print(f"{out_dir} already exists; pick another --version", file=sys.stderr)
+        return 1
+
+    np.random.seed(SEED)
+    t0 = time.perf_counter()
+    data = load_datasets(args.data_dir, args.chunksize)
+    df = engineer(data["daily"], data["alerts"])
+    tasks = build_tasks(df)
+    t_prep = time.perf_counter() - t0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(train_one, tasks))
+
+    import sklearn
+    manifest = {
+        "version": args.version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "seed": SEED,
+        "sklearn": sklearn.__version__,
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "data": {
+            k: {"file": fname, "sha256": _sha256(os.path.join(args.data_dir, fname)),
+                "rows": int(len(data[k]))}
+            for k, fname in DATA.items()
+        },
+        "prep_seconds": round(t_prep, 3),
+        "train_seconds": round(time.perf_counter() - t0 - t_prep, 3),
+        "models": {},
+    }
+    write_artifacts(out_dir, results, manifest)
+
+    for name, m in manifest["models"].items():
+        lat = m["latency"]
+        print(f"{name:<13} {m['rows']['train']:>6}/{m['rows']['test']:<5} "
+              f"{json.dumps({k: round(v, 4) for k, v in m['metrics'].items()})} "
+              f"single {lat['sklearn']['single_row_us']}us -> {lat['numpy']['single_row_us']}us")
+    print(f"wrote {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
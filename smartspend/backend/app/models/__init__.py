@@ -7,3 +7,12 @@ from .transaction import Transaction
 from .bill import Bill
 from .bill_occurrence import BillOccurrence
 from .bill_payment import BillPayment
+from .daily_risk import DailyRisk
+from .power_save_event import PowerSaveEvent
+from .runway_shadow import RunwayShadow
+from .goal_runway import GoalRunway
+from .daily_balance import DailyBalance
+from .insight_daily import InsightDaily
+from .insight_alert import InsightAlert
+from .achievement import Achievement
+from .user_achievement import UserAchievement
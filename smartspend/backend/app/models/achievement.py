@@ -0,0 +1,17 @@
+# app/models/achievement.py
+from ..extensions import db
+from .types import UBigInt, DateTime3, now3
+
+class Achievement(db.Model):
+    __tablename__ = "achievement"
+
+    id = db.Column(UBigInt, primary_key=True, autoincrement=True)
+    code = db.Column(db.String(64), nullable=False, unique=True)
+    name = db.Column(db.String(120), nullable=False)
+    description = db.Column(db.String(300))
+    icon = db.Column(db.String(64))
+    is_active = db.Column(db.Boolean, nullable=False, server_default="1")
+    created_at = db.Column(DateTime3, nullable=False, server_default=now3())
+
+    def __repr__(self):
+        return f"<Achievement code={self.code!r}>"
@@ -1,45 +1,45 @@
 # app/models/budget_pref.py
 
-from sqlalchemy.dialects.mysql import BIGINT, ENUM, DATETIME as MySQLDATETIME
 from sqlalchemy import SmallInteger, Date, text, func
 from ..extensions import db
+from .types import UBigInt, BigInt, DateTime3, now3
 
 
 class BudgetPref(db.Model):
     __tablename__ = "budget_pref"
 
-    id = db.Column(BIGINT(unsigned=True), primary_key=True, autoincrement=True)
+    id = db.Column(UBigInt, primary_key=True, autoincrement=True)
 
     user_id = db.Column(
-        BIGINT(unsigned=True),
+        UBigInt,
         db.ForeignKey("user.id", ondelete="CASCADE"),
         unique=True,
         nullable=False,
     )
 
     # How often the user is paid
-    pay_cadence = db.Column(ENUM("weekly", "biweekly", "monthly"))
+    pay_cadence = db.Column(db.Enum("weekly", "biweekly", "monthly"))
 
     # Anchors for determining next paycheck
     pay_anchor_day_of_month = db.Column(SmallInteger)  # 1–31
     pay_anchor_weekday = db.Column(
-        ENUM("sunday", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday")
+        db.Enum("sunday", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday")
     )
     biweekly_anchor_date = db.Column(Date)
 
     # Expected paycheck amount (ALWAYS per pay_cadence)
-    expected_amount_cents = db.Column(BIGINT)
-    expected_amount_cadence = db.Column(ENUM("weekly", "biweekly", "monthly"))
+    expected_amount_cents = db.Column(BigInt)
+    expected_amount_cadence = db.Column(db.Enum("weekly", "biweekly", "monthly"))
 
     created_at = db.Column(
-        MySQLDATETIME(fsp=3),
+        DateTime3,
         nullable=False,
-        server_default=text("CURRENT_TIMESTAMP(3)"),
+        server_default=now3(),
     )
     updated_at = db.Column(
-        MySQLDATETIME(fsp=3),
+        DateTime3,
         nullable=False,
-        server_default=text("CURRENT_TIMESTAMP(3)"),
+        server_default=now3(),
         onupdate=func.current_timestamp(),
     )
 
@@ -1,5 +1,5 @@
-from sqlalchemy.dialects.mysql import BIGINT, ENUM
 from ..extensions import db
+from .types import UBigInt
 
 class Category(db.Model):
     __tablename__ = "category"
@@ -8,21 +8,21 @@ class Category(db.Model):
         {"mysql_charset": "utf8mb4"},
     )
 
-    id = db.Column(BIGINT(unsigned=True), primary_key=True, autoincrement=True)
-    user_id = db.Column(BIGINT(unsigned=True), db.ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    id = db.Column(UBigInt, primary_key=True, autoincrement=True)
+    user_id = db.Column(UBigInt, db.ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
     name = db.Column(db.String(80), nullable=False)
 
-    parent_id = db.Column(BIGINT(unsigned=True), db.ForeignKey("category.id", ondelete="SET NULL"))
-    kind = db.Column(ENUM("income", "expense", name="category_kind"), nullable=False)
+    parent_id = db.Column(UBigInt, db.ForeignKey("category.id", ondelete="SET NULL"))
+    kind = db.Column(db.Enum("income", "expense", name="category_kind"), nullable=False)
     is_default = db.Column(db.Boolean, nullable=False, default=False)
 
     created_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now(), onupdate=db.func.now())
     deleted_at = db.Column(db.DateTime)
 
-    created_by = db.Column(BIGINT(unsigned=True))
-    updated_by = db.Column(BIGINT(unsigned=True))
-    deleted_by = db.Column(BIGINT(unsigned=True))
+    created_by = db.Column(UBigInt)
+    updated_by = db.Column(UBigInt)
+    deleted_by = db.Column(UBigInt)
 
     parent = db.relationship(
         "Category",
@@ -0,0 +1,14 @@
+# app/models/daily_balance.py
+from ..extensions import db
+from .types import UBigInt, BigInt
+
+class DailyBalance(db.Model):
+    """End-of-day balance per user and local day (read by /goals/history when present)."""
+    __tablename__ = "daily_balance"
+
+    user_id = db.Column(UBigInt, primary_key=True)
+    day_local = db.Column(db.Date, primary_key=True)
+    balance_cents = db.Column(BigInt, nullable=False)
+
+    def __repr__(self):
+        return f"<DailyBalance user_id={self.user_id} day={self.day_local} {self.balance_cents}>"
@@ -0,0 +1,33 @@
+# app/models/daily_risk.py
+from ..extensions import db
+from .types import UBigInt, DateTime3, now3
+
+class DailyRisk(db.Model):
+    """One scored row per user per local day (written by `flask score-daily-risk`)."""
+    __tablename__ = "daily_risk"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "day", name="ux_daily_risk_user_day"),
+    )
+
+    id = db.Column(UBigInt, primary_key=True, autoincrement=True)
+    user_id = db.Column(UBigInt, nullable=False)
+    day = db.Column(db.Date, nullable=False, index=True)
+
+    # tier3 model outputs (NULL while the user has too little history)
+    risk_late_night = db.Column(db.Float)
+    risk_overspend = db.Column(db.Float)
+    risk_guilt = db.Column(db.Float)
+
+    # features the risks were scored from (dollars / days)
+    need_ratio = db.Column(db.Float, nullable=False, default=0)
+    want_ratio = db.Column(db.Float, nullable=False, default=0)
+    guilt_ratio = db.Column(db.Float, nullable=False, default=0)
+    spend_d = db.Column(db.Float, nullable=False, default=0)
+    burn7_d = db.Column(db.Float)
+    burn30_d = db.Column(db.Float)
+    runway_days = db.Column(db.Float)
+
+    scored_at = db.Column(DateTime3, nullable=False, server_default=now3())
+
+    def __repr__(self):
+        return f"<DailyRisk user_id={self.user_id} day={self.day}>"
@@ -0,0 +1,16 @@
+# app/models/goal_runway.py
+from ..extensions import db
+from .types import UBigInt
+
+class GoalRunway(db.Model):
+    """Runway goal history; the row with effective_to NULL (or in the future) is current."""
+    __tablename__ = "goal_runway"
+
+    id = db.Column(UBigInt, primary_key=True, autoincrement=True)
+    user_id = db.Column(UBigInt, nullable=False, index=True)
+    target_days = db.Column(db.Integer, nullable=False)
+    effective_from = db.Column(db.Date, nullable=False)
+    effective_to = db.Column(db.Date)
+
+    def __repr__(self):
+        return f"<GoalRunway user_id={self.user_id} days={self.target_days} from={self.effective_from}>"
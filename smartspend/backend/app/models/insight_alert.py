@@ -0,0 +1,20 @@
+# app/models/insight_alert.py
+from ..extensions import db
+from .types import UBigInt, DateTime3, now3
+
+class InsightAlert(db.Model):
+    """Stored alerts surfaced by /insights/alerts and the dashboard preview."""
+    __tablename__ = "insight_alert"
+
+    id = db.Column(UBigInt, primary_key=True, autoincrement=True)
+    user_id = db.Column(UBigInt, nullable=False, index=True)
+    source = db.Column(db.String(32), nullable=False)
+    code = db.Column(db.String(64), nullable=False)
+    title = db.Column(db.String(160), nullable=False)
+    message = db.Column(db.String(500))
+    severity = db.Column(db.String(16), nullable=False, server_default="info")
+    is_read = db.Column(db.Boolean, nullable=False, server_default="0")
+    created_at = db.Column(DateTime3, nullable=False, index=True, server_default=now3())
+
+    def __repr__(self):
+        return f"<InsightAlert user_id={self.user_id} code={self.code!r}>"
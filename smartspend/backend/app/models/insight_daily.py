@@ -0,0 +1,14 @@
+# app/models/insight_daily.py
+from ..extensions import db
+from .types import UBigInt, BigInt
+
+class InsightDaily(db.Model):
+    """Local-day aggregates preferred by the insights burn rate when populated."""
+    __tablename__ = "insight_daily"
+
+    user_id = db.Column(UBigInt, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    burn_rate_cents = db.Column(BigInt)
+
+    def __repr__(self):
+        return f"<InsightDaily user_id={self.user_id} day={self.day} burn={self.burn_rate_cents}>"
@@ -0,0 +1,26 @@
+# app/models/power_save_event.py
+from ..extensions import db
+from .types import UBigInt, BigInt, DateTime3, now3
+
+class PowerSaveEvent(db.Model):
+    """A Power-Save trigger for one user on one local day (latest evaluation wins)."""
+    __tablename__ = "power_save_event"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "day", name="ux_power_save_event_user_day"),
+    )
+
+    id = db.Column(UBigInt, primary_key=True, autoincrement=True)
+    user_id = db.Column(UBigInt, nullable=False)
+    day = db.Column(db.Date, nullable=False, index=True)
+
+    goal_days = db.Column(db.Integer, nullable=False)
+    current_days_left = db.Column(db.Float, nullable=False)
+    threshold_ratio = db.Column(db.Float, nullable=False)        # days_left / goal_days
+    suggested_daily_budget_cents = db.Column(BigInt, nullable=False)
+    balance_cents = db.Column(BigInt, nullable=False)
+    burn_cents = db.Column(BigInt, nullable=False)
+
+    triggered_at = db.Column(DateTime3, nullable=False, server_default=now3())
+
+    def __repr__(self):
+        return f"<PowerSaveEvent user_id={self.user_id} day={self.day} ratio={self.threshold_ratio:.2f}>"
@@ -0,0 +1,26 @@
+# app/models/runway_shadow.py
+from ..extensions import db
+from .types import UBigInt, BigInt, DateTime3, now3
+
+class RunwayShadow(db.Model):
+    """Served heuristic runway (balance // burn, capped) vs tier2_runway_model, logged off the request path."""
+    __tablename__ = "runway_shadow"
+
+    id = db.Column(UBigInt, primary_key=True, autoincrement=True)
+    user_id = db.Column(UBigInt, nullable=False, index=True)
+    source = db.Column(db.String(32), nullable=False)          # endpoint that served the heuristic
+
+    heuristic_days = db.Column(db.Float, nullable=False)       # the value the endpoint returned
+    model_days = db.Column(db.Float, nullable=False)
+    diff_days = db.Column(db.Float, nullable=False)            # model - heuristic
+    abs_diff_days = db.Column(db.Float, nullable=False)
+
+    balance_cents = db.Column(BigInt, nullable=False)
+    burn_cents = db.Column(BigInt, nullable=False)
+    model_ms = db.Column(db.Float, nullable=False)
+
+    created_at = db.Column(DateTime3, nullable=False, index=True,
+                           server_default=now3())
+
+    def __repr__(self):
+        return f"<RunwayShadow user_id={self.user_id} heuristic={self.heuristic_days} model={self.model_days}>"
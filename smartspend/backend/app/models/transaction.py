@@ -1,25 +1,28 @@
 # app/models/transaction.py
+from sqlalchemy import event
+
 from ..extensions import db
-from sqlalchemy import Computed
+from .types import BigInt
+from ..utils.tz import local_fields
 
 class Transaction(db.Model):
     __tablename__ = "transaction"
 
-    id = db.Column(db.BigInteger, primary_key=True)
+    id = db.Column(BigInt, primary_key=True)
 
     user_id = db.Column(
-        db.BigInteger,
+        BigInt,
         db.ForeignKey("user.id", ondelete="CASCADE"),
         nullable=False,
     )
     period_id = db.Column(
-        db.BigInteger,
+        BigInt,
         db.ForeignKey("monthly_period.id", ondelete="CASCADE"),
         nullable=False,
     )
 
     type = db.Column(db.Enum("income", "expense", name="txn_type"), nullable=False)
-    amount_cents = db.Column(db.BigInteger, nullable=False)
+    amount_cents = db.Column(BigInt, nullable=False)
 
     # Stored in UTC (naive) from the app
     occurred_at = db.Column(db.DateTime, nullable=False)
@@ -27,28 +30,14 @@ class Transaction(db.Model):
     # Per-row timezone, defaults in DB to 'America/New_York'
     timezone = db.Column(db.String(64), nullable=False, server_default="America/New_York")
 
-    # ---- ONLY the columns that exist in your DB ----
-    # Local-time generated fields
-    local_occurred_at = db.Column(  # <-- match table name
-        db.DateTime,
-        Computed("CONVERT_TZ(occurred_at, '+00:00', timezone)"),
-        nullable=True,
-    )
-    txn_date_local = db.Column(
-        db.Date,
-        Computed("DATE(CONVERT_TZ(occurred_at, '+00:00', timezone))"),
-        nullable=True,
-    )
+    # Local-time fields, filled in from occurred_at + timezone on every
+    # insert/update (see _fill_local_fields). These used to be MySQL
+    # CONVERT_TZ generated columns; `flask migrate-local-fields` converts an
+    # existing table.
+    local_occurred_at = db.Column(db.DateTime, nullable=True)
+    txn_date_local = db.Column(db.Date, nullable=True)
     day_part_local = db.Column(
         db.Enum("morning", "afternoon", "evening", "late_night", name="txn_day_part_local"),
-        Computed(
-            """CASE
-                 WHEN HOUR(CONVERT_TZ(occurred_at, '+00:00', timezone)) BETWEEN 4 AND 11 THEN 'morning'
-                 WHEN HOUR(CONVERT_TZ(occurred_at, '+00:00', timezone)) BETWEEN 12 AND 15 THEN 'afternoon'
-                 WHEN HOUR(CONVERT_TZ(occurred_at, '+00:00', timezone)) BETWEEN 16 AND 21 THEN 'evening'
-                 ELSE 'late_night'
-               END"""
-        ),
         nullable=True,
     )
 
@@ -61,14 +50,14 @@ class Transaction(db.Model):
         nullable=True,
     )
     category_id = db.Column(
-        db.BigInteger,
+        BigInt,
         db.ForeignKey("category.id", ondelete="SET NULL"),
         nullable=True,
     )
     merchant = db.Column(db.String(160), nullable=True)
     memo = db.Column(db.String(300), nullable=True)
     mood = db.Column(db.Enum("happy", "neutral", "stressed", name="txn_mood"), nullable=True)
-    bill_payment_id = db.Column(db.BigInteger, nullable=True)
+    bill_payment_id = db.Column(BigInt, nullable=True)
 
     created_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
     updated_at = db.Column(
@@ -83,3 +72,12 @@ class Transaction(db.Model):
 
     def __repr__(self):
         return f"<Txn id={self.id} user_id={self.user_id} {self.type} {self.amount_cents}>"
+
+
+@event.listens_for(Transaction, "before_insert")
+@event.listens_for(Transaction, "before_update")
+def _fill_local_fields(mapper, connection, target):
+    if target.occurred_at is None:
+        return
+    for k, v in local_fields(target.occurred_at, target.timezone).items():
+        setattr(target, k, v)
@@ -0,0 +1,33 @@
+# app/models/types.py
+"""
+Column types that render exactly as before on MySQL and still work on SQLite.
+
+- UBigInt / BigInt: BIGINT [UNSIGNED] on MySQL, INTEGER on SQLite (only an
+  INTEGER PRIMARY KEY autoincrements there).
+- DateTime3: DATETIME(3) on MySQL, DATETIME elsewhere.
+- now3(): server default CURRENT_TIMESTAMP(3) on MySQL, CURRENT_TIMESTAMP
+  elsewhere.
+"""
+from sqlalchemy import BigInteger, DateTime, Integer
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+UBigInt = BigInteger().with_variant(mysql.BIGINT(unsigned=True), "mysql").with_variant(Integer(), "sqlite")
+BigInt = BigInteger().with_variant(Integer(), "sqlite")
+DateTime3 = DateTime().with_variant(mysql.DATETIME(fsp=3), "mysql")
+
+
+class now3(FunctionElement):
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(now3)
+def _now3_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(now3, "mysql")
+def _now3_mysql(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP(3)"
@@ -0,0 +1,17 @@
+# app/models/user_achievement.py
+from ..extensions import db
+from .types import UBigInt, DateTime3, now3
+
+class UserAchievement(db.Model):
+    __tablename__ = "user_achievement"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "achievement_id", name="ux_user_achievement"),
+    )
+
+    id = db.Column(UBigInt, primary_key=True, autoincrement=True)
+    user_id = db.Column(UBigInt, nullable=False, index=True)
+    achievement_id = db.Column(UBigInt, nullable=False)
+    earned_at = db.Column(DateTime3, nullable=False, server_default=now3())
+
+    def __repr__(self):
+        return f"<UserAchievement user_id={self.user_id} achievement_id={self.achievement_id}>"
@@ -0,0 +1,50 @@
+# app/services/bulk.py
+from __future__ import annotations
+
+from typing import List, Sequence
+
+from ..extensions import db
+from ..models import User
+
+
+def upsert_rows(table, rows: List[dict], keys: Sequence[str], update_cols: Sequence[str],
+                batch_size: int = 1000) -> int:
+    """Bulk INSERT .. ON DUPLICATE KEY UPDATE (ON CONFLICT on SQLite/Postgres)."""
+    if not rows:
+        return 0
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_cols})
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={c: stmt.excluded[c] for c in update_cols},
+        )
+    for i in range(0, len(rows), batch_size):
+        db.session.execute(stmt, rows[i:i + batch_size])
+    db.session.commit()
+    return len(rows)
+
+
+def user_id_chunks(chunk_size: int):
+    """Keyset-paginate active user ids so huge tables never load at once."""
+    last = 0
+    while True:
+        ids = [
+            int(r[0])
+            for r in db.session.query(User.id)
+            .filter(User.id > last, User.status == "active")
+            .order_by(User.id.asc())
+            .limit(chunk_size)
+        ]
+        if not ids:
+            return
+        yield ids
+        last = ids[-1]
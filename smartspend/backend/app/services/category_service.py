@@ -5,12 +5,14 @@ from sqlalchemy import and_
 
 from ..extensions import db
 from ..models.category import Category
+from ..utils.db_routing import pin_primary
 
 DEFAULT_INCOME = ["Salary", "Bonus", "Interest","Other Income"]
 DEFAULT_EXPENSE = ["Misc", "Food", "Rent", "Transport", "Entertainment", "Bills", "Health"]
 
 def ensure_default_categories(user_id: int) -> None:
     """Seed defaults if user has no (non-deleted) categories."""
+    pin_primary()   # the check decides an insert; a lagging replica would seed twice
     has_any = (
         db.session.query(Category.id)
         .filter(Category.user_id == user_id, Category.deleted_at.is_(None))
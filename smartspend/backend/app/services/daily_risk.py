@@ -0,0 +1,307 @@
+# app/services/daily_risk.py
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import case, func
+
+from ..extensions import db
+from ..models import BudgetPref, DailyRisk, Transaction
+from .bulk import upsert_rows, user_id_chunks
+
+# Burn windows mirror tier3_daily_risks.csv: rolling means that start
+# reporting after 3 (7-day) / 7 (30-day) days of history.
+_BURN7, _BURN7_MIN = 7, 3
+_BURN30, _BURN30_MIN = 30, 7
+_CYCLE_DAYS = {"weekly": 7, "biweekly": 14, "monthly": 30}
+_CLASSES = ("need", "want", "guilt")
+_RISK_MODELS = ("tier3_late", "tier3_over", "tier3_guilt")
+
+_UPSERT_COLS = (
+    "risk_late_night", "risk_overspend", "risk_guilt",
+    "need_ratio", "want_ratio", "guilt_ratio",
+    "spend_d", "burn7_d", "burn30_d", "runway_days", "scored_at",
+)
+
+
+class FeatureBatch:
+    """Row-aligned feature columns for a set of (user_id, day) pairs."""
+
+    def __init__(self, user_ids: np.ndarray, days: List[date], cols: Dict[str, np.ndarray]):
+        self.user_ids = user_ids
+        self.days = days
+        self.cols = cols
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def matrix(self, names: Sequence[str]) -> np.ndarray:
+        return np.column_stack([self.cols[n] for n in names]).astype(float)
+
+
+# ------------------------ features ------------------------
+
+def _rolling_mean(cs: np.ndarray, hist: np.ndarray, window: int, min_days: int) -> np.ndarray:
+    """Mean daily spend over the trailing `window` days, NaN below `min_days` of history."""
+    W = cs.shape[1] - 1
+    t = np.arange(W)
+    lo = np.maximum(t - window + 1, 0)
+    sums = cs[:, t + 1] - cs[:, lo]
+    n = np.minimum(hist, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = sums / n
+    out[hist < min_days] = np.nan
+    return out
+
+
+def build_features(user_ids: Sequence[int], start: date, end: date) -> FeatureBatch:
+    """
+    Build tier2/tier3 features for every user in `user_ids` and every local
+    day in [start, end]. Runs a fixed number of grouped queries per chunk and
+    does the rolling-window math on dense (users x days) arrays.
+    """
+    uids = [int(u) for u in user_ids]
+    if not uids:
+        return FeatureBatch(np.zeros(0, dtype=np.int64), [], {})
+
+    lo = start - timedelta(days=_BURN30 - 1)
+    W = (end - lo).days + 1
+    U = len(uids)
+    row_of = {u: i for i, u in enumerate(uids)}
+
+    spend = np.zeros((U, W))
+    by_class = np.zeros((len(_CLASSES), U, W))
+    delta = np.zeros((U, W))
+    paid = np.zeros((U, W), dtype=bool)
+
+    daily = (
+        db.session.query(
+            Transaction.user_id,
+            Transaction.txn_date_local,
+            Transaction.type,
+            Transaction.spend_class,
+            func.sum(Transaction.amount_cents),
+        )
+        .filter(
+            Transaction.user_id.in_(uids),
+            Transaction.txn_date_local >= lo,
+            Transaction.txn_date_local <= end,
+        )
+        .group_by(
+            Transaction.user_id,
+            Transaction.txn_date_local,
+            Transaction.type,
+            Transaction.spend_class,
+        )
+        .all()
+    )
+    for uid, d, typ, sc, cents in daily:
+        if d is None:
+            continue
+        i, t = row_of[int(uid)], (d - lo).days
+        dollars = float(cents or 0) / 100.0
+        if typ == "expense":
+            spend[i, t] += dollars
+            delta[i, t] -= dollars
+            if sc in _CLASSES:
+                by_class[_CLASSES.index(sc), i, t] += dollars
+        else:
+            delta[i, t] += dollars
+            paid[i, t] = True
+
+    # per-user scalars: opening balance, first activity, last pay before window
+    opening = np.zeros(U)
+    first_idx = np.full(U, W, dtype=float)     # W => no activity yet
+    last_pay_idx = np.full(U, np.nan)
+
+    signed = func.sum(
+        case(
+            (Transaction.type == "income", Transaction.amount_cents),
+            else_=-Transaction.amount_cents,
+        )
+    )
+    for uid, bal in (
+        db.session.query(Transaction.user_id, signed)
+        .filter(Transaction.user_id.in_(uids), Transaction.txn_date_local < lo)
+        .group_by(Transaction.user_id)
+    ):
+        opening[row_of[int(uid)]] = float(bal or 0) / 100.0
+
+    for uid, d in (
+        db.session.query(Transaction.user_id, func.min(Transaction.txn_date_local))
+        .filter(Transaction.user_id.in_(uids))
+        .group_by(Transaction.user_id)
+    ):
+        if d is not None:
+            first_idx[row_of[int(uid)]] = (d - lo).days
+
+    for uid, d in (
+        db.session.query(Transaction.user_id, func.max(Transaction.txn_date_local))
+        .filter(
+            Transaction.user_id.in_(uids),
+            Transaction.type == "income",
+            Transaction.txn_date_local < lo,
+        )
+        .group_by(Transaction.user_id)
+    ):
+        if d is not None:
+            last_pay_idx[row_of[int(uid)]] = (d - lo).days
+
+    cycle = np.full(U, float(_CYCLE_DAYS["monthly"]))
+    for uid, cadence in (
+        db.session.query(BudgetPref.user_id, BudgetPref.pay_cadence)
+        .filter(BudgetPref.user_id.in_(uids))
+    ):
+        cycle[row_of[int(uid)]] = float(_CYCLE_DAYS.get(cadence or "monthly", 30))
+
+    # ---- vectorized rolling features over (U, W) ----
+    t = np.arange(W, dtype=float)
+    hist = t[None, :] - first_idx[:, None] + 1          # days since first activity
+    cs = np.concatenate([np.zeros((U, 1)), np.cumsum(spend, axis=1)], axis=1)
+    burn7 = _rolling_mean(cs, hist, _BURN7, _BURN7_MIN)
+    burn30 = _rolling_mean(cs, hist, _BURN30, _BURN30_MIN)
+
+    balance = opening[:, None] + np.cumsum(delta, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        runway = np.where(burn7 > 0, balance / burn7, np.nan)
+        ratios = np.where(spend > 0, by_class / spend, 0.0)
+
+    pay_marks = np.where(paid, t[None, :], -np.inf)
+    pay_marks[:, 0] = np.where(paid[:, 0], 0.0, np.nan_to_num(last_pay_idx, nan=-np.inf))
+    last_pay = np.maximum.accumulate(pay_marks, axis=1)
+    # never paid: count the cycle from the first activity instead
+    last_pay = np.where(np.isfinite(last_pay), last_pay, first_idx[:, None])
+    since_pay = np.maximum(t[None, :] - last_pay, 0)
+    until_pay = np.maximum(cycle[:, None] - since_pay, 0)
+    cycle_pos = np.minimum(since_pay / cycle[:, None], 1.0)
+
+    dows = np.array([(lo + timedelta(days=int(k))).weekday() for k in range(W)], dtype=float)
+
+    # ---- keep [start, end] days that have history ----
+    s0 = W - ((end - start).days + 1)
+    keep = hist[:, s0:] >= 1
+    ui, tj = np.nonzero(keep)
+    tj = tj + s0
+
+    cols = {
+        "spend_d": spend[ui, tj],
+        "need_ratio": ratios[0][ui, tj],
+        "want_ratio": ratios[1][ui, tj],
+        "guilt_ratio": ratios[2][ui, tj],
+        "burn7_d": burn7[ui, tj],
+        "burn30_d": burn30[ui, tj],
+        "runway_days": runway[ui, tj],
+        "days_since_pay": since_pay[ui, tj],
+        "days_until_pay": until_pay[ui, tj],
+        "cycle_position": cycle_pos[ui, tj],
+        "dow": dows[tj],
+        "is_weekend": (dows[tj] >= 5).astype(float),
+    }
+    days = [lo + timedelta(days=int(k)) for k in tj]
+    return FeatureBatch(np.asarray(uids, dtype=np.int64)[ui], days, cols)
+
+
+# ------------------------ scoring ------------------------
+
+def score_tier3(X: np.ndarray) -> np.ndarray:
+    """
+    (n, tier3 features) -> (n, 3) of late-night/overspend/guilt probabilities.
+    Rows with missing features (short history) stay NaN. Top-level so it can
+    run in a ProcessPoolExecutor worker.
+    """
+    from .ml_loader import models
+
+    out = np.full((X.shape[0], len(_RISK_MODELS)), np.nan)
+    ok = np.isfinite(X).all(axis=1)
+    if ok.any():
+        Xok = X[ok]
+        for j, key in enumerate(_RISK_MODELS):
+            out[ok, j] = models[key].predict_proba(Xok)[:, 1]
+    return out
+
+
+def _nan_to_none(v: float) -> Optional[float]:
+    return None if v != v else float(v)
+
+
+def _risk_rows(batch: FeatureBatch, risks: np.ndarray, scored_at: datetime) -> List[dict]:
+    c = batch.cols
+    return [
+        {
+            "user_id": int(batch.user_ids[i]),
+            "day": batch.days[i],
+            "risk_late_night": _nan_to_none(risks[i, 0]),
+            "risk_overspend": _nan_to_none(risks[i, 1]),
+            "risk_guilt": _nan_to_none(risks[i, 2]),
+            "need_ratio": float(c["need_ratio"][i]),
+            "want_ratio": float(c["want_ratio"][i]),
+            "guilt_ratio": float(c["guilt_ratio"][i]),
+            "spend_d": round(float(c["spend_d"][i]), 2),
+            "burn7_d": _nan_to_none(c["burn7_d"][i]),
+            "burn30_d": _nan_to_none(c["burn30_d"][i]),
+            "runway_days": _nan_to_none(c["runway_days"][i]),
+            "scored_at": scored_at,
+        }
+        for i in range(len(batch))
+    ]
+
+
+def upsert_daily_risk(rows: List[dict], batch_size: int = 1000) -> int:
+    return upsert_rows(DailyRisk.__table__, rows, ("user_id", "day"), _UPSERT_COLS, batch_size)
+
+
+def run_daily_risk_job(
+    start: date,
+    end: date,
+    chunk_size: int = 500,
+    workers: Optional[int] = None,
+) -> dict:
+    """
+    Score every active user for each local day in [start, end] and upsert the
+    results into `daily_risk`. Features are built chunk by chunk in this
+    process (it owns the DB session); model scoring fans out to a process
+    pool. workers=0 scores inline.
+    """
+    from .ml_loader import feature_cols
+
+    names = feature_cols["tier3"]
+    t0 = time.perf_counter()
+    scored_at = datetime.utcnow()
+    totals = {"users": 0, "rows": 0, "chunks": 0}
+
+    def _flush(batch: FeatureBatch, risks: np.ndarray) -> None:
+        totals["rows"] += upsert_daily_risk(_risk_rows(batch, risks, scored_at))
+
+    if workers == 0:
+        for ids in user_id_chunks(chunk_size):
+            batch = build_features(ids, start, end)
+            totals["users"] += len(ids)
+            totals["chunks"] += 1
+            if len(batch):
+                _flush(batch, score_tier3(batch.matrix(names)))
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            limit = 2 * workers
+            inflight: Dict = {}
+            for ids in user_id_chunks(chunk_size):
+                batch = build_features(ids, start, end)
+                totals["users"] += len(ids)
+                totals["chunks"] += 1
+                if not len(batch):
+                    continue
+                inflight[pool.submit(score_tier3, batch.matrix(names))] = batch
+                if len(inflight) >= limit:
+                    done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        _flush(inflight.pop(fut), fut.result())
+            for fut in list(inflight):
+                _flush(inflight.pop(fut), fut.result())
+
+    totals["seconds"] = round(time.perf_counter() - t0, 3)
+    return totals
@@ -0,0 +1,168 @@
+# app/services/identity.py
+"""
+Request-scoped user resolution.
+
+`require_user()` resolves the caller once per request into `g.identity`:
+the verified access token (if any) is decoded once into `g.claims` by the
+before_request hook from `register_identity()` (through the verified-token
+cache in auth_utils), and (id, timezone, status) comes from a short-TTL
+in-process cache, so most requests run no user SELECT at all. Writes that change status or timezone
+call `invalidate_identity()`; other workers converge within the TTL.
+
+`current_goal_days()` memoizes the goal_runway lookup for the request.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import jwt
+from flask import Flask, g, has_request_context, request
+from sqlalchemy import text
+
+from ..auth_utils import bearer_from_auth_header, decode_access_cached
+from ..config import Config
+from ..extensions import db
+from ..models import Transaction, User
+from ..utils.cache import LRUCache
+from ..utils.dates import since_utc, today as utc_today
+from ..utils.db_routing import pin_primary, reads_replica
+
+DEFAULT_GOAL_DAYS = 30
+
+
+@dataclass(frozen=True)
+class Identity:
+    id: int
+    timezone: str
+    status: str
+
+    # call sites that used the raw-SQL helpers read row["timezone"]
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+
+_cache = LRUCache(maxsize=Config.IDENTITY_CACHE_SIZE, ttl=Config.IDENTITY_CACHE_TTL_SEC, name="identity")
+
+
+def cache_stats() -> dict:
+    return _cache.stats()
+
+
+def invalidate_identity(user_id: int) -> None:
+    _cache.pop(int(user_id))
+    if has_request_context():
+        ident = g.get("identity")
+        if ident is not None and ident.id == int(user_id):
+            g.pop("identity")
+
+
+def token_claims() -> Optional[Dict[str, Any]]:
+    """Verified access-token claims for this request (decoded once), or None."""
+    if "claims" not in g:
+        claims = None
+        token = bearer_from_auth_header(request.headers.get("Authorization"))
+        if token:
+            try:
+                claims = decode_access_cached(token)
+            except jwt.InvalidTokenError:
+                claims = None
+        g.claims = claims
+    return g.claims
+
+
+def register_identity(app: Flask) -> None:
+    """Attach the verified token claims (or None) to g.claims on every request."""
+
+    @app.before_request
+    def _attach_claims():
+        token_claims()
+
+
+def seed_identities(limit: int, days: int = 2) -> int:
+    """Cache the identities of up to `limit` users with transactions in the last `days` days (warm-up)."""
+    ids = [
+        r.user_id
+        for r in db.session.query(Transaction.user_id)
+        .filter(Transaction.occurred_at >= since_utc(days))
+        .distinct()
+        .limit(limit)
+    ]
+    if not ids:
+        return 0
+    n = 0
+    for row in db.session.query(User.id, User.timezone, User.status).filter(User.id.in_(ids)):
+        _cache.set(int(row.id), Identity(int(row.id), row.timezone or "America/New_York", row.status))
+        n += 1
+    return n
+
+
+def _identity_row(uid: int):
+    return db.session.query(User.id, User.timezone, User.status).filter(User.id == uid).first()
+
+
+def load_identity(user_id: int) -> Optional[Identity]:
+    uid = int(user_id)
+    ident = _cache.get(uid)
+    if ident is None:
+        row = _identity_row(uid)
+        if row is None and reads_replica():
+            # e.g. signed up moments ago on another worker and the replica lags
+            pin_primary()
+            row = _identity_row(uid)
+        if row is None:
+            return None
+        ident = Identity(int(row.id), row.timezone or "America/New_York", row.status)
+        _cache.set(uid, ident)
+    return ident
+
+
+def require_user(user_id: Optional[int] = None) -> Identity:
+    """
+    The user this request acts for. With a valid bearer token the token's
+    subject wins and an explicit, different user_id is rejected; without
+    one the explicit user_id is used as before.
+    Raises ValueError("user_not_found") / ValueError("user_mismatch").
+    """
+    claims = token_claims()
+    if claims:
+        sub = int(claims["sub"])
+        if user_id and int(user_id) != sub:
+            raise ValueError("user_mismatch")
+        user_id = sub
+    if not user_id:
+        raise ValueError("user_not_found")
+
+    ident = g.get("identity")
+    if ident is not None and ident.id == int(user_id):
+        return ident
+    ident = load_identity(user_id)
+    if ident is None:
+        raise ValueError("user_not_found")
+    g.identity = ident
+    return ident
+
+
+def current_goal_days(user_id: int) -> int:
+    """Latest active runway goal (default 30), looked up once per request."""
+    memo = g.setdefault("goal_days", {})
+    uid = int(user_id)
+    if uid not in memo:
+        val = db.session.execute(
+            text("""
+                SELECT target_days
+                FROM goal_runway
+                WHERE user_id=:uid
+                  AND (effective_to IS NULL OR effective_to >= :today)
+                ORDER BY effective_from DESC
+                LIMIT 1
+            """),
+            {"uid": uid, "today": utc_today()},
+        ).scalar()
+        memo[uid] = int(val or DEFAULT_GOAL_DAYS)
+    return memo[uid]
+
+
+def invalidate_goal_days(user_id: int) -> None:
+    if has_request_context():
+        g.get("goal_days", {}).pop(int(user_id), None)
@@ -0,0 +1,239 @@
+# app/services/metrics.py
+"""
+Tiny in-process metrics registry (counters, gauges, histograms with labels).
+
+Per worker process; every metric keeps its own lock so hot paths only
+contend with writers of the same metric. Registry.render() writes the
+Prometheus text exposition format (served at /metrics) with a `pid`
+label on every series, so the workers behind one address never share a
+series; collectors added with add_collector() are asked for
+point-in-time metrics (cache stats, pool state) at render time.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# seconds; covers sub-millisecond model calls up to slow requests
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+LabelKey = Tuple[str, ...]
+
+
+def _fmt(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labelstr(names: Tuple[str, ...], key: LabelKey, *extra: str) -> str:
+    parts = [f'{n}="{_esc(v)}"' for n, v in zip(names, key)]
+    parts.extend(e for e in extra if e)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str = "", labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelKey:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def key(self, **labels) -> LabelKey:
+        """Label key for the *_key() fast paths; build it once per label set and reuse it."""
+        return self._key(labels)
+
+    def _labels(self, key: LabelKey) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def expose(self, const: str = "") -> List[str]:
+        """Sample lines; `const` is a preformatted label pair added to every series."""
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_labelstr(self.labelnames, k, const)} {_fmt(v)}" for k, v in items]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        self.inc_key(self._key(labels), amount)
+
+    def inc_key(self, key: LabelKey, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[dict]:
+        with self._lock:
+            return [{"labels": self._labels(k), "value": v} for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        self.inc_key(self._key(labels), amount)
+
+    def inc_key(self, key: LabelKey, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[dict]:
+        with self._lock:
+            return [{"labels": self._labels(k), "value": v} for k, v in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum, count
+        self._series: Dict[LabelKey, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        self.observe_key(self._key(labels), value)
+
+    def observe_key(self, key: LabelKey, value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            s[0][i] += 1
+            s[1] += value
+            s[2] += 1
+
+    def _items(self) -> list:
+        with self._lock:
+            return [(k, list(s[0]), s[1], s[2]) for k, s in self._series.items()]
+
+    def expose(self, const: str = "") -> List[str]:
+        lines = []
+        bounds = [*map(_fmt, self.buckets), "+Inf"]
+        for key, counts, total, n in self._items():
+            acc = 0
+            for le, c in zip(bounds, counts):
+                acc += c
+                lbl = _labelstr(self.labelnames, key, const, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{lbl} {acc}")
+            lbl = _labelstr(self.labelnames, key, const)
+            lines.append(f"{self.name}_sum{lbl} {_fmt(total)}")
+            lines.append(f"{self.name}_count{lbl} {n}")
+        return lines
+
+    def samples(self) -> List[dict]:
+        out = []
+        items = self._items()
+        for key, counts, total, n in items:
+            cum, acc = [], 0
+            for c in counts:
+                acc += c
+                cum.append(acc)
+            out.append({
+                "labels": self._labels(key),
+                "buckets": dict(zip([*map(str, self.buckets), "+Inf"], cum)),
+                "sum": total,
+                "count": n,
+                "avg": (total / n) if n else 0.0,
+            })
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[_Metric]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames, **kw):
+        m = self._metrics.get(name)
+        if m is None:
+            with self._lock:
+                m = self._metrics.get(name)
+                if m is None:
+                    m = self._metrics[name] = cls(name, help, labelnames, **kw)
+        if not isinstance(m, cls):
+            raise TypeError(f"metric {name} already registered as {m.kind}")
+        return m
+
+    def counter(self, name: str, help: str = "", labelnames: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str = "", labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str = "", labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def metrics(self, prefix: Optional[str] = None) -> List[_Metric]:
+        return [m for n, m in sorted(self._metrics.items()) if not prefix or n.startswith(prefix)]
+
+    def snapshot(self, prefix: Optional[str] = None) -> Dict[str, dict]:
+        return {
+            m.name: {"type": m.kind, "help": m.help, "samples": m.samples()}
+            for m in self.metrics(prefix)
+        }
+
+    def add_collector(self, fn: Callable[[], Iterable[_Metric]]) -> None:
+        """fn() returns unregistered metrics built fresh for each render()."""
+        if fn not in self._collectors:
+            self._collectors.append(fn)
+
+    def render(self, prefix: Optional[str] = None) -> str:
+        """Prometheus text exposition format, version 0.0.4; every series gets pid="<this process>"."""
+        const = f'pid="{os.getpid()}"'
+        metrics = self.metrics(prefix)
+        for fn in self._collectors:
+            metrics.extend(m for m in fn() if not prefix or m.name.startswith(prefix))
+        lines = []
+        for m in metrics:
+            if m.help:
+                lines.append(f"# HELP {m.name} " + m.help.replace("\\", "\\\\").replace("\n", "\\n"))
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.expose(const))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
@@ -0,0 +1,162 @@
+# app/services/ml_batcher.py
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class _Pending:
+    __slots__ = ("row", "future", "enqueued")
+
+    def __init__(self, row: np.ndarray):
+        self.row = row
+        self.future: Future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class InferenceBatcher:
+    """
+    Coalesces concurrent single-row predictions into one vectorized call.
+
+    Request threads call `predict(row)` and block on a Future. A daemon thread
+    drains the queue once `max_rows` rows are waiting or the oldest row has
+    waited `max_wait_ms`, stacks them into one matrix and calls
+    `predict_batch(X)`, which must return one result per row.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[np.ndarray], List[Dict[str, Any]]],
+        max_rows: int = 32,
+        max_wait_ms: float = 2.0,
+    ):
+        self.predict_batch = predict_batch
+        self.max_rows = max(1, int(max_rows))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._cond = threading.Condition()
+        self._queue: deque = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    # ---------------- public ----------------
+
+    def predict(self, row, timeout: Optional[float] = 5.0) -> Dict[str, Any]:
+        return self.submit(row).result(timeout=timeout)
+
+    def submit(self, row) -> Future:
+        p = _Pending(np.asarray(row, dtype=float).reshape(-1))
+        self._ensure_worker()
+        with self._cond:
+            self._queue.append(p)
+            self._cond.notify()
+        return p.future
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            batches = self._batches
+            rows = self._rows
+            return {
+                "max_rows": self.max_rows,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batches": batches,
+                "rows": rows,
+                "errors": self._errors,
+                "avg_batch_size": round(rows / batches, 3) if batches else 0.0,
+                "max_batch_size": self._max_batch,
+                "batch_size_counts": dict(sorted(self._size_counts.items())),
+                "avg_queue_wait_ms": round(self._wait_ms / rows, 3) if rows else 0.0,
+                "max_queue_wait_ms": round(self._max_wait_ms, 3),
+                "avg_predict_ms": round(self._predict_ms / batches, 3) if batches else 0.0,
+                "queue_depth": len(self._queue),
+            }
+
+    # ---------------- worker ----------------
+
+    def _reset_stats(self) -> None:
+        self._batches = 0
+        self._rows = 0
+        self._errors = 0
+        self._max_batch = 0
+        self._size_counts: Dict[int, int] = {}
+        self._wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._predict_ms = 0.0
+
+    def _ensure_worker(self) -> None:
+        # Threads do not survive fork(): a gunicorn worker that inherited this
+        # object from a preloaded master starts its own drain thread.
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._thread is not None and self._pid == pid and self._thread.is_alive():
+                return
+            if self._pid != pid:
+                self._cond = threading.Condition()
+                self._queue = deque()
+                self._stats_lock = threading.Lock()
+                self._reset_stats()
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name="ml-batcher", daemon=True)
+            self._thread.start()
+
+    def _take_batch(self) -> List[_Pending]:
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+            deadline = self._queue[0].enqueued + self.max_wait
+            while len(self._queue) < self.max_rows:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            n = min(len(self._queue), self.max_rows)
+            return [self._queue.popleft() for _ in range(n)]
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            # rows of different widths cannot share a matrix; each width is
+            # scored (and fails) on its own
+            groups: Dict[int, List[_Pending]] = {}
+            for p in batch:
+                groups.setdefault(p.row.shape[0], []).append(p)
+            for items in groups.values():
+                self._score(items)
+
+    def _score(self, items: List[_Pending]) -> None:
+        started = time.perf_counter()
+        try:
+            X = np.vstack([p.row for p in items])
+            results = self.predict_batch(X)
+        except Exception as e:
+            with self._stats_lock:
+                self._errors += 1
+            for p in items:
+                p.future.set_exception(e)
+            return
+        done = time.perf_counter()
+
+        for p, res in zip(items, results):
+            p.future.set_result(res)
+
+        n = len(items)
+        waits = [(started - p.enqueued) * 1000.0 for p in items]
+        with self._stats_lock:
+            self._batches += 1
+            self._rows += n
+            self._max_batch = max(self._max_batch, n)
+            self._size_counts[n] = self._size_counts.get(n, 0) + 1
+            self._wait_ms += sum(waits)
+            self._max_wait_ms = max(self._max_wait_ms, max(waits))
+            self._predict_ms += (done - started) * 1000.0
@@ -0,0 +1,251 @@
+# app/services/ml_compiled.py
+"""
+Pure-NumPy inference for the estimator types we ship.
+
+`export_estimator()` flattens a fitted sklearn model into plain arrays,
+`CompiledModel` evaluates them without going through sklearn's per-call
+input validation. Supported:
+
+  - linear regressors (LinearRegression, Ridge, Lasso, ElasticNet, ...)
+  - LogisticRegression (binary and multinomial)
+  - DecisionTree / RandomForest / ExtraTrees (regressor and classifier)
+  - GradientBoosting (regressor, binary and multiclass classifier)
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class UnsupportedEstimator(ValueError):
+    pass
+
+
+# ------------------------ export ------------------------
+
+def _pack_trees(trees, classifier: bool) -> Dict[str, np.ndarray]:
+    """Stack sklearn Tree objects into padded (n_trees, max_nodes) arrays."""
+    T = len(trees)
+    N = max(t.node_count for t in trees)
+    K = trees[0].value.shape[2] if classifier else 1
+
+    feature = np.zeros((T, N), dtype=np.intp)
+    threshold = np.zeros((T, N), dtype=np.float64)
+    left = np.full((T, N), -1, dtype=np.intp)
+    right = np.full((T, N), -1, dtype=np.intp)
+    nan_left = np.zeros((T, N), dtype=bool)
+    value = np.zeros((T, N, K), dtype=np.float64)
+    depth = 0
+
+    for i, t in enumerate(trees):
+        n = t.node_count
+        leaf = t.children_left[:n] == -1
+        feature[i, :n] = np.where(leaf, 0, t.feature[:n])
+        threshold[i, :n] = t.threshold[:n]
+        left[i, :n] = t.children_left[:n]
+        right[i, :n] = t.children_right[:n]
+        if hasattr(t, "missing_go_to_left"):
+            nan_left[i, :n] = t.missing_go_to_left[:n].astype(bool)
+        v = t.value[:n, 0, :]
+        if classifier:
+            # sklearn normalizes leaf class weights in predict_proba
+            s = v.sum(axis=1, keepdims=True)
+            v = np.divide(v, s, out=np.zeros_like(v), where=s > 0)
+        value[i, :n, :] = v[:, :K]
+        depth = max(depth, int(t.max_depth))
+
+    return {
+        "feature": feature, "threshold": threshold,
+        "left": left, "right": right, "nan_left": nan_left,
+        "value": value, "depth": np.array(depth),
+    }
+
+
+def export_estimator(est) -> Dict[str, np.ndarray]:
+    """Flatten a fitted estimator into a dict of arrays (see module docstring)."""
+    name = type(est).__name__
+    out: Dict[str, Any] = {"estimator": np.array(name)}
+    if hasattr(est, "feature_names_in_"):
+        out["feature_names"] = np.asarray(est.feature_names_in_, dtype=str)
+    classes = getattr(est, "classes_", None)
+
+    if name == "LogisticRegression":
+        out.update(
+            kind=np.array("logistic"),
+            coef=np.atleast_2d(np.asarray(est.coef_, dtype=np.float64)),
+            intercept=np.atleast_1d(np.asarray(est.intercept_, dtype=np.float64)),
+            classes=np.asarray(classes),
+        )
+        return out
+
+    if name in ("DecisionTreeRegressor", "DecisionTreeClassifier",
+                "RandomForestRegressor", "RandomForestClassifier",
+                "ExtraTreesRegressor", "ExtraTreesClassifier"):
+        trees = [est.tree_] if name.startswith("DecisionTree") else [e.tree_ for e in est.estimators_]
+        clf = classes is not None
+        if clf and getattr(est, "n_outputs_", 1) != 1:
+            raise UnsupportedEstimator(f"{name} with multiple outputs")
+        out.update(kind=np.array("forest"), **_pack_trees(trees, clf))
+        if clf:
+            out["classes"] = np.asarray(classes)
+        return out
+
+    if name in ("GradientBoostingRegressor", "GradientBoostingClassifier"):
+        stages = np.asarray(est.estimators_)           # (n_stages, K)
+        K = stages.shape[1]
+        packs = [_pack_trees([s.tree_ for s in stages[:, k]], False) for k in range(K)]
+        # every class gets its own stack; pad to a common node count
+        N = max(p["feature"].shape[1] for p in packs)
+        merged: Dict[str, np.ndarray] = {}
+        for key in ("feature", "threshold", "left", "right", "nan_left", "value"):
+            arrs = []
+            for p in packs:
+                a = p[key]
+                pad = [(0, 0), (0, N - a.shape[1])] + [(0, 0)] * (a.ndim - 2)
+                fill = -1 if key in ("left", "right") else 0
+                arrs.append(np.pad(a, pad, constant_values=fill))
+            merged[key] = np.stack(arrs)               # (K, n_stages, N[, 1])
+        merged["depth"] = np.array(max(int(p["depth"]) for p in packs))
+        init = est._raw_predict_init(np.zeros((1, est.n_features_in_)))[0]
+        out.update(
+            kind=np.array("gbdt"),
+            init=np.asarray(init, dtype=np.float64),
+            learning_rate=np.array(float(est.learning_rate)),
+            **merged,
+        )
+        if classes is not None:
+            out["classes"] = np.asarray(classes)
+        return out
+
+    if hasattr(est, "coef_") and hasattr(est, "intercept_") and classes is None:
+        out.update(
+            kind=np.array("linear"),
+            coef=np.asarray(est.coef_, dtype=np.float64),
+            intercept=np.asarray(est.intercept_, dtype=np.float64),
+        )
+        return out
+
+    raise UnsupportedEstimator(f"cannot compile {name}")
+
+
+# ------------------------ inference ------------------------
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    with np.errstate(over="ignore"):
+        return 1.0 / (1.0 + np.exp(-z))
+
+
+def _softmax(z: np.ndarray) -> np.ndarray:
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def _walk(a: Dict[str, np.ndarray], X: np.ndarray) -> np.ndarray:
+    """Leaf values for every (tree, row): returns (n_trees, n_rows, K)."""
+    feature, threshold = a["feature"], a["threshold"]
+    left, right, nan_left = a["left"], a["right"], a["nan_left"]
+    T, n = feature.shape[0], X.shape[0]
+    tix = np.arange(T)[:, None]
+    rows = np.arange(n)[None, :]
+    node = np.zeros((T, n), dtype=np.intp)
+    for _ in range(int(a["depth"])):
+        x = X[rows, feature[tix, node]]
+        go_left = np.where(np.isnan(x), nan_left[tix, node], x <= threshold[tix, node])
+        nxt = np.where(go_left, left[tix, node], right[tix, node])
+        node = np.where(nxt == -1, node, nxt)
+    return a["value"][tix, node]
+
+
+class CompiledModel:
+    """Drop-in for the predict/predict_proba surface of the exported estimator."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.a = {k: np.asarray(v) for k, v in arrays.items()}
+        self.kind = str(self.a["kind"])
+        self.estimator = str(self.a.get("estimator", self.kind))
+        self.classes_: Optional[np.ndarray] = self.a.get("classes")
+        if "feature_names" in self.a:
+            self.feature_names_in_ = self.a["feature_names"]
+        if self.kind in ("linear", "logistic"):
+            self.n_features_in_ = int(self.a["coef"].shape[-1])
+        elif "feature_names" in self.a:
+            self.n_features_in_ = len(self.a["feature_names"])
+
+    @property
+    def is_classifier(self) -> bool:
+        return self.classes_ is not None
+
+    # ---- raw scores ----
+
+    def _tree_input(self, X: np.ndarray) -> np.ndarray:
+        # sklearn trees compare float32-cast inputs against float64 thresholds
+        return X.astype(np.float32).astype(np.float64)
+
+    def _raw(self, X: np.ndarray) -> np.ndarray:
+        a = self.a
+        if self.kind in ("linear", "logistic"):
+            coef = a["coef"]
+            return X @ coef.T + a["intercept"]
+        if self.kind == "forest":
+            return _walk(a, self._tree_input(X)).mean(axis=0)          # (n, K)
+        if self.kind == "gbdt":
+            Xt = self._tree_input(X)
+            K = a["feature"].shape[0]
+            raw = np.empty((X.shape[0], K))
+            for k in range(K):
+                sub = {key: a[key][k] for key in ("feature", "threshold", "left", "right", "nan_left", "value")}
+                sub["depth"] = a["depth"]
+                raw[:, k] = _walk(sub, Xt)[:, :, 0].sum(axis=0)
+            return a["init"] + float(a["learning_rate"]) * raw
+        raise UnsupportedEstimator(self.kind)
+
+    # ---- sklearn surface ----
+
+    def predict_proba(self, X) -> np.ndarray:
+        if not self.is_classifier:
+            raise AttributeError("predict_proba is only available for classifiers")
+        X = np.asarray(X, dtype=np.float64)
+        raw = self._raw(X)
+        if self.kind == "forest":
+            return raw
+        if raw.shape[1] == 1:                      # binary: one logit column
+            p = _sigmoid(raw[:, 0])
+            return np.column_stack([1.0 - p, p])
+        return _softmax(raw)
+
+    def predict(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if self.is_classifier:
+            return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+        raw = self._raw(X)
+        if raw.ndim == 2 and raw.shape[1] == 1:
+            return raw[:, 0]
+        return raw
+
+    def __repr__(self):
+        return f"<CompiledModel {self.estimator} kind={self.kind}>"
+
+
+# ------------------------ persistence ------------------------
+
+def save_compiled(arrays: Dict[str, np.ndarray], path: str) -> None:
+    np.savez(path, **arrays)
+
+
+def load_compiled(path: str) -> CompiledModel:
+    with np.load(path, allow_pickle=False) as z:
+        return CompiledModel({k: z[k] for k in z.files})
+
+
+def max_abs_diff(est, compiled: CompiledModel, X: np.ndarray) -> float:
+    """Largest deviation from sklearn over predict (and predict_proba if any)."""
+    diff = 0.0
+    if compiled.is_classifier:
+        diff = float(np.max(np.abs(est.predict_proba(X) - compiled.predict_proba(X))))
+        if not np.array_equal(est.predict(X), compiled.predict(X)):
+            diff = max(diff, float("inf"))
+    else:
+        diff = float(np.max(np.abs(np.asarray(est.predict(X), dtype=float) - compiled.predict(X))))
+    return diff
@@ -1,16 +1,119 @@
-import joblib
+"""
+Model artifacts, loaded on first use rather than at import.
+
+`from .ml_loader import models` (or feature_cols) still works and triggers
+the load; importing this module alone pulls in neither joblib nor the
+sklearn stack, so app start-up and CLI commands that never score stay
+fast. preload() loads everything up front (gunicorn master, see
+gunicorn.conf.py).
+"""
+import json
 import os
+import threading
+import time
+
+from ..config import Config
+from .metrics import REGISTRY
 
 BASE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "ml_models")
+COMPILED_PATH = os.path.join(BASE_PATH, "compiled")
+VERSIONS_PATH = os.path.join(BASE_PATH, "versions")
+# rule-based "models" (thresholds / keyword lists) from app/ml/generate_models.py
+RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "ml")
+
+MODEL_FILES = {
+    "tier1_spend": "tier1_spend_model (6).pkl",
+    "tier2_burn": "tier2_burn_model (4).pkl",
+    "tier2_runway": "tier2_runway_model (4).pkl",
+    "tier3_late": "tier3_late_night_model (1).pkl",
+    "tier3_over": "tier3_overspend_model (1).pkl",
+    "tier3_guilt": "tier3_guilt_model (1).pkl",
+}
+
+def compiled_path(name):
+    return os.path.join(COMPILED_PATH, os.path.splitext(name)[0] + ".npz")
 
 def load_model(name):
+    # ML_COMPILED=1 prefers the NumPy export written by `flask export-compiled-models`
+    if Config.ML_COMPILED and os.path.exists(compiled_path(name)):
+        from .ml_compiled import load_compiled
+        return load_compiled(compiled_path(name))
+    import joblib
     path = os.path.join(BASE_PATH, name)
     return joblib.load(path)
 
-models = {
-    "tier2_burn": load_model("tier2_burn_model (4).pkl"),
-    "tier2_runway": load_model("tier2_runway_model (4).pkl"),
-    "tier3_late": load_model("tier3_late_night_model (1).pkl"),
-    "tier3_over": load_model("tier3_overspend_model (1).pkl"),
-    "tier3_guilt": load_model("tier3_guilt_model (1).pkl"),
-}
+_load_seconds = REGISTRY.gauge(
+    "ml_model_load_seconds", "Wall time spent loading each model at startup", ["model"]
+)
+
+def load_rule(name):
+    import joblib
+    return joblib.load(os.path.join(RULES_PATH, name))
+
+def version_dir(version):
+    return os.path.join(VERSIONS_PATH, version)
+
+def load_versioned(version, key):
+    # artifacts written by app/ml/train.py: <key>.pkl plus <key>.npz
+    base = os.path.join(version_dir(version), key)
+    if Config.ML_COMPILED and os.path.exists(base + ".npz"):
+        from .ml_compiled import load_compiled
+        return load_compiled(base + ".npz")
+    import joblib
+    return joblib.load(base + ".pkl")
+
+def _load_all():
+    out = {}
+    for key, fname in MODEL_FILES.items():
+        t0 = time.perf_counter()
+        if Config.ML_MODEL_VERSION:
+            out[key] = load_versioned(Config.ML_MODEL_VERSION, key)
+        else:
+            out[key] = load_model(fname)
+        _load_seconds.set(time.perf_counter() - t0, model=key)
+    return out
+
+def _load_feature_cols():
+    if Config.ML_MODEL_VERSION:
+        with open(os.path.join(version_dir(Config.ML_MODEL_VERSION), "feature_cols.json")) as f:
+            cols = json.load(f)
+        return {"tier1": cols["tier1_spend"], "tier2": cols["tier2_burn"], "tier3": cols["tier3_over"]}
+    return {
+        "tier1": list(load_model("tier1_feature_cols (5).pkl")),
+        "tier2": list(load_model("tier2_feature_cols (4).pkl")),
+        "tier3": list(load_model("tier3_feature_cols (1).pkl")),
+    }
+
+_lock = threading.Lock()
+_loaded = {}
+
+def _get(name, loader):
+    val = _loaded.get(name)
+    if val is None:
+        with _lock:
+            val = _loaded.get(name)
+            if val is None:
+                val = _loaded[name] = loader()
+    return val
+
+def get_models():
+    return _get("models", _load_all)
+
+def get_feature_cols():
+    """Column order the tier models were trained on."""
+    return _get("feature_cols", _load_feature_cols)
+
+def is_loaded():
+    return "models" in _loaded and "feature_cols" in _loaded
+
+def preload():
+    get_models()
+    get_feature_cols()
+
+def __getattr__(name):
+    # module-level `models` / `feature_cols`, loaded on first access
+    if name == "models":
+        return get_models()
+    if name == "feature_cols":
+        return get_feature_cols()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,27 @@
-import joblib
-import numpy as np
+import threading
+
 
 class MLService:
+    """Loads its model on the first predict(), not at import."""
+
     def __init__(self):
-        # Load model once at startup
-        self.model = joblib.load("app/models/model.pkl")
-        self.feature_cols = joblib.load("app/models/feature_cols.pkl")
+        self.model = None
+        self.feature_cols = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        import joblib
+
+        with self._lock:
+            if self.model is None:
+                self.feature_cols = joblib.load("app/models/feature_cols.pkl")
+                self.model = joblib.load("app/models/model.pkl")
 
     def predict(self, features):
+        import numpy as np
+
+        if self.model is None:
+            self._load()
         # reshape into 2D for sklearn
         features = np.array(features).reshape(1, -1)
 
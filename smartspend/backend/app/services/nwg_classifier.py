@@ -0,0 +1,101 @@
+# app/services/nwg_classifier.py
+"""
+Rule-based Need / Want / Guilt classifier for expenses.
+
+Keyword lists come from app/ml/nwg_classifier.pkl and the late-night /
+emotion rules from app/ml/guilt_spend_detector.pkl. All keywords are
+compiled into one case-insensitive regex with a named group per class, so
+a row costs a single scan of "merchant memo".
+
+Precedence: guilt keywords > need keywords > guilt rules (late night over
+the amount threshold, or an emotional mood/keyword) > want keywords.
+A necessity bought late at night stays a need; a want does not.
+"""
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+# hours [late_night_start, 24) and [0, _LATE_NIGHT_END) count as late night,
+# the same bucket as transaction.day_part_local = 'late_night'
+_LATE_NIGHT_END = 4
+_EMOTIONAL_MOODS = {"stressed"}
+
+
+def _alternation(words: Iterable[str]) -> str:
+    # longest first so "late night" wins over any shorter overlapping word
+    words = sorted({w.strip().lower() for w in words if w and w.strip()}, key=len, reverse=True)
+    return "|".join(re.escape(w).replace(r"\ ", r"\s+") for w in words) or r"(?!)"
+
+
+class SpendClassifier:
+    def __init__(self, nwg: dict, guilt: dict):
+        self.threshold_cents = int(round(float(guilt.get("threshold_amount", 50)) * 100))
+        self.late_night_start = int(guilt.get("late_night_start", 22))
+        self.pattern = re.compile(
+            r"\b(?:"
+            rf"(?P<guilt>{_alternation(nwg.get('guilt_keywords', []))})"
+            rf"|(?P<need>{_alternation(nwg.get('needs_keywords', []))})"
+            rf"|(?P<want>{_alternation(nwg.get('wants_keywords', []))})"
+            rf"|(?P<emotion>{_alternation(guilt.get('emotion_keywords', []))})"
+            r")(?:e?s)?\b",
+            re.IGNORECASE,
+        )
+
+    def _late_night(self, hour: Optional[int]) -> bool:
+        return hour is not None and (hour >= self.late_night_start or hour < _LATE_NIGHT_END)
+
+    def classify(
+        self,
+        merchant: Optional[str],
+        memo: Optional[str],
+        amount_cents: Optional[int] = None,
+        local_hour: Optional[int] = None,
+        mood: Optional[str] = None,
+    ) -> Optional[str]:
+        """'need' | 'want' | 'guilt', or None when no rule fires."""
+        hits = set()
+        text = f"{merchant or ''} {memo or ''}"
+        if text.strip():
+            for m in self.pattern.finditer(text):
+                hits.add(m.lastgroup)
+                if m.lastgroup == "guilt":
+                    return "guilt"
+        if "need" in hits:
+            return "need"
+        emotional = "emotion" in hits or (mood in _EMOTIONAL_MOODS)
+        if emotional or (self._late_night(local_hour) and (amount_cents or 0) >= self.threshold_cents):
+            return "guilt"
+        if "want" in hits:
+            return "want"
+        return None
+
+    def classify_many(self, rows: Iterable[dict]) -> List[Optional[str]]:
+        """rows: dicts with merchant, memo, amount_cents, local_hour / local_occurred_at, mood."""
+        out = []
+        for r in rows:
+            hour = r.get("local_hour")
+            if hour is None:
+                ts = r.get("local_occurred_at")
+                if isinstance(ts, str):
+                    ts = datetime.fromisoformat(ts)
+                hour = ts.hour if ts is not None else None
+            out.append(self.classify(r.get("merchant"), r.get("memo"), r.get("amount_cents"), hour, r.get("mood")))
+        return out
+
+
+@lru_cache(maxsize=1)
+def get_classifier() -> SpendClassifier:
+    from .ml_loader import load_rule
+
+    return SpendClassifier(load_rule("nwg_classifier.pkl"), load_rule("guilt_spend_detector.pkl"))
+
+
+def classify(merchant, memo, amount_cents=None, local_hour=None, mood=None) -> Optional[str]:
+    return get_classifier().classify(merchant, memo, amount_cents, local_hour, mood)
+
+
+def classify_many(rows: Iterable[dict]) -> List[Optional[str]]:
+    return get_classifier().classify_many(rows)
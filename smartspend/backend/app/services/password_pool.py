@@ -0,0 +1,176 @@
+# app/services/password_pool.py
+"""
+PBKDF2 hashing/verification off the request thread.
+
+A small ProcessPoolExecutor (forkserver by default, so children never
+inherit a threaded gunicorn worker) runs the CPU-bound work. At most
+PASSWORD_POOL_MAX_PENDING jobs may be queued or running; beyond that
+callers get PasswordPoolBusy immediately instead of piling up behind a
+login burst. A job that takes longer than PASSWORD_POOL_TIMEOUT_SEC also
+raises PasswordPoolBusy (the child finishes it in the background), and a
+pool whose child died (BrokenProcessPool) is replaced and the job retried
+once. PASSWORD_POOL_WORKERS=0 hashes inline (dev / tests).
+
+The hash parameters are pinned to PASSWORD_PBKDF2_ROUNDS: hashes made with
+any other round count verify fine and come back with a replacement hash.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from ..config import Config
+from .metrics import REGISTRY
+
+_queue_depth = REGISTRY.gauge("password_pool_queue_depth", "Hash/verify jobs queued or running")
+_op_seconds = REGISTRY.histogram(
+    "password_op_seconds", "Wall time of hash/verify as seen by the request, queueing included", ["op"]
+)
+_rejected = REGISTRY.counter("password_pool_rejected_total", "Jobs refused because the pool was full", ["op"])
+_timeouts = REGISTRY.counter("password_pool_timeouts_total", "Jobs abandoned after PASSWORD_POOL_TIMEOUT_SEC", ["op"])
+_restarts = REGISTRY.counter("password_pool_restarts_total", "Pools replaced after a child process died")
+_rehashed = REGISTRY.counter("password_rehash_total", "Hashes upgraded on login after a parameter change")
+
+
+class PasswordPoolBusy(RuntimeError):
+    pass
+
+
+@lru_cache(maxsize=4)
+def _context(rounds: int) -> CryptContext:
+    return CryptContext(
+        schemes=["pbkdf2_sha256"],
+        pbkdf2_sha256__default_rounds=rounds,
+        # anything outside [rounds, rounds] is reported as needing an update
+        pbkdf2_sha256__min_rounds=rounds,
+        pbkdf2_sha256__max_rounds=rounds,
+    )
+
+
+# ---- run inside the pool (top-level so they pickle) ----
+
+def _hash(plain: str, rounds: int) -> str:
+    return _context(rounds).hash(plain)
+
+
+def _verify_and_update(plain: str, hashed: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    try:
+        return _context(rounds).verify_and_update(plain, hashed)
+    except (ValueError, TypeError):
+        # malformed / unknown hash format: treat as a failed login
+        return False, None
+
+
+class PasswordPool:
+    def __init__(self, workers: int, max_pending: int, start_method: str = "forkserver",
+                 timeout: Optional[float] = None):
+        self.workers = max(0, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self.start_method = start_method
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None or self._pid != os.getpid():
+            with self._lock:
+                if self._pool is None or self._pid != os.getpid():
+                    methods = multiprocessing.get_all_start_methods()
+                    method = self.start_method if self.start_method in methods else "spawn"
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context(method)
+                    )
+                    self._pid = os.getpid()
+                    self._pending = 0
+        return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+                _restarts.inc()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _call(self, op: str, fn, *args):
+        for attempt in (0, 1):
+            pool = self._executor()
+            try:
+                future = pool.submit(fn, *args)
+                return future.result(timeout=self.timeout)
+            except BrokenProcessPool:
+                # a child died (OOM kill, segfault): start a fresh pool, retry once
+                self._discard(pool)
+                if attempt:
+                    raise
+            except FutureTimeout:
+                future.cancel()
+                _timeouts.inc(op=op)
+                raise PasswordPoolBusy(op) from None
+
+    def run(self, op: str, fn, *args):
+        t0 = time.perf_counter()
+        try:
+            if self.workers == 0:
+                return fn(*args)
+            self._executor()
+            with self._lock:
+                if self._pending >= self.max_pending:
+                    _rejected.inc(op=op)
+                    raise PasswordPoolBusy(op)
+                self._pending += 1
+                _queue_depth.set(self._pending)
+            try:
+                return self._call(op, fn, *args)
+            finally:
+                with self._lock:
+                    self._pending -= 1
+                    _queue_depth.set(self._pending)
+        finally:
+            _op_seconds.observe(time.perf_counter() - t0, op=op)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def shutdown(self) -> None:
+        if self._pool is not None and self._pid == os.getpid():
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+
+_pool: Optional[PasswordPool] = None
+
+
+def get_pool() -> PasswordPool:
+    global _pool
+    if _pool is None:
+        _pool = PasswordPool(
+            Config.PASSWORD_POOL_WORKERS,
+            Config.PASSWORD_POOL_MAX_PENDING,
+            Config.PASSWORD_POOL_START_METHOD,
+            Config.PASSWORD_POOL_TIMEOUT_SEC,
+        )
+    return _pool
+
+
+def hash_password(plain: str) -> str:
+    return get_pool().run("hash", _hash, plain, Config.PASSWORD_PBKDF2_ROUNDS)
+
+
+def verify_and_update(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """(ok, new_hash): new_hash is set when the stored hash uses stale parameters."""
+    ok, new_hash = get_pool().run("verify", _verify_and_update, plain, hashed, Config.PASSWORD_PBKDF2_ROUNDS)
+    if ok and new_hash:
+        _rehashed.inc()
+    return ok, new_hash
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime, date
 from ..extensions import db
 from ..models import MonthlyPeriod
+from ..utils.db_routing import pin_primary
 from .payday import get_user_pay_rule, get_period_bounds
 
 def get_or_create_period(user_id: int, when: datetime) -> MonthlyPeriod:
@@ -11,6 +12,7 @@ def get_or_create_period(user_id: int, when: datetime) -> MonthlyPeriod:
     Today it simply stores to the row keyed by the calendar month of `when`.
     When you later add a true Period model, only this function needs to change.
     """
+    pin_primary()   # get-or-create: never decide the insert on replica data
     # You can look at the rule if you want (for future use)
     _ = get_user_pay_rule(user_id)
     # For now, keep using calendar month buckets to match your schema:
@@ -0,0 +1,219 @@
+# app/services/power_save.py
+"""
+Power-Save trigger evaluation (rule: app/ml/power_saving_trigger.pkl).
+
+A user triggers when their runway at the official 30-day burn covers less
+than (1 - trigger_threshold) of their runway goal, i.e. threshold_ratio =
+days_left / goal_days <= 0.70 with the shipped threshold. Matches
+power_saving_trigger_ml_v1.csv: suggested_daily_budget = balance / goal_days.
+"""
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import case, func
+
+from ..extensions import db
+from ..models import GoalRunway, PowerSaveEvent, Transaction, User
+from ..utils.tz import local_today
+from .bulk import upsert_rows, user_id_chunks
+
+# same window as goals/dashboard burn: expenses since day - 30, divided by 30
+BURN_WINDOW_DAYS = 30
+DEFAULT_GOAL_DAYS = 30
+
+_UPSERT_COLS = (
+    "goal_days", "current_days_left", "threshold_ratio",
+    "suggested_daily_budget_cents", "balance_cents", "burn_cents", "triggered_at",
+)
+
+
+@lru_cache(maxsize=1)
+def trigger_threshold() -> float:
+    from .ml_loader import load_rule
+
+    return float(load_rule("power_saving_trigger.pkl")["trigger_threshold"])
+
+
+def evaluate(goal_days: np.ndarray, balance_cents: np.ndarray, burn_cents: np.ndarray,
+             threshold: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """Vectorized rule over aligned per-user arrays."""
+    threshold = trigger_threshold() if threshold is None else threshold
+    goal = np.maximum(goal_days.astype(float), 1.0)
+    bal = balance_cents.astype(float)
+    burn = burn_cents.astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_left = np.where(burn > 0, bal / burn, np.inf)
+    ratio = days_left / goal
+    return {
+        "days_left": days_left,
+        "threshold_ratio": ratio,
+        # no spending in the window => nothing to save on
+        "triggered": (burn > 0) & (ratio <= 1.0 - threshold),
+        "suggested_daily_budget_cents": np.floor(np.maximum(bal, 0.0) / goal),
+    }
+
+
+def _inputs(uids: Sequence[int], day: date) -> Dict[str, np.ndarray]:
+    """Goal days, balance and burn for each user as of local `day`."""
+    row_of = {u: i for i, u in enumerate(uids)}
+    U = len(uids)
+    goal = np.full(U, DEFAULT_GOAL_DAYS, dtype=np.int64)
+    balance = np.zeros(U, dtype=np.int64)
+    burn = np.zeros(U, dtype=np.int64)
+
+    signed = func.sum(
+        case(
+            (Transaction.type == "income", Transaction.amount_cents),
+            else_=-Transaction.amount_cents,
+        )
+    )
+    win_exp = func.sum(
+        case(
+            (
+                (Transaction.type == "expense")
+                & (Transaction.txn_date_local >= day - timedelta(days=BURN_WINDOW_DAYS)),
+                Transaction.amount_cents,
+            ),
+            else_=0,
+        )
+    )
+    for uid, bal, exp in (
+        db.session.query(Transaction.user_id, signed, win_exp)
+        .filter(Transaction.user_id.in_(uids), Transaction.txn_date_local <= day)
+        .group_by(Transaction.user_id)
+    ):
+        i = row_of[int(uid)]
+        balance[i] = int(bal or 0)
+        exp = max(int(exp or 0), 0)
+        burn[i] = max(exp // BURN_WINDOW_DAYS, 1) if exp > 0 else 0
+
+    # latest effective goal per user wins
+    goals = (
+        db.session.query(GoalRunway.user_id, GoalRunway.target_days, GoalRunway.effective_from)
+        .filter(
+            GoalRunway.user_id.in_(uids),
+            GoalRunway.effective_from <= day,
+            (GoalRunway.effective_to.is_(None)) | (GoalRunway.effective_to >= day),
+        )
+        .all()
+    )
+    latest: Dict[int, tuple] = {}
+    for uid, days, eff in goals:
+        uid = int(uid)
+        if uid not in latest or str(eff) > str(latest[uid][1]):
+            latest[uid] = (int(days or DEFAULT_GOAL_DAYS), eff)
+    for uid, (days, _) in latest.items():
+        goal[row_of[uid]] = days
+
+    return {"goal_days": goal, "balance_cents": balance, "burn_cents": burn}
+
+
+def evaluate_users(uids: Sequence[int], day: date) -> List[dict]:
+    """One evaluation per user in `uids` for `day`; rows carry `triggered`."""
+    uids = [int(u) for u in uids]
+    if not uids:
+        return []
+    inp = _inputs(uids, day)
+    res = evaluate(inp["goal_days"], inp["balance_cents"], inp["burn_cents"])
+    now = datetime.utcnow()
+    return [
+        {
+            "user_id": uids[i],
+            "day": day,
+            "triggered": bool(res["triggered"][i]),
+            "goal_days": int(inp["goal_days"][i]),
+            "current_days_left": round(float(res["days_left"][i]), 2),
+            "threshold_ratio": round(float(res["threshold_ratio"][i]), 4),
+            "suggested_daily_budget_cents": int(res["suggested_daily_budget_cents"][i]),
+            "balance_cents": int(inp["balance_cents"][i]),
+            "burn_cents": int(inp["burn_cents"][i]),
+            "triggered_at": now,
+        }
+        for i in range(len(uids))
+    ]
+
+
+def record_events(rows: List[dict]) -> int:
+    """
+    Latest evaluation wins: upsert the (user_id, day) rows that trigger and
+    delete the ones that no longer do. Returns the number triggered.
+    """
+    fired = [{k: v for k, v in r.items() if k != "triggered"} for r in rows if r["triggered"]]
+    cleared: Dict[date, List[int]] = defaultdict(list)
+    for r in rows:
+        if not r["triggered"]:
+            cleared[r["day"]].append(r["user_id"])
+    for day, ids in cleared.items():
+        db.session.execute(
+            PowerSaveEvent.__table__.delete().where(
+                PowerSaveEvent.user_id.in_(ids), PowerSaveEvent.day == day
+            )
+        )
+    if fired:
+        upsert_rows(PowerSaveEvent.__table__, fired, ("user_id", "day"), _UPSERT_COLS)
+    else:
+        db.session.commit()
+    return len(fired)
+
+
+def evaluate_user(user_id: int, tzname: Optional[str] = None) -> Optional[dict]:
+    """
+    Incremental path, run after every transaction or goal write: re-evaluate
+    one user for their current local day and record the result. Returns the
+    event when it triggers, else None (and today's event, if any, is gone).
+    """
+    rows = evaluate_users([user_id], local_today(tzname))
+    record_events(rows)
+    return rows[0] if rows and rows[0]["triggered"] else None
+
+
+def reevaluate_after_write(user_id: int, tzname: Optional[str] = None) -> Optional[dict]:
+    """evaluate_user() for write endpoints: the write has already committed, so a failure is only logged."""
+    try:
+        return evaluate_user(user_id, tzname)
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("power-save evaluation failed for user %s", user_id)
+        return None
+
+
+def run_power_save_job(day: Optional[date] = None, chunk_size: int = 1000) -> dict:
+    """
+    Evaluate every active user, chunked, for `day` or (default) each user's
+    own local today; upsert the triggers and clear the rest.
+    """
+    t0 = time.perf_counter()
+    totals = {"users": 0, "triggered": 0, "chunks": 0}
+    for ids in user_id_chunks(chunk_size):
+        totals["users"] += len(ids)
+        totals["chunks"] += 1
+        if day is not None:
+            by_day = {day: ids}
+        else:
+            by_day = defaultdict(list)
+            for uid, tzname in db.session.query(User.id, User.timezone).filter(User.id.in_(ids)):
+                by_day[local_today(tzname)].append(int(uid))
+        for d, day_ids in by_day.items():
+            totals["triggered"] += record_events(evaluate_users(day_ids, d))
+    totals["seconds"] = round(time.perf_counter() - t0, 3)
+    return totals
+
+
+def event_payload(ev) -> dict:
+    """API shape for a PowerSaveEvent row or an evaluate_users() dict."""
+    get = ev.get if isinstance(ev, dict) else (lambda k: getattr(ev, k))
+    return {
+        "triggered": True,
+        "day": get("day").isoformat(),
+        "goal_days": get("goal_days"),
+        "current_days_left": get("current_days_left"),
+        "threshold_ratio": get("threshold_ratio"),
+        "suggested_daily_budget_cents": int(get("suggested_daily_budget_cents")),
+    }
@@ -0,0 +1,156 @@
+# app/services/rate_limit.py
+"""
+Token-bucket throttling for the auth endpoints.
+
+Each key (client IP, account email) owns a bucket of `burst` tokens that
+refills at `per_min` tokens a minute; a request spends one token from every
+bucket it touches and is refused, with the wait until the emptiest bucket
+has a token again, when any of them is dry.
+
+Buckets live in this process by default (MemoryBackend, so each gunicorn
+worker enforces its own share). With RATE_LIMIT_REDIS_URL set they are kept
+in Redis and shared by every worker and host; if Redis is missing or down
+the limiter falls back to the in-process buckets rather than failing logins.
+Anything with the same `take()` signature can stand in as a backend.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from ..config import Config
+from .metrics import REGISTRY
+
+log = logging.getLogger(__name__)
+
+_limited = REGISTRY.counter("rate_limited_total", "Requests refused by the rate limiter", ["rule"])
+_backend_errors = REGISTRY.counter("rate_limit_backend_errors_total", "Shared-backend failures (fell back to memory)")
+
+
+class MemoryBackend:
+    """Per-process buckets; the least recently used keys are dropped past `max_keys`."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, burst: int, per_sec: float, now: float) -> Tuple[bool, float]:
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (float(burst), now))
+            tokens = min(float(burst), tokens + (now - ts) * per_sec)
+            ok = tokens >= 1.0
+            if ok:
+                tokens -= 1.0
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return ok, 0.0 if ok else (1.0 - tokens) / per_sec
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+# refill, spend and store in one round trip; returns {allowed, wait_seconds}
+_TAKE_LUA = """
+local burst = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local b = redis.call('HMGET', KEYS[1], 't', 'ts')
+local t = tonumber(b[1]) or burst
+local ts = tonumber(b[2]) or now
+t = math.min(burst, t + math.max(0, now - ts) * rate)
+local ok = 0
+local wait = 0
+if t >= 1 then
+  t = t - 1
+  ok = 1
+else
+  wait = (1 - t) / rate
+end
+redis.call('HSET', KEYS[1], 't', tostring(t), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {ok, tostring(wait)}
+"""
+
+
+class RedisBackend:
+    def __init__(self, url: str, prefix: str = "rl:"):
+        import redis    # optional dependency, only needed with RATE_LIMIT_REDIS_URL
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.05)
+        self._take = self._client.register_script(_TAKE_LUA)
+
+    def take(self, key: str, burst: int, per_sec: float, now: float) -> Tuple[bool, float]:
+        ok, wait = self._take(keys=[self.prefix + key], args=[burst, per_sec, now])
+        return bool(int(ok)), float(wait)
+
+
+class RateLimiter:
+    def __init__(self, backend=None, fallback: Optional[MemoryBackend] = None):
+        self.fallback = fallback or MemoryBackend()
+        self.backend = backend or self.fallback
+
+    def take(self, key: str, burst: int, per_min: float) -> Tuple[bool, float]:
+        per_sec = per_min / 60.0
+        now = time.time()
+        if self.backend is not self.fallback:
+            try:
+                return self.backend.take(key, burst, per_sec, now)
+            except Exception:
+                _backend_errors.inc()
+                log.warning("rate-limit backend failed; using in-process buckets", exc_info=True)
+        return self.fallback.take(key, burst, per_sec, now)
+
+    def check(self, rules: Iterable[Tuple[str, str, int, float]]) -> float:
+        """rules: (rule name, key, burst, per_min). 0.0 if allowed, else seconds to wait."""
+        wait = 0.0
+        for rule, key, burst, per_min in rules:
+            ok, w = self.take(f"{rule}:{key}", burst, per_min)
+            if not ok:
+                _limited.inc(rule=rule)
+                wait = max(wait, w)
+        return wait
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        backend = None
+        if Config.RATE_LIMIT_REDIS_URL:
+            try:
+                backend = RedisBackend(Config.RATE_LIMIT_REDIS_URL)
+            except Exception:
+                log.warning("RATE_LIMIT_REDIS_URL set but Redis is unavailable; using in-process buckets",
+                            exc_info=True)
+        _limiter = RateLimiter(backend)
+    return _limiter
+
+
+def set_backend(backend) -> None:
+    """Swap the shared backend (e.g. a local stand-in in dev); None = in-process only."""
+    global _limiter
+    _limiter = RateLimiter(backend)
+
+
+def auth_wait(ip: Optional[str], email: Optional[str]) -> int:
+    """Whole seconds the caller must wait before another sign-in/sign-up attempt (0 = go)."""
+    if not Config.RATE_LIMIT_ENABLED:
+        return 0
+    rules = []
+    if ip:
+        rules.append(("auth_ip", ip, Config.RATE_LIMIT_AUTH_IP_BURST, Config.RATE_LIMIT_AUTH_IP_PER_MIN))
+    if email:
+        rules.append(("auth_email", email, Config.RATE_LIMIT_AUTH_EMAIL_BURST, Config.RATE_LIMIT_AUTH_EMAIL_PER_MIN))
+    wait = get_limiter().check(rules)
+    return int(math.ceil(wait)) if wait > 0 else 0
@@ -0,0 +1,77 @@
+# app/services/refresh_tokens.py
+"""
+Refresh-token lookup and retention.
+
+Every /auth/refresh revokes one row and inserts another, so the table only
+grows. Lookups go through the unique token_hash index alone (one row, no
+sort) and the remaining conditions are checked on that row, which keeps
+refresh latency independent of how much history is stored.
+`prune_refresh_tokens()` deletes expired and long-revoked rows in small
+id batches so it can run next to live traffic.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ..extensions import db
+from ..models import RefreshToken
+
+
+def find_active(token_hash: str, user_id: int, now: Optional[datetime] = None) -> Optional[RefreshToken]:
+    """The live (unrevoked, unexpired) token with this hash for `user_id`, else None."""
+    now = now or datetime.utcnow()
+    row = RefreshToken.query.filter(RefreshToken.token_hash == token_hash).one_or_none()
+    if row is None or int(row.user_id) != int(user_id):
+        return None
+    if row.revoked_at is not None or row.expires_at <= now:
+        return None
+    return row
+
+
+def _delete_batches(cond, batch_size: int, pause_s: float, max_batches: Optional[int]) -> tuple:
+    deleted = batches = 0
+    while max_batches is None or batches < max_batches:
+        # no ORDER BY: each batch is a plain range read on cond's index, and
+        # deleted rows drop out of the next one
+        ids = [int(r[0]) for r in db.session.query(RefreshToken.id).filter(cond).limit(batch_size)]
+        if not ids:
+            break
+        db.session.query(RefreshToken).filter(RefreshToken.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        deleted += len(ids)
+        batches += 1
+        if pause_s:
+            time.sleep(pause_s)     # let replication / other writers catch up
+    return deleted, batches
+
+
+def prune_refresh_tokens(
+    expired_grace_days: int = 1,
+    revoked_grace_days: int = 7,
+    batch_size: int = 5000,
+    pause_s: float = 0.0,
+    max_batches: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> dict:
+    """
+    Delete rows expired for more than `expired_grace_days` and rows revoked
+    more than `revoked_grace_days` ago (rotated-away chain links and logouts).
+    Each condition walks its own index; every batch commits on its own.
+    """
+    t0 = time.perf_counter()
+    now = now or datetime.utcnow()
+    expired, b1 = _delete_batches(
+        RefreshToken.expires_at < now - timedelta(days=expired_grace_days), batch_size, pause_s, max_batches
+    )
+    left = None if max_batches is None else max(max_batches - b1, 0)
+    revoked, b2 = _delete_batches(
+        RefreshToken.revoked_at < now - timedelta(days=revoked_grace_days), batch_size, pause_s, left
+    )
+    return {
+        "expired": expired,
+        "revoked": revoked,
+        "batches": b1 + b2,
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
@@ -0,0 +1,198 @@
+# app/services/runway_shadow.py
+"""
+Shadow inference for runway: the hot endpoints keep serving balance // burn
+(capped, see goals/dashboard) and hand the inputs plus the value they served
+to a small background pool, which scores tier2_runway_model on the same user
+for their local today and logs both numbers to runway_shadow.
+
+Request threads only do a non-blocking submit; once RUNWAY_SHADOW_MAX_PENDING
+jobs are queued, new ones are dropped (and counted) instead of waiting.
+"""
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import func
+
+from ..extensions import db
+from ..models import RunwayShadow
+from ..utils.tz import local_today
+from .metrics import REGISTRY
+
+_jobs = REGISTRY.counter("runway_shadow_jobs_total", "Shadow runway jobs by outcome", ["outcome"])
+_latency = REGISTRY.histogram("runway_shadow_seconds", "Feature build + model call per shadow job")
+_pending_gauge = REGISTRY.gauge("runway_shadow_pending", "Shadow jobs queued or running")
+
+
+class ShadowRunner:
+    def __init__(self, workers: int = 2, max_pending: int = 100):
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        # a pool inherited through fork has no live threads; start a fresh one
+        if self._pool is None or self._pid != os.getpid():
+            with self._lock:
+                if self._pool is None or self._pid != os.getpid():
+                    self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="runway-shadow")
+                    self._pid = os.getpid()
+                    self._pending = 0
+        return self._pool
+
+    def submit(self, fn, *args) -> bool:
+        pool = self._executor()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                _jobs.inc(outcome="dropped")
+                return False
+            self._pending += 1
+            _pending_gauge.set(self._pending)
+        pool.submit(self._run, fn, *args)
+        return True
+
+    def _run(self, fn, *args):
+        try:
+            fn(*args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                _pending_gauge.set(self._pending)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+
+_runner: Optional[ShadowRunner] = None
+
+
+def _get_runner() -> ShadowRunner:
+    global _runner
+    if _runner is None:
+        cfg = current_app.config
+        _runner = ShadowRunner(cfg.get("RUNWAY_SHADOW_WORKERS", 2), cfg.get("RUNWAY_SHADOW_MAX_PENDING", 100))
+    return _runner
+
+
+def model_runway_days(user_id: int, day: date) -> Optional[float]:
+    """tier2_runway_model for one user on `day`; None while features are incomplete."""
+    from .daily_risk import build_features
+    from .ml_loader import feature_cols, models
+
+    batch = build_features([user_id], day, day)
+    if not len(batch):
+        return None
+    X = batch.matrix(feature_cols["tier2"])
+    if not np.isfinite(X).all():
+        return None
+    return float(models["tier2_runway"].predict(X)[0])
+
+
+def _score_and_log(app, user_id: int, source: str, balance_cents: int, burn_cents: int,
+                   served_days: float, day: date) -> None:
+    with app.app_context():
+        t0 = time.perf_counter()
+        try:
+            model_days = model_runway_days(user_id, day)
+            dt = time.perf_counter() - t0
+            _latency.observe(dt)
+            if model_days is None:
+                _jobs.inc(outcome="skipped")
+                return
+            db.session.add(RunwayShadow(
+                user_id=user_id,
+                source=source,
+                heuristic_days=served_days,
+                model_days=model_days,
+                diff_days=model_days - served_days,
+                abs_diff_days=abs(model_days - served_days),
+                balance_cents=balance_cents,
+                burn_cents=burn_cents,
+                model_ms=dt * 1000.0,
+                created_at=datetime.utcnow(),
+            ))
+            db.session.commit()
+            _jobs.inc(outcome="logged")
+        except Exception:
+            db.session.rollback()
+            _jobs.inc(outcome="error")
+            app.logger.exception("runway shadow failed for user %s", user_id)
+
+
+def shadow_runway(user_id: int, source: str, balance_cents: int, burn_cents: int,
+                  served_days: float, tzname: Optional[str] = None) -> bool:
+    """
+    Queue a shadow comparison for the runway just served (`served_days`,
+    exactly as the endpoint returned it). Never blocks and never raises
+    into the request; returns whether the job was queued.
+    """
+    cfg = current_app.config
+    if not cfg.get("RUNWAY_SHADOW_ENABLED", False) or burn_cents <= 0:
+        return False
+    if random.random() >= cfg.get("RUNWAY_SHADOW_SAMPLE_RATE", 1.0):
+        return False
+    try:
+        return _get_runner().submit(
+            _score_and_log, current_app._get_current_object(),
+            int(user_id), source, int(balance_cents), int(burn_cents), float(served_days),
+            local_today(tzname),
+        )
+    except Exception:
+        current_app.logger.exception("runway shadow submit failed")
+        return False
+
+
+def shadow_stats(days: int = 7) -> dict:
+    """Aggregate heuristic-vs-model error over the last `days` days, per source."""
+    since = datetime.utcnow() - timedelta(days=days)
+    rows = (
+        db.session.query(
+            RunwayShadow.source,
+            func.count(RunwayShadow.id),
+            func.avg(RunwayShadow.abs_diff_days),
+            func.avg(RunwayShadow.diff_days),
+            func.max(RunwayShadow.abs_diff_days),
+            func.avg(RunwayShadow.model_ms),
+        )
+        .filter(RunwayShadow.created_at >= since)
+        .group_by(RunwayShadow.source)
+        .all()
+    )
+    by_source = {}
+    for source, n, mae, bias, worst, ms in rows:
+        abs_diffs = np.array([
+            r[0] for r in db.session.query(RunwayShadow.abs_diff_days)
+            .filter(RunwayShadow.created_at >= since, RunwayShadow.source == source)
+            .order_by(RunwayShadow.id.desc())
+            .limit(100_000)
+        ])
+        by_source[source] = {
+            "count": int(n),
+            "mean_abs_diff_days": float(mae or 0.0),
+            "mean_diff_days": float(bias or 0.0),        # > 0: model sees more runway
+            "p50_abs_diff_days": float(np.percentile(abs_diffs, 50)) if len(abs_diffs) else 0.0,
+            "p90_abs_diff_days": float(np.percentile(abs_diffs, 90)) if len(abs_diffs) else 0.0,
+            "max_abs_diff_days": float(worst or 0.0),
+            "avg_model_ms": float(ms or 0.0),
+        }
+    jobs = {s["labels"]["outcome"]: int(s["value"]) for s in _jobs.samples()}
+    return {
+        "window_days": days,
+        "enabled": bool(current_app.config.get("RUNWAY_SHADOW_ENABLED", False)),
+        "sources": by_source,
+        # this worker only
+        "jobs": jobs,
+        "pending": _runner.pending if _runner else 0,
+    }
@@ -0,0 +1,124 @@
+# app/services/spend_forecast.py
+"""
+Per-category spend forecast with the tier1 model.
+
+One (categories x 14 days) spend array per user, one feature row per
+expense category, one predict() call for all of them. Results are cached
+per user for their current local day, at most
+SPEND_FORECAST_CACHE_TTL_SEC, and dropped on any transaction or category
+write for that user in this worker.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func
+
+from ..config import Config
+from ..extensions import db
+from ..models import Category, Transaction
+from ..utils.cache import LRUCache
+from ..utils.tz import get_zoneinfo
+
+_WINDOW = 7
+# ma7 for today and yesterday (trend) needs 8 days; keep two full windows
+_HISTORY_DAYS = 2 * _WINDOW
+
+_cache = LRUCache(maxsize=4096, ttl=Config.SPEND_FORECAST_CACHE_TTL_SEC, name="spend_forecast")
+
+
+def invalidate(user_id: int) -> None:
+    _cache.pop(int(user_id))
+
+
+def cache_stats() -> dict:
+    return _cache.stats()
+
+
+def category_features(user_id: int, today: date):
+    """(category ids, names, ma7 dollars, X) over the user's live expense categories."""
+    from .ml_loader import feature_cols
+
+    cats = (
+        db.session.query(Category.id, Category.name)
+        .filter(Category.user_id == user_id, Category.kind == "expense", Category.deleted_at.is_(None))
+        .order_by(Category.name.asc())
+        .all()
+    )
+    ids = [int(c.id) for c in cats]
+    names = [c.name for c in cats]
+    row_of = {cid: i for i, cid in enumerate(ids)}
+
+    start = today - timedelta(days=_HISTORY_DAYS - 1)
+    spend = np.zeros((len(ids), _HISTORY_DAYS))
+    for cid, d, cents in (
+        db.session.query(Transaction.category_id, Transaction.txn_date_local, func.sum(Transaction.amount_cents))
+        .filter(
+            Transaction.user_id == user_id,
+            Transaction.type == "expense",
+            Transaction.deleted_at.is_(None),
+            Transaction.txn_date_local >= start,
+            Transaction.txn_date_local <= today,
+        )
+        .group_by(Transaction.category_id, Transaction.txn_date_local)
+    ):
+        i = row_of.get(int(cid)) if cid is not None else None
+        if i is None or d is None:
+            continue
+        spend[i, (d - start).days] += float(cents or 0) / 100.0
+
+    last7 = spend[:, -_WINDOW:]
+    ma7 = last7.mean(axis=1)
+    ma7_prev = spend[:, -_WINDOW - 1:-1].mean(axis=1)
+    dow = float(today.weekday())
+    cols = {
+        "ma7_spend_d": ma7,
+        "ma7_trend_d": ma7 - ma7_prev,
+        "ma7_vol_d": last7.std(axis=1, ddof=1),
+        "dow": np.full(len(ids), dow),
+        "is_weekend": np.full(len(ids), float(dow >= 5)),
+    }
+    X = np.column_stack([cols[n] for n in feature_cols["tier1"]]) if ids else np.zeros((0, len(cols)))
+    return ids, names, ma7, X
+
+
+def _forecast(user_id: int, today: date) -> List[dict]:
+    from .ml_loader import models
+
+    ids, names, ma7, X = category_features(user_id, today)
+    if not ids:
+        return []
+    pred = np.maximum(models["tier1_spend"].predict(X), 0.0)
+    return [
+        {
+            "category_id": ids[i],
+            "name": names[i],
+            "ma7_cents": int(round(ma7[i] * 100)),
+            "next_day_cents": int(round(pred[i] * 100)),
+        }
+        for i in range(len(ids))
+    ]
+
+
+def forecast_user(user_id: int, tzname: Optional[str], horizon_days: int = 7) -> Dict[str, object]:
+    """Daily forecast per category, scaled to `horizon_days`. Cached per local day."""
+    today = datetime.now(get_zoneinfo(tzname)).date()
+    hit = _cache.get(int(user_id))
+    cached = hit is not None and hit[0] == today
+    if cached:
+        daily = hit[1]
+    else:
+        daily = _forecast(user_id, today)
+        _cache.set(int(user_id), (today, daily))
+
+    cats = [{**c, "forecast_cents": c["next_day_cents"] * horizon_days} for c in daily]
+    return {
+        "user_id": user_id,
+        "as_of": today.isoformat(),
+        "horizon_days": horizon_days,
+        "categories": cats,
+        "total_forecast_cents": sum(c["forecast_cents"] for c in cats),
+        "cached": cached,
+    }
@@ -0,0 +1,126 @@
+# app/services/warmup.py
+"""
+Per-process warm-up behind the /ready endpoint.
+
+Steps, each run once per process and retried on the next call if it failed:
+  - pool:   open WARMUP_POOL_CONNECTIONS connections on every engine
+            (primary and replica) at once and run SELECT 1 on each, so
+            the pool holds live connections before the first request
+  - models: load every model and rule artifact (services/ml_loader.py)
+            and run one inference through each
+  - caches: seed the identity cache with recently active users and the
+            zoneinfo objects for their timezones
+
+warm_up() needs an app context. WARMUP_ON_START=1 runs it at the end of
+create_app(); otherwise the first /ready call does. Under gunicorn with
+preload the master does the models and caches once (workers inherit them
+on fork) and each worker primes its own pool in post_worker_init. The
+master's warm-up also opens connections on every engine; post_fork
+disposes each engine's pool (without closing the master's sockets) and
+the child forgets the pool step, so no connection crosses the fork.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable, Dict
+
+from flask import current_app
+from sqlalchemy import text
+
+_STEPS = ("pool", "models", "caches")
+_done: Dict[str, float] = {}     # step -> seconds it took
+_errors: Dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def _forget_pool() -> None:
+    _done.pop("pool", None)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pool)
+
+
+def _warm_pool() -> None:
+    from ..extensions import db
+
+    want = max(int(current_app.config.get("WARMUP_POOL_CONNECTIONS", 1)), 1)
+    for engine in {id(e): e for e in db.engines.values()}.values():
+        size = getattr(engine.pool, "size", None)
+        n = min(want, size()) if callable(size) else 1
+        conns = []
+        try:
+            for _ in range(n):
+                conn = engine.connect()
+                conns.append(conn)
+                conn.execute(text("SELECT 1"))
+        finally:
+            for conn in conns:
+                conn.close()
+
+
+def _warm_models() -> None:
+    import numpy as np
+
+    from . import ml_loader
+    from .nwg_classifier import classify
+    from .power_save import trigger_threshold
+
+    ml_loader.preload()
+    cols = ml_loader.get_feature_cols()
+    for key, model in ml_loader.get_models().items():
+        # keys are "<tier>_<name>"; one all-zeros row in that tier's feature order
+        model.predict(np.zeros((1, len(cols[key.split("_", 1)[0]]))))
+    trigger_threshold()
+    classify("warm-up", None, 0, 12, None)
+
+
+def _warm_caches() -> None:
+    from ..extensions import db
+    from ..models import User
+    from ..utils.tz import get_zoneinfo
+    from .identity import seed_identities
+
+    seed_identities(int(current_app.config.get("WARMUP_CACHE_USERS", 1000)))
+    for (tzname,) in db.session.query(User.timezone).distinct():
+        get_zoneinfo(tzname)
+
+
+_RUNNERS: Dict[str, Callable[[], None]] = {"pool": _warm_pool, "models": _warm_models, "caches": _warm_caches}
+
+
+def is_ready() -> bool:
+    return all(step in _done for step in _STEPS)
+
+
+def status() -> dict:
+    return {
+        "ready": is_ready(),
+        "steps": {step: step in _done for step in _STEPS},
+        "seconds": {step: round(s, 3) for step, s in _done.items()},
+        "errors": dict(_errors),
+    }
+
+
+def warm_up(blocking: bool = True) -> dict:
+    """Run the steps not done yet in this process; with blocking=False, return at once if another thread is on it."""
+    if not _lock.acquire(blocking):
+        return status()
+    try:
+        for step in _STEPS:
+            if step in _done:
+                continue
+            t0 = time.perf_counter()
+            try:
+                _RUNNERS[step]()
+            except Exception as e:
+                _errors[step] = f"{type(e).__name__}: {e}"
+                current_app.logger.warning("warm-up step %s failed: %s", step, _errors[step])
+                continue
+            _done[step] = time.perf_counter() - t0
+            _errors.pop(step, None)
+    finally:
+        _lock.release()
+    return status()
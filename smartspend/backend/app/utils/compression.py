@@ -0,0 +1,111 @@
+# app/utils/compression.py
+"""
+Negotiated response compression: br (when the optional `brotli` package
+is installed) or gzip, chosen from Accept-Encoding.
+
+Buffered responses are compressed only when the body is at least
+COMPRESS_MIN_BYTES (tiny bodies grow); streamed responses (see
+utils/json_stream.py) are compressed chunk by chunk with a sync flush
+after each one, so the client still gets the first bytes right away.
+Only JSON and text bodies are touched, and nothing already encoded.
+"""
+from __future__ import annotations
+
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Flask, Response, request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+_COMPRESSIBLE = ("application/json", "application/problem+json", "text/")
+
+
+def _accepts(header: str) -> dict:
+    """Accept-Encoding -> {coding: q}."""
+    out = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        out[name.strip().lower()] = q
+    return out
+
+
+def choose_encoding(header: str) -> Optional[str]:
+    acc = _accepts(header)
+    star = acc.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in (("br", "gzip") if brotli is not None else ("gzip",)):
+        q = acc.get(coding, star)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def _compress(data: bytes, coding: str, level: int, br_quality: int) -> bytes:
+    if coding == "br":
+        return brotli.compress(data, quality=br_quality)
+    co = zlib.compressobj(level, zlib.DEFLATED, 31)     # wbits 31 = gzip container
+    return co.compress(data) + co.flush()
+
+
+def _compress_stream(chunks: Iterable, coding: str, level: int, br_quality: int) -> Iterator[bytes]:
+    if coding == "br":
+        co = brotli.Compressor(quality=br_quality)
+        step, end = (lambda b: co.process(b) + co.flush()), co.finish
+    else:
+        co = zlib.compressobj(level, zlib.DEFLATED, 31)
+        step, end = (lambda b: co.compress(b) + co.flush(zlib.Z_SYNC_FLUSH)), co.flush
+    try:
+        for chunk in chunks:
+            out = step(chunk.encode() if isinstance(chunk, str) else chunk)
+            if out:
+                yield out
+        yield end()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def register_compression(app: Flask) -> None:
+    if not app.config.get("COMPRESS_ENABLED", True):
+        return
+    min_bytes = int(app.config.get("COMPRESS_MIN_BYTES", 1024))
+    level = int(app.config.get("COMPRESS_LEVEL", 6))
+    br_quality = int(app.config.get("COMPRESS_BR_QUALITY", 4))
+
+    @app.after_request
+    def _compress_response(response: Response):
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or request.method == "HEAD"
+                or "Content-Encoding" in response.headers
+                or not (response.mimetype or "").startswith(_COMPRESSIBLE)):
+            return response
+        response.vary.add("Accept-Encoding")
+        coding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if coding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, coding, level, br_quality)
+            response.direct_passthrough = False
+            response.headers.pop("Content-Length", None)
+        else:
+            body = response.get_data()
+            if len(body) < min_bytes:
+                return response
+            response.set_data(_compress(body, coding, level, br_quality))
+        response.headers["Content-Encoding"] = coding
+        return response
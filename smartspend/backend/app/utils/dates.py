@@ -0,0 +1,40 @@
+# app/utils/dates.py
+"""
+Date windows computed in Python and bound as parameters, instead of
+CURRENT_DATE / UTC_TIMESTAMP() / INTERVAL :n DAY in the SQL text, so the
+same statements run on MySQL and SQLite.
+
+    WHERE txn_date_local >= :since      {"since": days_ago(30)}
+    WHERE created_at >= :since          {"since": since_utc(7)}
+
+today() is the UTC calendar date, which is what CURRENT_DATE returned on
+the (UTC) MySQL server.
+
+SQLite hands DATE / DATETIME columns of a raw text() result back as
+strings; give them a type with `text(...).columns(day=Date)` wherever the
+value is used as a date.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+
+def utc_now() -> datetime:
+    """Naive UTC, like every DATETIME the app stores."""
+    return datetime.utcnow()
+
+
+def today() -> date:
+    return utc_now().date()
+
+
+def days_ago(n: int) -> date:
+    return today() - timedelta(days=int(n))
+
+
+def days_ahead(n: int) -> date:
+    return today() + timedelta(days=int(n))
+
+
+def since_utc(days: int) -> datetime:
+    return utc_now() - timedelta(days=int(days))
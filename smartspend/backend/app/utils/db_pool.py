@@ -0,0 +1,111 @@
+# app/utils/db_pool.py
+"""
+Connection-pool settings and instrumentation for the SQLAlchemy engine.
+
+`engine_options(config)` turns the DB_POOL_* settings into
+SQLALCHEMY_ENGINE_OPTIONS with an InstrumentedQueuePool, which records how
+long each checkout waited for a free connection and how many are in use.
+Flask-SQLAlchemy applies the same options to every bind, so the replica
+gets its own instrumented pool; series carry bind="default" / "replica".
+In-memory SQLite keeps SQLAlchemy's default single-connection pool.
+"""
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+from ..services.metrics import REGISTRY
+
+# checkout waits are ~0 until the pool saturates, then jump to pool_timeout
+_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_wait = REGISTRY.histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+                           ["bind"], buckets=_WAIT_BUCKETS)
+_timeouts = REGISTRY.counter("db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout",
+                             ["bind"])
+_in_use = REGISTRY.gauge("db_pool_in_use", "Connections checked out of the pool", ["bind"])
+_connects = REGISTRY.counter("db_pool_connects_total", "New DB connections opened", ["bind"])
+_invalidated = REGISTRY.counter("db_pool_invalidated_total", "Connections discarded (pre-ping failures, errors)",
+                                ["bind"])
+
+
+class InstrumentedQueuePool(QueuePool):
+    bind_label = "default"
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeout:
+            _timeouts.inc(bind=self.bind_label)
+            raise
+        finally:
+            _wait.observe(time.perf_counter() - t0, bind=self.bind_label)
+
+    def recreate(self):
+        # dispose() swaps in a recreated pool; keep its label and marker
+        new = super().recreate()
+        new.bind_label = self.bind_label
+        new._instrumented = getattr(self, "_instrumented", False)
+        return new
+
+
+def _listen(pool, bind: str) -> None:
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_conn, rec):
+        _connects.inc(bind=bind)
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_conn, rec, proxy):
+        _in_use.inc(bind=bind)
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_conn, rec):
+        _in_use.dec(bind=bind)
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_conn, rec, exc):
+        _invalidated.inc(bind=bind)
+
+
+def is_memory_sqlite(uri) -> bool:
+    uri = str(uri or "")
+    return uri == "sqlite://" or (uri.startswith("sqlite") and ":memory:" in uri)
+
+
+def engine_options(config) -> dict:
+    if is_memory_sqlite(config.get("SQLALCHEMY_DATABASE_URI")):
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+
+
+def instrument(engine, bind: str = "default") -> None:
+    """Hook the pool events once; dispose()/recreate() keep the listeners."""
+    if isinstance(engine.pool, InstrumentedQueuePool) and not getattr(engine.pool, "_instrumented", False):
+        engine.pool.bind_label = bind
+        _listen(engine.pool, bind)
+        engine.pool._instrumented = True
+
+
+def pool_status(engine) -> dict:
+    pool = engine.pool
+    out = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        out.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "timeout": pool.timeout(),
+        })
+    return out
@@ -0,0 +1,126 @@
+# app/utils/db_routing.py
+"""
+Primary / read-replica routing for the Flask-SQLAlchemy session.
+
+With MYSQL_REPLICA_URI set the app gets a "replica" bind. During GET/HEAD
+requests plain SELECTs go to it; everything else stays on the primary:
+flushes, INSERT/UPDATE/DELETE (ORM or raw text()), every statement after
+the session's first write, and all requests outside a request context
+(CLI jobs, background pools).
+
+Reads that decide a write (check-then-insert, get-or-create) must not
+see a lagging replica: such code calls pin_primary() first.
+
+Read-your-writes: a successful request that wrote (any non-GET, or a GET
+whose session wrote) marks its user, and that user's GETs read from the
+primary for REPLICA_STICKY_SEC afterwards. Requests that do not name
+their user (signup, login) call acting_user() so the new session is
+marked too. The marks are per worker process, so keep the window
+comfortably above the replica's usual lag; services.identity also
+retries a user it cannot find on the primary.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from flask import Flask, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import TextClause
+
+from ..services.metrics import REGISTRY
+from .cache import LRUCache
+
+REPLICA = "replica"
+_READ_METHODS = ("GET", "HEAD")
+
+_routed = REGISTRY.counter("db_route_total", "Statements routed, by target", ["target"])
+_recent_writers = LRUCache(maxsize=100_000, name="replica_sticky")
+
+
+def _is_read(clause) -> bool:
+    if isinstance(clause, Select):
+        return True
+    if isinstance(clause, TextClause):
+        head = clause.text.lstrip()[:6].upper()
+        return head.startswith("SELECT") or head.startswith("WITH")
+    return False
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            if self._flushing or not _is_read(clause):
+                self.info["wrote"] = True   # the rest of this request reads its own writes
+            elif g.get("db_route") == REPLICA and not self.info.get("wrote"):
+                replica = self._db.engines.get(REPLICA)
+                if replica is not None:
+                    _routed.inc(target=REPLICA)
+                    return replica
+        _routed.inc(target="primary")
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _request_user_id() -> Optional[int]:
+    if g.get("acting_user_id") is not None:
+        return g.acting_user_id
+    claims = g.get("claims")
+    raw = claims.get("sub") if claims else None
+    if raw is None:
+        raw = request.args.get("user_id")
+    if raw is None and request.is_json:
+        body = request.get_json(silent=True)
+        raw = body.get("user_id") if isinstance(body, dict) else None
+    try:
+        return int(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def acting_user(user_id: int) -> None:
+    """Name the user a request acted for when neither a token nor user_id does."""
+    if has_request_context():
+        g.acting_user_id = int(user_id)
+
+
+def reads_replica() -> bool:
+    return has_request_context() and g.get("db_route") == REPLICA
+
+
+def pin_primary() -> None:
+    """Send the rest of this request's statements to the primary."""
+    if has_request_context():
+        g.pop("db_route", None)
+
+
+def _session_wrote() -> bool:
+    from ..extensions import db
+
+    return db.session.registry.has() and bool(db.session.info.get("wrote"))
+
+
+def mark_write(user_id: int, sticky_sec: float) -> None:
+    _recent_writers.set(int(user_id), True, ttl=sticky_sec)
+
+
+def register_db_routing(app: Flask) -> None:
+    if REPLICA not in (app.config.get("SQLALCHEMY_BINDS") or {}):
+        return
+    sticky = float(app.config.get("REPLICA_STICKY_SEC", 5.0))
+
+    @app.before_request
+    def _pick_route():
+        if request.method in _READ_METHODS:
+            uid = _request_user_id()
+            if uid is None or _recent_writers.get(uid) is None:
+                g.db_route = REPLICA
+
+    @app.after_request
+    def _remember_writer(response):
+        if response.status_code >= 400 or request.method == "OPTIONS":
+            return response
+        if request.method not in _READ_METHODS or _session_wrote():
+            uid = _request_user_id()
+            if uid is not None:
+                mark_write(uid, sticky)
+        return response
@@ -0,0 +1,40 @@
+# app/utils/fields.py
+"""
+Sparse fieldsets for list endpoints: `?fields=id,amount_cents,merchant`
+returns only those keys of each item (plus "id" when the item has one),
+so clients that render a few columns skip serializing and downloading
+the rest. Unknown names are ignored; without `fields` items are unchanged.
+"""
+from __future__ import annotations
+
+from typing import FrozenSet, Iterable, Iterator, List, Optional
+
+from flask import request
+
+ALWAYS = frozenset({"id"})
+
+
+def requested_fields(param: str = "fields") -> Optional[FrozenSet[str]]:
+    raw = request.args.get(param)
+    if not raw:
+        return None
+    names = frozenset(f.strip() for f in raw.split(",") if f.strip())
+    return (names | ALWAYS) if names else None
+
+
+def iter_sparse(items: Iterable[dict], fields: Optional[FrozenSet[str]] = None) -> Iterator[dict]:
+    """Lazy sparse(): for generators handed to utils/json_stream."""
+    if fields is None:
+        fields = requested_fields()
+    if fields is None:
+        return iter(items)
+    return ({k: v for k, v in it.items() if k in fields} for it in items)
+
+
+def sparse(items: Iterable[dict], fields: Optional[FrozenSet[str]] = None) -> List[dict]:
+    """Apply the request's fieldset (or `fields`) to a list of item dicts."""
+    if fields is None:
+        fields = requested_fields()
+    if fields is None:
+        return items if isinstance(items, list) else list(items)
+    return list(iter_sparse(items, fields))
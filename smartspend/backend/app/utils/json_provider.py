@@ -0,0 +1,63 @@
+# app/utils/json_provider.py
+"""
+orjson-backed Flask JSON provider, with the stdlib provider as fallback.
+
+Output matches Flask's DefaultJSONProvider so clients see no change:
+sorted keys, compact separators, dates/datetimes as HTTP dates and
+Decimal / dataclass / UUID through Flask's own `default` (orjson is told
+to pass datetimes through to it). numpy scalars and arrays are written
+natively. Non-ASCII text is emitted as UTF-8 rather than \\u escapes.
+Indented output (debug) and dumps() kwargs other than compact separators
+go through the stdlib path.
+
+JSON_PROVIDER=orjson (default) | std. Without orjson installed the app
+silently keeps the stdlib provider.
+"""
+from __future__ import annotations
+
+import typing as t
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+if orjson is not None:
+    _OPTS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+             | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    def _fast(self, **kwargs) -> bool:
+        if kwargs and kwargs != {"separators": (",", ":")}:
+            return False
+        return self.compact is not False and not (self.compact is None and self._app.debug)
+
+    def _dumpb(self, obj: t.Any) -> bytes:
+        return orjson.dumps(obj, default=self.default, option=_OPTS | (orjson.OPT_SORT_KEYS if self.sort_keys else 0))
+
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        if not self._fast(**kwargs):
+            return super().dumps(obj, **kwargs)
+        return self._dumpb(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: t.Any) -> t.Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: t.Any, **kwargs: t.Any):
+        if not self._fast():
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumpb(obj) + b"\n", mimetype=self.mimetype)
+
+
+def register_json_provider(app: Flask) -> None:
+    if orjson is None or app.config.get("JSON_PROVIDER", "orjson") != "orjson":
+        return
+    app.json_provider_class = OrjsonProvider
+    app.json = OrjsonProvider(app)
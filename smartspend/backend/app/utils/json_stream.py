@@ -0,0 +1,66 @@
+# app/utils/json_stream.py
+"""
+Streaming JSON for list endpoints.
+
+`json_list_response(envelope, "items", items)` writes the same bytes the
+normal provider would for `{**envelope, "items": list(items)}` (keys
+sorted, compact). Lists shorter than STREAM_JSON_MIN_ITEMS are returned
+as an ordinary buffered response (keeps Content-Length and whole-body
+compression); longer lists are serialized item by item while the body
+is sent, so time to first byte does not grow with the list.
+
+Generators always stream, and they run after the view and every
+after_request hook, inside the request context (stream_with_context). Any
+query they make is missing from Server-Timing, the slow-request log and
+/metrics, so pass a list unless the result is too big to hold in memory.
+Endpoints whose lists are small and already built in memory (goals
+history, insight alerts) just return a buffered dict; streaming them
+would only add overhead.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator
+
+from flask import Response, current_app, stream_with_context
+
+# items per yielded chunk; one write per item is too chatty for gzip and WSGI
+_CHUNK_ITEMS = 50
+
+
+def _iter_json(envelope: dict, key: str, items: Iterable[Any]) -> Iterator[str]:
+    provider = current_app.json
+
+    def dumps(obj):
+        return provider.dumps(obj, separators=(",", ":"))
+
+    keys = sorted({*envelope, key}) if provider.sort_keys else [*envelope, key]
+    yield "{"
+    for i, k in enumerate(keys):
+        if i:
+            yield ","
+        yield dumps(k) + ":"
+        if k != key:
+            yield dumps(envelope[k])
+            continue
+        buf, first = ["["], True
+        for it in items:
+            if not first:
+                buf.append(",")
+            buf.append(dumps(it))
+            first = False
+            if len(buf) >= 2 * _CHUNK_ITEMS:
+                yield "".join(buf)
+                buf = []
+        buf.append("]")
+        yield "".join(buf)
+    yield "}\n"
+
+
+def json_list_response(envelope: dict, key: str, items: Iterable[Any], status: int = 200) -> Response:
+    min_items = int(current_app.config.get("STREAM_JSON_MIN_ITEMS", 200))
+    if isinstance(items, (list, tuple)) and len(items) < min_items:
+        resp = current_app.json.response({**envelope, key: list(items)})
+    else:
+        resp = Response(stream_with_context(_iter_json(envelope, key, items)), mimetype=current_app.json.mimetype)
+    resp.status_code = status
+    return resp
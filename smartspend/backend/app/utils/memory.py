@@ -0,0 +1,94 @@
+# app/utils/memory.py
+"""
+Shared vs private memory per process, read from /proc/<pid>/smaps_rollup
+(Linux 4.14+). Used to check that preloaded models stay shared across
+gunicorn workers after fork.
+"""
+from __future__ import annotations
+
+import os
+from typing import Dict, List, Optional
+
+_FIELDS = {
+    "Rss": "rss_kb",
+    "Pss": "pss_kb",
+    "Shared_Clean": "shared_clean_kb",
+    "Shared_Dirty": "shared_dirty_kb",
+    "Private_Clean": "private_clean_kb",
+    "Private_Dirty": "private_dirty_kb",
+}
+
+
+def process_memory(pid: int) -> Optional[Dict[str, int]]:
+    """kB totals for one process, or None if it is gone / not readable."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    out = {"pid": pid}
+    for line in lines:
+        key, _, rest = line.partition(":")
+        if key in _FIELDS:
+            out[_FIELDS[key]] = int(rest.split()[0])
+    out["shared_kb"] = out.get("shared_clean_kb", 0) + out.get("shared_dirty_kb", 0)
+    out["private_kb"] = out.get("private_clean_kb", 0) + out.get("private_dirty_kb", 0)
+    return out
+
+
+def children(pid: int) -> List[int]:
+    kids: List[int] = []
+    try:
+        tasks = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return kids
+    for tid in tasks:
+        try:
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                kids.extend(int(p) for p in f.read().split())
+        except OSError:
+            continue
+    return kids
+
+
+def _is_gunicorn(pid: int) -> bool:
+    # argv[0] is gunicorn itself, or python running the gunicorn script
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            argv = f.read().decode(errors="replace").split("\0")[:2]
+    except OSError:
+        return False
+    return any(os.path.basename(a).startswith("gunicorn") for a in argv)
+
+
+def find_gunicorn_master() -> Optional[int]:
+    """First gunicorn process whose parent is not gunicorn."""
+    for name in sorted(os.listdir("/proc"), key=lambda s: (len(s), s)):
+        if not name.isdigit():
+            continue
+        pid = int(name)
+        if not _is_gunicorn(pid):
+            continue
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if not _is_gunicorn(ppid):
+            return pid
+    return None
+
+
+def worker_report(master_pid: int) -> Dict[str, object]:
+    """Master + per-worker memory, with the totals that matter for sizing."""
+    master = process_memory(master_pid)
+    workers = [m for m in (process_memory(p) for p in children(master_pid)) if m]
+    private = [w["private_kb"] for w in workers]
+    return {
+        "master": master,
+        "workers": workers,
+        "avg_worker_private_kb": (sum(private) // len(private)) if private else 0,
+        "avg_worker_shared_kb": (sum(w["shared_kb"] for w in workers) // len(workers)) if workers else 0,
+        # PSS splits shared pages between their users, so this sums to the pool's real footprint
+        "total_pss_kb": sum(m.get("pss_kb", 0) for m in [master or {}] + workers),
+    }
@@ -0,0 +1,166 @@
+# app/utils/request_metrics.py
+"""
+Per-request metrics and the /metrics endpoint.
+
+For every request: latency histogram and request counter labelled by
+blueprint / endpoint / method (and status for the counter), requests in
+flight, and SQL statements / DB time per request (from g.sql_profile,
+see utils/sql_profile.py). At scrape time collectors add LRU cache
+hit/miss counts and the connection pool state.
+
+Labels use the URL rule's endpoint, never the raw path, so cardinality
+stays bounded; unmatched URLs (404s) share endpoint="unmatched". Latency
+is measured to the end of the view and after_request hooks, so a
+streamed body's send time is not included.
+
+Label keys are built once per (endpoint, method, status) and the hot
+path uses the *_key() methods, so the hooks cost a few microseconds per
+request. Methods outside the standard set are counted as method="other",
+so a client cannot mint series with made-up verbs.
+
+/metrics (and /api/v1/ml/metrics) answer only clients allowed by
+metrics_allowed(): METRICS_ALLOW_IPS or a METRICS_TOKEN bearer.
+
+Scrape model: every gunicorn worker keeps its own registry and answers
+/metrics for itself only, with pid="<worker pid>" on every series. A
+scrape through the load balancer reaches one worker at random, so each
+worker's counters stay monotonic under their own pid; aggregate with
+sum without (pid) (rate(...)). For complete coverage scrape every worker
+(or run one worker per scraped target); a restarted worker starts new
+series under its new pid.
+"""
+from __future__ import annotations
+
+import hmac
+import time
+
+from flask import Flask, Response, current_app, g, request
+
+from ..errors import problem
+from ..services.metrics import REGISTRY, Counter, Gauge
+from .cache import all_caches
+
+# request latency: 1 ms .. 10 s
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_SQL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_duration = REGISTRY.histogram(
+    "http_request_duration_seconds", "Request latency up to the end of after_request hooks",
+    ("blueprint", "endpoint", "method"), buckets=_LATENCY_BUCKETS,
+)
+_requests = REGISTRY.counter(
+    "http_requests_total", "Finished requests", ("blueprint", "endpoint", "method", "status"),
+)
+_in_flight = REGISTRY.gauge("http_requests_in_flight", "Requests being handled by this worker")
+_sql_count = REGISTRY.histogram(
+    "http_request_sql_queries", "SQL statements per request", ("blueprint", "endpoint"),
+    buckets=_SQL_COUNT_BUCKETS,
+)
+_sql_seconds = REGISTRY.counter(
+    "http_request_sql_seconds_total", "Time spent in SQL statements", ("blueprint", "endpoint"),
+)
+
+_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+
+# (endpoint, method) -> (latency key, sql key, {status: counter key}), built once per route
+_keys: dict = {}
+_NO_KEY = ()
+
+
+def _route_keys(req) -> tuple:
+    method = req.method if req.method in _METHODS else "other"
+    hit = _keys.get((req.endpoint, method))
+    if hit is None:
+        bp, ep = req.blueprint or "app", req.endpoint or "unmatched"
+        hit = _keys[(req.endpoint, method)] = (
+            _duration.key(blueprint=bp, endpoint=ep, method=method),
+            _sql_count.key(blueprint=bp, endpoint=ep),
+            {},
+        )
+    return hit
+
+
+def _cache_metrics():
+    hits = Counter("cache_hits_total", "LRU cache hits", ("cache",))
+    misses = Counter("cache_misses_total", "LRU cache misses", ("cache",))
+    ratio = Gauge("cache_hit_ratio", "Hits / (hits + misses) since start", ("cache",))
+    size = Gauge("cache_entries", "Entries currently held", ("cache",))
+    for c in all_caches():
+        s = c.stats()
+        hits.inc(s["hits"], cache=s["name"])
+        misses.inc(s["misses"], cache=s["name"])
+        ratio.set(s["hit_ratio"], cache=s["name"])
+        size.set(s["size"], cache=s["name"])
+    return [hits, misses, ratio, size]
+
+
+def _pool_metrics():
+    from ..extensions import db
+    from .db_pool import pool_status
+
+    out = {}
+    for bind_key, engine in db.engines.items():
+        st = pool_status(engine)
+        for field, help in (("size", "Configured pool size"), ("checked_in", "Idle pooled connections"),
+                            ("overflow", "Connections opened beyond pool_size")):
+            if field in st:
+                if field not in out:
+                    out[field] = Gauge(f"db_pool_{field}", help, ("bind",))
+                out[field].set(st[field], bind=bind_key or "default")
+    return list(out.values())
+
+
+def metrics_allowed() -> bool:
+    """True when this request may read metrics (allow-listed address or METRICS_TOKEN)."""
+    cfg = current_app.config
+    allowed = {ip.strip() for ip in cfg.get("METRICS_ALLOW_IPS", "").split(",") if ip.strip()}
+    if request.remote_addr in allowed:
+        return True
+    token = cfg.get("METRICS_TOKEN", "")
+    auth = request.headers.get("Authorization", "")
+    return bool(token) and hmac.compare_digest(auth.encode(), f"Bearer {token}".encode())
+
+
+def register_request_metrics(app: Flask) -> None:
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    REGISTRY.add_collector(_cache_metrics)
+    REGISTRY.add_collector(_pool_metrics)
+
+    @app.before_request
+    def _start_request_metrics():
+        g._get_current_object().metrics_t0 = time.perf_counter()
+        _in_flight.inc_key(_NO_KEY)
+
+    @app.after_request
+    def _record_request_metrics(response):
+        ctx_g = g._get_current_object()
+        t0 = getattr(ctx_g, "metrics_t0", None)
+        if t0 is None:
+            return response
+        req = request._get_current_object()
+        latency_key, sql_key, by_status = _route_keys(req)
+        _duration.observe_key(latency_key, time.perf_counter() - t0)
+        status = response.status_code
+        status_key = by_status.get(status)
+        if status_key is None:
+            status_key = by_status[status] = latency_key + (str(status),)
+        _requests.inc_key(status_key)
+        prof = getattr(ctx_g, "sql_profile", None)
+        if prof is not None:
+            _sql_count.observe_key(sql_key, prof.count)
+            if prof.total_s:
+                _sql_seconds.inc_key(sql_key, prof.total_s)
+        return response
+
+    @app.teardown_request
+    def _end_request_metrics(exc):
+        if g._get_current_object().pop("metrics_t0", None) is not None:
+            _in_flight.inc_key(_NO_KEY, -1.0)
+
+    @app.get("/metrics")
+    def metrics():
+        """This worker's metrics in the Prometheus text format."""
+        if not metrics_allowed():
+            return problem(403, "forbidden", "metrics are restricted")
+        return Response(REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,35 @@
+# app/utils/schema.py
+"""
+Checks that the live database matches what the models write.
+
+transaction.local_occurred_at / txn_date_local / day_part_local started
+out as MySQL CONVERT_TZ generated columns; the ORM now writes them, and
+MySQL rejects any INSERT that names a generated column (error 3105). Until
+`flask migrate-local-fields` has turned them into plain columns, the app
+must not serve: gunicorn's post_worker_init calls require_plain_local_fields().
+"""
+from __future__ import annotations
+
+from typing import Dict
+
+from sqlalchemy import text
+
+def generated_local_columns(session) -> Dict[str, str]:
+    """{column: information_schema extra} for local-field columns still generated (MySQL only)."""
+    if session.get_bind().dialect.name != "mysql":
+        return {}
+    rows = session.execute(text("""
+        SELECT column_name, extra FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = 'transaction'
+          AND column_name IN ('local_occurred_at', 'txn_date_local', 'day_part_local')
+    """)).all()
+    return {col: extra.upper() for col, extra in rows if "GENERATED" in (extra or "").upper()}
+
+
+def require_plain_local_fields(session) -> None:
+    generated = generated_local_columns(session)
+    if generated:
+        raise RuntimeError(
+            f"transaction columns {', '.join(sorted(generated))} are still generated; "
+            "run `flask --app wsgi migrate-local-fields` before serving"
+        )
@@ -0,0 +1,129 @@
+# app/utils/sql_profile.py
+"""
+Per-request SQL profile: statement count, total DB time and the slowest
+statement, collected from SQLAlchemy's before/after_cursor_execute events
+on every engine (primary and replica).
+
+A request that asks for it (X-SQL-Timing: 1 or ?timing=1, the same
+opt-in as /ml/predict's X-ML-Timing) gets it back as a
+`Server-Timing: db;dur=..;desc="N queries"` entry; SQL_TIMING_HEADER=1
+adds it to every response. Requests slower than SLOW_REQUEST_MS are
+logged with the summary. With SQL_PROFILE_REPEATS on (the default under app.testing) the
+same SQL text run SQL_REPEAT_THRESHOLD+ times in one request (an N+1 loop,
+e.g. one BillPayment lookup per bill) is logged and reported in an
+X-SQL-Repeated header.
+
+Statements run outside a request context (CLI, background pools) are not
+recorded.
+"""
+from __future__ import annotations
+
+import time
+from collections import Counter
+from typing import Optional
+
+from flask import Flask, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class SqlProfile:
+    __slots__ = ("count", "total_s", "slowest_s", "slowest_sql", "track_repeats", "statements")
+
+    def __init__(self, track_repeats: bool = False):
+        self.count = 0
+        self.total_s = 0.0
+        self.slowest_s = 0.0
+        self.slowest_sql: Optional[str] = None
+        self.track_repeats = track_repeats
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_s += seconds
+        if seconds > self.slowest_s:
+            self.slowest_s = seconds
+            self.slowest_sql = statement
+        if self.track_repeats:
+            self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list:
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+    def summary(self) -> dict:
+        return {
+            "sql_count": self.count,
+            "sql_ms": round(self.total_s * 1000.0, 2),
+            "slowest_ms": round(self.slowest_s * 1000.0, 2),
+            "slowest_sql": _one_line(self.slowest_sql),
+        }
+
+
+def _one_line(sql: Optional[str], limit: int = 300) -> Optional[str]:
+    if sql is None:
+        return None
+    s = " ".join(sql.split())
+    return s if len(s) <= limit else s[:limit] + "..."
+
+
+def current_profile() -> Optional[SqlProfile]:
+    return g.get("sql_profile") if has_request_context() else None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and "sql_profile" in g:
+        conn.info.setdefault("sql_profile_t0", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("sql_profile_t0")
+    if not starts:
+        return
+    dt = time.perf_counter() - starts.pop()
+    prof = current_profile()
+    if prof is not None:
+        prof.record(statement, dt)
+
+
+def register_sql_profiling(app: Flask) -> None:
+    if not app.config.get("SQL_PROFILE_ENABLED", True):
+        return
+    repeats = app.config.get("SQL_PROFILE_REPEATS")
+    threshold = int(app.config.get("SQL_REPEAT_THRESHOLD", 5))
+    slow_ms = float(app.config.get("SLOW_REQUEST_MS", 1000))
+    always_header = bool(app.config.get("SQL_TIMING_HEADER", False))
+
+    @app.before_request
+    def _start_sql_profile():
+        # app.testing is usually switched on after create_app, so read it per request
+        g.sql_profile = SqlProfile(current_app.testing if repeats is None else repeats)
+        g.request_t0 = time.perf_counter()
+
+    @app.after_request
+    def _report_sql_profile(response):
+        prof = g.get("sql_profile")
+        if prof is None:
+            return response
+        if always_header or request.headers.get("X-SQL-Timing") == "1" or request.args.get("timing") == "1":
+            entry = f'db;dur={prof.total_s * 1000.0:.2f};desc="{prof.count} queries"'
+            prev = response.headers.get("Server-Timing")
+            response.headers["Server-Timing"] = f"{prev}, {entry}" if prev else entry
+
+        if prof.track_repeats:
+            rep = prof.repeated(threshold)
+            if rep:
+                response.headers["X-SQL-Repeated"] = str(len(rep))
+                for sql, n in rep:
+                    app.logger.warning("N+1? %s %s ran %dx: %s", request.method, request.path, n, _one_line(sql))
+
+        elapsed_ms = (time.perf_counter() - g.request_t0) * 1000.0
+        if elapsed_ms >= slow_ms:
+            s = prof.summary()
+            app.logger.warning(
+                "slow request %s %s -> %s in %.0f ms: %d queries, %.1f ms in DB, slowest %.1f ms: %s",
+                request.method, request.path, response.status_code, elapsed_ms,
+                s["sql_count"], s["sql_ms"], s["slowest_ms"], s["slowest_sql"],
+            )
+        return response
@@ -1,4 +1,5 @@
 # app/utils/tz.py
+from datetime import datetime
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 DEFAULT_TZ = "America/New_York"
@@ -10,3 +11,32 @@ def get_zoneinfo(tzname: str | None):
     except ZoneInfoNotFoundError:
         # if tzdata isn’t installed or the key is bad, fall back
         return ZoneInfo("UTC")
+
+
+def local_today(tzname: str | None):
+    """The current calendar date in `tzname`."""
+    return datetime.now(get_zoneinfo(tzname)).date()
+
+
+def day_part(hour: int) -> str:
+    if 4 <= hour <= 11:
+        return "morning"
+    if 12 <= hour <= 15:
+        return "afternoon"
+    if 16 <= hour <= 21:
+        return "evening"
+    return "late_night"
+
+
+def local_fields(occurred_at_utc, tzname: str | None) -> dict:
+    """
+    The stored local-time columns of a transaction, from its naive-UTC
+    occurred_at and the row's timezone (what the old CONVERT_TZ generated
+    columns computed in MySQL).
+    """
+    local = occurred_at_utc.replace(tzinfo=ZoneInfo("UTC")).astimezone(get_zoneinfo(tzname))
+    return {
+        "local_occurred_at": local.replace(tzinfo=None),
+        "txn_date_local": local.date(),
+        "day_part_local": day_part(local.hour),
+    }
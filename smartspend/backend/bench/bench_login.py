@@ -0,0 +1,82 @@
+# bench/bench_login.py
+"""
+Login throughput with PBKDF2 inline vs in services.password_pool.
+
+N threads (standing in for request threads) verify passwords as fast as
+they can for --seconds; meanwhile one extra thread runs a trivial task in a
+loop and records its latency, which is what every non-login request on the
+same worker would feel.
+
+Run from backend/:
+    python bench/bench_login.py [--threads 8] [--workers 2] [--seconds 5] [--rounds 29000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.services.password_pool import PasswordPool, _context, _verify_and_update
+
+
+def _run(pool: PasswordPool, hashed: str, rounds: int, threads: int, seconds: float) -> dict:
+    stop = time.perf_counter() + seconds
+    done = [0] * threads
+    light: list = []
+
+    def login(i: int):
+        while time.perf_counter() < stop:
+            ok, _ = pool.run("verify", _verify_and_update, "Correct-horse-1!", hashed, rounds)
+            assert ok
+            done[i] += 1
+
+    def other_requests():
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            sum(range(2000))
+            light.append(time.perf_counter() - t0)
+            time.sleep(0.001)
+
+    ts = [threading.Thread(target=login, args=(i,)) for i in range(threads)]
+    ts.append(threading.Thread(target=other_requests))
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    lat = np.array(light) * 1000.0
+    return {
+        "logins_per_s": sum(done) / seconds,
+        "light_p50_ms": float(np.percentile(lat, 50)),
+        "light_p99_ms": float(np.percentile(lat, 99)),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--rounds", type=int, default=29000)
+    args = ap.parse_args()
+
+    hashed = _context(args.rounds).hash("Correct-horse-1!")
+    print(f"threads={args.threads} rounds={args.rounds} seconds={args.seconds}")
+    print(f"{'mode':<16} {'logins/s':>10} {'light p50 ms':>13} {'light p99 ms':>13}")
+    for label, workers in (("inline", 0), (f"pool x{args.workers}", args.workers)):
+        pool = PasswordPool(workers, max_pending=args.threads * 2)
+        if workers:
+            pool.run("verify", _verify_and_update, "warm", hashed, args.rounds)   # start the children
+        r = _run(pool, hashed, args.rounds, args.threads, args.seconds)
+        pool.shutdown()
+        print(f"{label:<16} {r['logins_per_s']:>10.1f} {r['light_p50_ms']:>13.3f} {r['light_p99_ms']:>13.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
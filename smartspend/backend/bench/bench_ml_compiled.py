@@ -0,0 +1,66 @@
+# bench/bench_ml_compiled.py
+"""
+sklearn vs pure-NumPy (app.services.ml_compiled) latency for the shipped models.
+
+Run from backend/:
+    python bench/bench_ml_compiled.py [--batch 1000] [--repeat 2000]
+
+Fails (exit 1) if any compiled model deviates from sklearn by more than
+--tolerance, so it doubles as an equivalence check.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import timeit
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.filterwarnings("ignore")
+
+import joblib
+import numpy as np
+
+from app.services.ml_compiled import CompiledModel, export_estimator, max_abs_diff
+from app.services.ml_loader import BASE_PATH, MODEL_FILES
+
+
+def _us_per_call(fn, repeat: int) -> float:
+    best = min(timeit.repeat(fn, number=repeat, repeat=3))
+    return best / repeat * 1e6
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--batch", type=int, default=1000)
+    ap.add_argument("--repeat", type=int, default=2000)
+    ap.add_argument("--tolerance", type=float, default=1e-9)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    ok = True
+    print(f"{'model':<14}{'estimator':<20}{'rows':>6}{'sklearn us':>13}{'numpy us':>11}{'speedup':>9}{'max diff':>11}")
+    for key, fname in MODEL_FILES.items():
+        est = joblib.load(os.path.join(BASE_PATH, fname))
+        comp = CompiledModel(export_estimator(est))
+        method = "predict_proba" if comp.is_classifier else "predict"
+        sk_fn, np_fn = getattr(est, method), getattr(comp, method)
+        n_feat = int(est.n_features_in_)
+
+        for rows, repeat in ((1, args.repeat), (args.batch, max(args.repeat // 20, 10))):
+            X = rng.normal(0.0, 50.0, size=(rows, n_feat))
+            diff = max_abs_diff(est, comp, X)
+            ok &= diff <= args.tolerance
+            t_sk = _us_per_call(lambda: sk_fn(X), repeat)
+            t_np = _us_per_call(lambda: np_fn(X), repeat)
+            print(f"{key:<14}{type(est).__name__:<20}{rows:>6}{t_sk:>13.1f}{t_np:>11.1f}{t_sk / t_np:>8.1f}x{diff:>11.2g}")
+
+    if not ok:
+        print(f"FAIL: compiled output differs from sklearn by more than {args.tolerance:g}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# bench/bench_pool.py
+"""
+Tail latency as the per-worker connection pool saturates.
+
+Threads stand in for request threads: each checks a connection out of the
+app's engine (configured by DB_POOL_* exactly as in production), runs a
+query, holds the connection for --hold-ms to mimic request work, and
+returns it. Concurrency steps through 1x..8x the pool capacity
+(DB_POOL_SIZE + DB_MAX_OVERFLOW); once it exceeds capacity, checkout wait
+dominates p99 and, past DB_POOL_TIMEOUT, requests fail outright. QueuePool
+is not FIFO-fair, so the median can stay low while starved threads time out;
+the wait percentiles include those failed checkouts.
+
+Run from backend/ (defaults to a throwaway SQLite file):
+    python bench/bench_pool.py [--uri mysql+pymysql://...] [--hold-ms 20] [--seconds 3]
+    DB_POOL_SIZE=2 DB_MAX_OVERFLOW=0 python bench/bench_pool.py
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _pct(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * len(xs)))] if xs else 0.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default="sqlite:////tmp/bench_pool.db")
+    ap.add_argument("--hold-ms", type=float, default=20.0)
+    ap.add_argument("--seconds", type=float, default=3.0)
+    args = ap.parse_args()
+
+    os.environ["MYSQL_URI"] = args.uri
+    from sqlalchemy import text
+
+    from app import create_app
+    from app.extensions import db
+    from app.utils.db_pool import pool_status
+
+    app = create_app()
+    cfg = app.config
+    capacity = cfg["DB_POOL_SIZE"] + cfg["DB_MAX_OVERFLOW"]
+    print(f"pool_size={cfg['DB_POOL_SIZE']} max_overflow={cfg['DB_MAX_OVERFLOW']} "
+          f"timeout={cfg['DB_POOL_TIMEOUT']}s hold={args.hold_ms}ms")
+    print(f"{'threads':>8} {'req/s':>8} {'wait p50 ms':>12} {'wait p99 ms':>12} "
+          f"{'total p99 ms':>13} {'timeouts':>9}")
+
+    with app.app_context():
+        engine = db.engine
+        for mult in (1, 2, 4, 8):
+            threads = capacity * mult
+            stop = time.perf_counter() + args.seconds
+            waits, totals, errors = [], [], [0]
+            lock = threading.Lock()
+
+            def worker():
+                while time.perf_counter() < stop:
+                    t0 = time.perf_counter()
+                    try:
+                        with engine.connect() as conn:
+                            t1 = time.perf_counter()
+                            conn.execute(text("SELECT 1"))
+                            time.sleep(args.hold_ms / 1000.0)
+                    except Exception:
+                        # a timed-out checkout still waited; keep it in the tail
+                        with lock:
+                            errors[0] += 1
+                            waits.append((time.perf_counter() - t0) * 1000.0)
+                        continue
+                    with lock:
+                        waits.append((t1 - t0) * 1000.0)
+                        totals.append((time.perf_counter() - t0) * 1000.0)
+
+            ts = [threading.Thread(target=worker) for _ in range(threads)]
+            for t in ts:
+                t.start()
+            for t in ts:
+                t.join()
+            print(f"{threads:>8} {len(totals) / args.seconds:>8.0f} {_pct(waits, .5):>12.1f} "
+                  f"{_pct(waits, .99):>12.1f} {_pct(totals, .99):>13.1f} {errors[0]:>9}")
+        print(pool_status(engine))
+    if args.uri.startswith("sqlite:///") and os.path.exists(args.uri[len("sqlite:///"):]):
+        os.remove(args.uri[len("sqlite:///"):])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
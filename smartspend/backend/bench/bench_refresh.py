@@ -0,0 +1,119 @@
+# bench/bench_refresh.py
+"""
+Refresh-token lookup latency as refresh_token history grows.
+
+Fills refresh_token with rotation history (mostly revoked rows, a few live
+ones) and, at each 10x checkpoint, times the token_hash point lookup used
+by /auth/refresh (services.refresh_tokens.find_active) against the old
+user_id + hash + revoked + expiry + ORDER BY id query.
+
+Run from backend/ (defaults to a throwaway SQLite file):
+    python bench/bench_refresh.py [--max-rows 1000000] [--uri mysql+pymysql://...]
+
+The 100M-row check is `--max-rows 100000000 --uri <scratch MySQL>`; never
+point --uri at a database that holds real data, the table is created and
+filled in place.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _pct(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default="sqlite:////tmp/bench_refresh.db")
+    ap.add_argument("--max-rows", type=int, default=1_000_000)
+    ap.add_argument("--users", type=int, default=100_000)
+    ap.add_argument("--lookups", type=int, default=2000)
+    ap.add_argument("--insert-batch", type=int, default=50_000)
+    args = ap.parse_args()
+
+    os.environ["MYSQL_URI"] = args.uri
+    if args.uri.startswith("sqlite:///") and os.path.exists(args.uri[len("sqlite:///"):]):
+        os.remove(args.uri[len("sqlite:///"):])
+
+    from app import create_app
+    from app.auth_utils import hash_refresh
+    from app.extensions import db
+    from app.models import RefreshToken
+    from app.services.refresh_tokens import find_active
+
+    app = create_app()
+    rnd = random.Random(7)
+    now = datetime.utcnow()
+    live: list = []     # (hash, user_id) of unrevoked rows to look up
+
+    def legacy(token_hash, user_id):
+        return (
+            RefreshToken.query
+            .filter(
+                RefreshToken.user_id == user_id,
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .order_by(RefreshToken.id.desc())
+            .first()
+        )
+
+    def timed(fn, sample):
+        out = []
+        for h, uid in sample:
+            t0 = time.perf_counter()
+            assert fn(h, uid) is not None
+            out.append((time.perf_counter() - t0) * 1e6)
+            db.session.rollback()
+        return out
+
+    with app.app_context():
+        RefreshToken.__table__.drop(db.engine, checkfirst=True)
+        RefreshToken.__table__.create(db.engine)
+        table = RefreshToken.__table__
+
+        print(f"{'rows':>12} {'hash p50 us':>12} {'hash p99 us':>12} {'legacy p50 us':>14} {'legacy p99 us':>14}")
+        n, checkpoint, seq = 0, 10_000, 0
+        while checkpoint <= args.max_rows:
+            while n < checkpoint:
+                rows = []
+                for _ in range(min(args.insert_batch, checkpoint - n)):
+                    seq += 1
+                    uid = rnd.randint(1, args.users)
+                    h = hash_refresh(f"tok-{seq}")
+                    is_live = rnd.random() < 0.03
+                    created = now - timedelta(days=rnd.randint(0, 60))
+                    rows.append({
+                        "id": seq,          # explicit: BIGINT keys don't autoincrement on SQLite
+                        "user_id": uid,
+                        "token_hash": h,
+                        "created_at": created,
+                        "expires_at": created + timedelta(days=30) if not is_live else now + timedelta(days=30),
+                        "revoked_at": None if is_live else created + timedelta(minutes=30),
+                    })
+                    if is_live:
+                        live.append((h, uid))
+                db.session.execute(table.insert(), rows)
+                db.session.commit()
+                n += len(rows)
+            sample = rnd.sample(live, min(args.lookups, len(live)))
+            new = timed(find_active, sample)
+            old = timed(legacy, sample)
+            print(f"{n:>12,} {_pct(new, .5):>12.0f} {_pct(new, .99):>12.0f} "
+                  f"{_pct(old, .5):>14.0f} {_pct(old, .99):>14.0f}")
+            checkpoint *= 10
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# bench/bench_token_cache.py
+"""
+Requests/s on a bearer-authenticated route with and without the verified
+access-token cache (auth_utils.decode_access_cached).
+
+Uses the Flask test client against a trivial route that only reads
+g.claims, so the number isolates the per-request auth cost. No database
+is touched.
+
+Run from backend/:
+    python bench/bench_token_cache.py [--requests 20000] [--tokens 100]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MYSQL_URI", "sqlite://")
+
+from flask import g
+
+from app import create_app
+from app.auth_utils import _claims_cache, access_cache_stats, mint_access
+from app.config import Config
+
+
+def _rps(client, headers, n: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(n):
+        r = client.get("/_bench/claims", headers=headers[i % len(headers)])
+        assert r.status_code == 200
+    return n / (time.perf_counter() - t0)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=20000)
+    ap.add_argument("--tokens", type=int, default=100, help="Distinct users/tokens cycling through.")
+    args = ap.parse_args()
+
+    app = create_app()
+
+    @app.get("/_bench/claims")
+    def _claims():
+        return {"sub": g.claims["sub"]}
+
+    client = app.test_client()
+    headers = [{"Authorization": f"Bearer {mint_access(i + 1)}"} for i in range(args.tokens)]
+    _rps(client, headers, 500)      # warm up
+
+    size = Config.ACCESS_CACHE_SIZE
+    Config.ACCESS_CACHE_SIZE = 0
+    off = _rps(client, headers, args.requests)
+    Config.ACCESS_CACHE_SIZE = size or 10000
+    _claims_cache.clear()
+    on = _rps(client, headers, args.requests)
+
+    print(f"requests={args.requests} tokens={args.tokens}")
+    print(f"{'no cache':<10} {off:>10.0f} req/s")
+    print(f"{'cache':<10} {on:>10.0f} req/s  ({on / off:.2f}x)  {access_cache_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# bench/check_import_time.py
+"""
+Start-up budget check: `import wsgi` (import + create_app) in a fresh
+interpreter under `python -X importtime`.
+
+Fails (exit 1) when
+  - any module in --forbid is imported at start-up (default: the sklearn /
+    scipy / pandas / joblib stack, which must only load on first model
+    use, see services/ml_loader.py), or
+  - the best of --runs wall times exceeds --budget-ms.
+
+The forbidden-module check is deterministic; the time budget is loose on
+purpose, since machines differ. Run from backend/:
+    python bench/check_import_time.py [--budget-ms 1500] [--top 15]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORBID = ("sklearn", "scipy", "pandas", "joblib")
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def _run() -> tuple:
+    env = {**os.environ, "MYSQL_URI": os.environ.get("CHECK_MYSQL_URI", "sqlite://"), "PYTHONDONTWRITEBYTECODE": "1"}
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import wsgi"],
+        cwd=BACKEND, env=env, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - t0) * 1000.0
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(f"import wsgi failed with exit code {proc.returncode}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), (len(m.group(3)) - 1) // 2))
+    return wall_ms, rows
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--budget-ms", type=float, default=1500.0, help="Max wall time of the best run.")
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--forbid", default=",".join(FORBID), help="Comma-separated top-level packages.")
+    ap.add_argument("--top", type=int, default=15, help="Show the N slowest top-level imports.")
+    args = ap.parse_args()
+
+    results = [_run() for _ in range(max(1, args.runs))]
+    wall_ms, rows = min(results, key=lambda r: r[0])
+
+    forbid = {f.strip() for f in args.forbid.split(",") if f.strip()}
+    bad = sorted({name for name, *_ in rows if name.split(".")[0] in forbid})
+
+    print(f"import wsgi: best of {len(results)} = {wall_ms:.0f} ms wall (budget {args.budget_ms:.0f} ms), "
+          f"{len(rows)} modules")
+    top = sorted((r for r in rows if r[3] <= 1), key=lambda r: -r[2])[: args.top]
+    for name, _self_us, cum_us, depth in top:
+        print(f"  {cum_us / 1000.0:>8.1f} ms  {'  ' * depth}{name}")
+
+    failed = False
+    if bad:
+        failed = True
+        print(f"FAIL: imported at start-up: {', '.join(bad[:20])}{' ...' if len(bad) > 20 else ''}")
+    if wall_ms > args.budget_ms:
+        failed = True
+        print(f"FAIL: {wall_ms:.0f} ms > budget {args.budget_ms:.0f} ms")
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+# bench/loadtest.py
+"""
+Repeatable load test over the /api/v1 endpoints.
+
+Every GET route under /api/v1 without path parameters is discovered from
+the app's url_map, plus a fixed set of write scenarios (login, expense
+create, /ml/predict). Each endpoint runs for --requests requests at
+--concurrency threads, as random users from the synthetic set
+(bench/synth.py) with a bearer token, and reports p50/p95/p99 latency,
+throughput and non-2xx counts.
+
+In-process through the Flask test client by default; --base-url drives
+a running server over HTTP instead (the same users must exist there).
+
+    python bench/synth.py --uri sqlite:////tmp/ss.db --create-schema --users 500
+    python bench/loadtest.py --uri sqlite:////tmp/ss.db --out bench/results/latest.json
+    python bench/loadtest.py --uri ... --baseline bench/results/baseline.json
+
+With --baseline, each endpoint is diffed against the stored run and the
+exit status is 1 if any p95 or throughput regressed beyond --tolerance.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# per-worker diagnostics, not user traffic; writes are covered by the
+# explicit scenarios in _write_scenarios()
+_SKIP_GET = {"/api/v1/ml/batch-stats", "/api/v1/ml/metrics"}
+
+
+def _pct(xs: List[float], q: float) -> float:
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * len(xs)))] if xs else 0.0
+
+
+class _Client:
+    """Same call shape for the Flask test client and a real HTTP server."""
+
+    def __init__(self, app=None, base_url: Optional[str] = None):
+        self.app = app
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, headers: dict, body: Optional[dict]) -> int:
+        if self.base_url is None:
+            client = getattr(self._local, "client", None)
+            if client is None:
+                client = self._local.client = self.app.test_client()
+            return client.open(path, method=method, headers=headers, json=body).status_code
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method, headers={
+            **headers, **({"Content-Type": "application/json"} if data else {})})
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                resp.read()
+                return resp.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+Scenario = Tuple[str, str, Callable[[int], Optional[dict]]]   # (method, path, body(user_id))
+
+
+def _get_scenarios(app) -> List[Scenario]:
+    out = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if (rule.rule.startswith("/api/v1/") and "GET" in rule.methods and not rule.arguments
+                and rule.rule not in _SKIP_GET):
+            out.append(("GET", rule.rule, lambda uid: None))
+    return out
+
+
+def _write_scenarios(password: str, n_features: int) -> List[Scenario]:
+    return [
+        ("POST", "/api/v1/auth/login", lambda uid: {"email": f"bench{uid}@example.test", "password": password}),
+        ("POST", "/api/v1/transactions", lambda uid: {
+            "user_id": uid, "type": "expense", "amount_cents": random.randint(200, 6000),
+            "merchant": random.choice(("Starbucks", "Kroger", "Uber", "Amazon")),
+        }),
+        ("POST", "/api/v1/ml/predict", lambda uid: {"features": [random.random() for _ in range(n_features)]}),
+    ]
+
+
+def run_endpoint(client: _Client, scenario: Scenario, users: List[int], tokens: Dict[int, str],
+                 requests: int, concurrency: int) -> dict:
+    method, path, body = scenario
+    lat: List[float] = []
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+    left = [requests]
+
+    def worker(seed: int):
+        rnd = random.Random(seed)
+        while True:
+            with lock:
+                if left[0] <= 0:
+                    return
+                left[0] -= 1
+            uid = rnd.choice(users)
+            url = f"{path}?user_id={uid}" if method == "GET" else path
+            headers = {"Authorization": f"Bearer {tokens[uid]}"}
+            t0 = time.perf_counter()
+            try:
+                code = client.request(method, url, headers, body(uid))
+            except Exception:
+                code = 0
+            dt = (time.perf_counter() - t0) * 1000.0
+            with lock:
+                lat.append(dt)
+                statuses[code] = statuses.get(code, 0) + 1
+
+    t0 = time.perf_counter()
+    ts = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    wall = time.perf_counter() - t0
+    return {
+        "endpoint": f"{method} {path}",
+        "requests": len(lat),
+        "rps": len(lat) / wall if wall else 0.0,
+        "p50_ms": _pct(lat, 0.50),
+        "p95_ms": _pct(lat, 0.95),
+        "p99_ms": _pct(lat, 0.99),
+        "non_2xx": sum(n for c, n in statuses.items() if not 200 <= c < 300),
+        "statuses": {str(c): n for c, n in sorted(statuses.items())},
+    }
+
+
+def diff(results: List[dict], baseline: dict, tolerance: float) -> bool:
+    """Print the per-endpoint change vs baseline; True if anything regressed."""
+    base = {r["endpoint"]: r for r in baseline.get("results", [])}
+    regressed = False
+    print(f"\n{'endpoint':<44} {'p95 ms':>16} {'rps':>18}")
+    for r in results:
+        b = base.get(r["endpoint"])
+        if b is None:
+            print(f"{r['endpoint']:<44} {'(new)':>16}")
+            continue
+        dp = (r["p95_ms"] - b["p95_ms"]) / b["p95_ms"] if b["p95_ms"] else 0.0
+        dr = (r["rps"] - b["rps"]) / b["rps"] if b["rps"] else 0.0
+        bad = dp > tolerance or dr < -tolerance
+        regressed |= bad
+        print(f"{r['endpoint']:<44} {b['p95_ms']:>7.1f}->{r['p95_ms']:<7.1f} {dr:>+17.0%}"
+              f"{'  REGRESSED' if bad else ''}")
+    return regressed
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default=None, help="Database URI for in-process runs. Default: MYSQL_URI.")
+    ap.add_argument("--base-url", default=None, help="Drive a running server instead, e.g. http://localhost:5000")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=200, help="Requests per endpoint.")
+    ap.add_argument("--users", type=int, default=200, help="Synthetic users to draw from.")
+    ap.add_argument("--password", default="Bench-pass-1!")
+    ap.add_argument("--only", default=None, help="Substring filter on 'METHOD /path'.")
+    ap.add_argument("--out", default=None, help="Write results JSON here.")
+    ap.add_argument("--baseline", default=None, help="Diff against this results JSON.")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 / throughput regression.")
+    args = ap.parse_args()
+
+    if args.uri:
+        os.environ["MYSQL_URI"] = args.uri
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")    # the load is one client by design
+    random.seed(1)
+
+    from sqlalchemy import select
+
+    from app import create_app
+    from app.auth_utils import mint_access
+    from app.extensions import db
+    from app.models import User
+    from app.services.ml_loader import models
+
+    app = create_app()
+    with app.app_context():
+        users = [int(u) for u in db.session.execute(
+            select(User.id).where(User.email.like("bench%@example.test"), User.status == "active")
+            .order_by(User.id).limit(args.users)
+        ).scalars()]
+    if not users:
+        print("no synthetic users found; run bench/synth.py first", file=sys.stderr)
+        return 2
+    tokens = {uid: mint_access(uid) for uid in users}
+    n_features = int(getattr(models["tier3_late"], "n_features_in_", 0) or 1)
+
+    client = _Client(app=app, base_url=args.base_url)
+    scenarios = _get_scenarios(app) + _write_scenarios(args.password, n_features)
+    if args.only:
+        scenarios = [s for s in scenarios if args.only in f"{s[0]} {s[1]}"]
+
+    print(f"{len(users)} users, concurrency {args.concurrency}, {args.requests} requests/endpoint")
+    print(f"{'endpoint':<44} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'non2xx':>7}")
+    results = []
+    for sc in scenarios:
+        r = run_endpoint(client, sc, users, tokens, args.requests, args.concurrency)
+        results.append(r)
+        print(f"{r['endpoint']:<44} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+              f"{r['p99_ms']:>8.1f} {r['non_2xx']:>7}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as fh:
+            json.dump({
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "concurrency": args.concurrency, "requests": args.requests,
+                "users": len(users), "target": args.base_url or "in-process",
+                "results": results,
+            }, fh, indent=2)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            if diff(results, json.load(fh), args.tolerance):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+# bench/synth.py
+"""
+Synthetic SmartSpend data for benchmarks and load tests.
+
+Creates N active users with categories, monthly periods, a budget
+preference, a runway goal, bills, paychecks on their pay cadence and a
+daily expense history. Daily spend and the need / want / guilt mix are
+resampled from the bundled tier3_daily_risks CSV; day parts and moods
+follow the same skew the guilt rules look for (guilt spend leans late
+night and stressed). Everything is bulk-inserted with precomputed ids in
+executemany batches, so a 1k-user / 90-day set loads in seconds.
+
+Run from backend/:
+    python bench/synth.py --users 1000 --days 90 [--uri sqlite:////tmp/ss.db] [--create-schema]
+
+Every user's password is --password (default Bench-pass-1!) and their
+email is bench<id>@example.test. Never point --uri at a database with
+real users: ids continue after the current maxima but rows are inserted
+without further checks.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMEZONES = ("America/New_York", "America/Chicago", "America/Denver", "America/Los_Angeles")
+INCOME_CATS = ("Salary", "Bonus", "Interest", "Other Income")
+# expense category -> (spend class it mostly carries, merchants)
+EXPENSE_CATS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "Food": ("need", ("Kroger", "Trader Joe's", "Walmart Grocery", "Aldi")),
+    "Rent": ("need", ("Landlord",)),
+    "Transport": ("need", ("Shell", "Uber", "Metro Card")),
+    "Bills": ("need", ("Comcast", "ConEd", "Verizon")),
+    "Health": ("need", ("CVS", "Walgreens")),
+    "Entertainment": ("want", ("Netflix", "AMC", "Steam", "Spotify")),
+    "Misc": ("want", ("Amazon", "Target", "Starbucks", "Chipotle")),
+}
+BILLS = (("Rent", 90_000, 150_000), ("Phone", 3_000, 9_000), ("Internet", 4_000, 8_000),
+         ("Streaming", 1_000, 2_500), ("Gym", 2_000, 6_000))
+CADENCES = ("weekly", "biweekly", "monthly")
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# local hour ranges per day part, and day-part / mood weights per spend class
+_PART_HOURS = {"morning": (6, 11), "afternoon": (12, 15), "evening": (16, 21), "late_night": (22, 27)}
+_PARTS = ("morning", "afternoon", "evening", "late_night")
+_PART_W = {"need": (0.35, 0.35, 0.25, 0.05), "want": (0.15, 0.30, 0.40, 0.15), "guilt": (0.05, 0.15, 0.35, 0.45)}
+_MOODS = ("happy", "neutral", "stressed")
+_MOOD_W = {"need": (0.2, 0.65, 0.15), "want": (0.5, 0.35, 0.15), "guilt": (0.1, 0.25, 0.65)}
+
+
+def load_profiles(csv_dir: str = BACKEND) -> Tuple[List[float], List[Tuple[float, float, float]]]:
+    """(daily spend dollars, (need, want, guilt) ratio triples) from tier3_daily_risks*.csv."""
+    spend, mix = [], []
+    for path in glob.glob(os.path.join(csv_dir, "tier3_daily_risks*.csv")):
+        with open(path, newline="") as fh:
+            for row in csv.DictReader(fh):
+                try:
+                    s = float(row["spend_d"])
+                    r = tuple(float(row[k] or 0) for k in ("need_ratio", "want_ratio", "guilt_ratio"))
+                except (KeyError, ValueError):
+                    continue
+                if s > 0 and math.isfinite(s):
+                    spend.append(s)
+                if sum(r) > 0.5:
+                    mix.append(r)
+    if not spend:
+        spend = [40.0, 60.0, 80.0, 120.0]
+    if not mix:
+        mix = [(0.5, 0.35, 0.15)]
+    return spend, mix
+
+
+def _local_to_utc(d: date, hour: int, minute: int, tz) -> datetime:
+    local = datetime(d.year, d.month, d.day, tzinfo=tz) + timedelta(hours=hour, minutes=minute)
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _paydays(cadence: str, anchor: date, start: date, end: date) -> List[date]:
+    out = []
+    if cadence == "monthly":
+        y, m = start.year, start.month
+        while date(y, m, 1) <= end:
+            d = date(y, m, min(anchor.day, 28))
+            if start <= d <= end:
+                out.append(d)
+            y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    else:
+        step = 7 if cadence == "weekly" else 14
+        d = anchor
+        while d > start:
+            d -= timedelta(days=step)
+        while d <= end:
+            if d >= start:
+                out.append(d)
+            d += timedelta(days=step)
+    return out
+
+
+def _next_id(db, table) -> int:
+    from sqlalchemy import func, select
+
+    return int(db.session.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+class _Batches:
+    """Per-table row buffers flushed with one executemany each."""
+
+    def __init__(self, db, batch_size: int):
+        self.db = db
+        self.batch_size = batch_size
+        self.rows: Dict[object, list] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, table, row: dict) -> None:
+        buf = self.rows.setdefault(table, [])
+        buf.append(row)
+        if len(buf) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table=None) -> None:
+        for t in ([table] if table is not None else list(self.rows)):
+            buf = self.rows.get(t)
+            if buf:
+                self.db.session.execute(t.insert(), buf)
+                self.counts[t.name] = self.counts.get(t.name, 0) + len(buf)
+                self.rows[t] = []
+        self.db.session.commit()
+
+
+def generate(db, users: int, days: int, seed: int = 1, password: str = "Bench-pass-1!",
+             batch_size: int = 10_000, end: date = None) -> dict:
+    """Insert the synthetic set through the app's `db`; returns row counts per table."""
+    from app.auth_utils import hash_password
+    from app.models import Bill, BudgetPref, Category, GoalRunway, MonthlyPeriod, Transaction, User
+    from app.utils.tz import get_zoneinfo, local_fields
+
+    rnd = random.Random(seed)
+    spend_samples, mix_samples = load_profiles()
+    end = end or date.today()
+    start = end - timedelta(days=days - 1)
+    now = datetime.utcnow()
+    pw_hash = hash_password(password)     # one PBKDF2 for everyone
+
+    T = {m: m.__table__ for m in (User, BudgetPref, GoalRunway, Category, MonthlyPeriod, Transaction, Bill)}
+    ids = {m: _next_id(db, t) for m, t in T.items()}
+
+    def nid(key):
+        ids[key] += 1
+        return ids[key] - 1
+
+    out = _Batches(db, batch_size)
+    first_uid = ids[User]
+    for _ in range(users):
+        uid = nid(User)
+        tzname = rnd.choice(TIMEZONES)
+        tz = get_zoneinfo(tzname)
+        out.add(T[User], {
+            "id": uid, "name": f"Bench User {uid}", "email": f"bench{uid}@example.test",
+            "password_hash": pw_hash, "status": "active", "timezone": tzname,
+            "created_at": now, "updated_at": now,
+        })
+
+        cadence = rnd.choices(CADENCES, weights=(0.2, 0.45, 0.35))[0]
+        anchor = start + timedelta(days=rnd.randrange(14))
+        daily_budget = rnd.choice(spend_samples)
+        per_check = {"weekly": 7, "biweekly": 14, "monthly": 30}[cadence] * daily_budget * rnd.uniform(1.0, 1.3)
+        out.add(T[BudgetPref], {
+            "id": nid(BudgetPref), "user_id": uid, "pay_cadence": cadence,
+            "pay_anchor_day_of_month": anchor.day if cadence == "monthly" else None,
+            "pay_anchor_weekday": WEEKDAYS[anchor.weekday()] if cadence == "weekly" else None,
+            "biweekly_anchor_date": anchor if cadence == "biweekly" else None,
+            "expected_amount_cents": int(per_check * 100), "expected_amount_cadence": cadence,
+            "created_at": now, "updated_at": now,
+        })
+        out.add(T[GoalRunway], {
+            "id": nid(GoalRunway), "user_id": uid, "target_days": rnd.choice((30, 45, 60, 90)),
+            "effective_from": start, "effective_to": None,
+        })
+
+        cat_ids = {}
+        for name in INCOME_CATS + tuple(EXPENSE_CATS):
+            cid = cat_ids[name] = nid(Category)
+            out.add(T[Category], {
+                "id": cid, "user_id": uid, "name": name,
+                "kind": "income" if name in INCOME_CATS else "expense",
+                "is_default": True, "created_at": now, "updated_at": now,
+            })
+        by_class = {k: [n for n, (c, _) in EXPENSE_CATS.items() if c == k] for k in ("need", "want")}
+        by_class["guilt"] = ["Misc", "Entertainment"]
+
+        periods = {}
+        m = date(start.year, start.month, 1)
+        while m <= end:
+            periods[m] = nid(MonthlyPeriod)
+            out.add(T[MonthlyPeriod], {
+                "id": periods[m], "user_id": uid, "month_utc": m,
+                "status": "active" if (m.year, m.month) == (end.year, end.month) else "closed",
+                "opening_income_cents": 0,
+            })
+            m = date(m.year + (m.month == 12), m.month % 12 + 1, 1)
+
+        def txn(typ, cents, when_utc, cat, spend_class=None, mood=None, merchant=None):
+            out.add(T[Transaction], {
+                "id": nid(Transaction), "user_id": uid,
+                "period_id": periods[date(when_utc.year, when_utc.month, 1)]
+                if date(when_utc.year, when_utc.month, 1) in periods else periods[min(periods)],
+                "type": typ, "amount_cents": int(cents), "occurred_at": when_utc, "timezone": tzname,
+                "spend_class": spend_class, "category_id": cat_ids[cat], "merchant": merchant,
+                "mood": mood, "created_at": when_utc, "updated_at": when_utc,
+                **local_fields(when_utc, tzname),
+            })
+
+        for d in _paydays(cadence, anchor, start, end):
+            txn("income", per_check * 100 * rnd.uniform(0.97, 1.03), _local_to_utc(d, 9, 0, tz), "Salary",
+                merchant="Payroll")
+
+        for d in (start + timedelta(days=i) for i in range(days)):
+            if rnd.random() < 0.12:       # no-spend day
+                continue
+            total = rnd.choice(spend_samples) * 100
+            need, want, guilt = rnd.choice(mix_samples)
+            n = max(1, min(8, int(rnd.expovariate(1 / 2.5)) + 1))
+            weights = [rnd.random() + 0.2 for _ in range(n)]
+            for w in weights:
+                cls = rnd.choices(("need", "want", "guilt"), weights=(need + 1e-6, want + 1e-6, guilt + 1e-6))[0]
+                part = rnd.choices(_PARTS, weights=_PART_W[cls])[0]
+                lo, hi = _PART_HOURS[part]
+                cat = rnd.choice(by_class[cls])
+                txn("expense", max(100, total * w / sum(weights)),
+                    _local_to_utc(d, rnd.randint(lo, hi), rnd.randrange(60), tz), cat,
+                    spend_class=cls, mood=rnd.choices(_MOODS, weights=_MOOD_W[cls])[0],
+                    merchant=rnd.choice(EXPENSE_CATS[cat][1]))
+
+        for name, lo, hi in rnd.sample(BILLS, rnd.randint(2, len(BILLS))):
+            out.add(T[Bill], {
+                "id": nid(Bill), "user_id": uid, "name": name, "amount_cents": rnd.randint(lo, hi),
+                "recurrence_rule": "monthly", "status": "active",
+                "next_due_date": end + timedelta(days=rnd.randint(1, 28)),
+            })
+
+    out.flush()
+    return {"first_user_id": first_uid, "last_user_id": ids[User] - 1, "rows": out.counts}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default=None, help="Database URI. Default: MYSQL_URI from the environment.")
+    ap.add_argument("--users", type=int, default=100)
+    ap.add_argument("--days", type=int, default=90)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--batch-size", type=int, default=10_000)
+    ap.add_argument("--password", default="Bench-pass-1!")
+    ap.add_argument("--create-schema", action="store_true", help="db.create_all() first.")
+    args = ap.parse_args()
+
+    if args.uri:
+        os.environ["MYSQL_URI"] = args.uri
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app()
+    with app.app_context():
+        if args.create_schema:
+            db.create_all()
+        t0 = time.perf_counter()
+        res = generate(db, args.users, args.days, args.seed, args.password, args.batch_size)
+        dt = time.perf_counter() - t0
+    total = sum(res["rows"].values())
+    print(f"users {res['first_user_id']}..{res['last_user_id']}: {total:,} rows in {dt:.1f}s "
+          f"({total / dt:,.0f} rows/s)")
+    for name, n in sorted(res["rows"].items()):
+        print(f"  {name:<16} {n:>10,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
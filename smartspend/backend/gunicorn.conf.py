@@ -0,0 +1,78 @@
+# gunicorn.conf.py
+#   gunicorn -c gunicorn.conf.py wsgi:app
+#
+# With preload (the default) the master imports wsgi and when_ready loads
+# every model once (they are lazy otherwise, see services/ml_loader.py);
+# workers then share those pages copy-on-write. gc.freeze()
+# moves everything allocated so far into the permanent generation so the
+# collector never touches (and dirties) those objects in the workers.
+import gc
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:" + os.getenv("PORT", "5000"))
+# gunicorn's own default; each worker adds its own DB pool and password process
+# pool, so size WEB_CONCURRENCY against MySQL max_connections and CPU
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+accesslog = "-"
+
+
+def on_starting(server):
+    # behind a router every request arrives from the router's address; with
+    # no trusted hop configured all clients would share one auth rate-limit
+    # bucket (and refresh tokens would record the router's IP)
+    if os.getenv("RATE_LIMIT_ENABLED", "1") == "1" and os.getenv("TRUSTED_PROXIES") is None:
+        raise RuntimeError(
+            "TRUSTED_PROXIES is not set: set it to the number of proxies in front of "
+            "gunicorn (1 behind the Procfile router, 0 when clients connect directly)"
+        )
+
+
+def when_ready(server):
+    # runs in the master after the app is loaded, before any worker forks
+    if preload_app:
+        from app.services import ml_loader
+
+        ml_loader.preload()
+        gc.collect()
+        gc.freeze()
+        server.log.info("preloaded app; froze %d objects before fork", gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    # never share pooled DB connections opened in the master
+    from app.extensions import db
+    app = worker.app.wsgi()
+    with app.app_context():
+        # every bind: WARMUP_ON_START also fills the replica's pool in the master
+        for engine in {id(e): e for e in db.engines.values()}.values():
+            engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    # refuse to serve against a schema the ORM cannot insert into
+    from app.extensions import db
+    from app.utils.schema import require_plain_local_fields
+
+    with worker.app.wsgi().app_context():
+        require_plain_local_fields(db.session)
+
+    if os.getenv("WARMUP_ON_START", "0") == "1":
+        # create_app already warmed up; a worker forked from a preloaded master
+        # still has to prime its own pool (the other steps are no-ops)
+        from app.services.warmup import warm_up
+
+        with worker.app.wsgi().app_context():
+            warm_up()
+
+    from app.utils.memory import process_memory
+
+    mem = process_memory(os.getpid())
+    if mem:
+        worker.log.info(
+            "worker %s: shared %d kB, private %d kB", worker.pid, mem["shared_kb"], mem["private_kb"]
+        )
@@ -0,0 +1,61 @@
+# tests/conftest.py
+"""
+Fixtures for the backend tests: an app from create_app() on a private
+in-memory SQLite database (tables created by create_app), a test client,
+and helpers to create users. Runs with `python -m pytest` from backend/.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+# before anything imports app.config (load_dotenv never overrides these)
+os.environ.update(
+    MYSQL_URI="sqlite://",
+    PASSWORD_POOL_WORKERS="0",
+    PASSWORD_PBKDF2_ROUNDS="1000",
+    WARMUP_ON_START="0",
+    TRUSTED_PROXIES="0",
+)
+os.environ.pop("MYSQL_REPLICA_URI", None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.services import rate_limit  # noqa: E402
+from app.utils.cache import all_caches  # noqa: E402
+
+PASSWORD = "Test-pass-1!"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_process_state():
+    # caches and rate-limit buckets are per process; ids repeat across test DBs
+    for cache in all_caches():
+        cache.clear()
+    rate_limit.set_backend(None)
+    yield
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def signup(client, email: str = "ana@example.test", name: str = "Ana") -> dict:
+    """Sign up through the API; returns the response JSON (user, access)."""
+    res = client.post("/api/v1/auth/signup", json={"name": name, "email": email, "password": PASSWORD})
+    assert res.status_code == 201, res.get_json()
+    return res.get_json()
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
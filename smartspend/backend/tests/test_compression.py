@@ -0,0 +1,74 @@
+# tests/test_compression.py
+import gzip
+import json
+
+import pytest
+
+from app.utils import compression
+from app.utils.compression import choose_encoding
+from app.utils.json_stream import json_list_response
+
+
+@pytest.fixture
+def client(app):
+    @app.get("/_test/big")
+    def big():
+        return {"items": [{"merchant": "Kroger", "memo": "weekly groceries", "i": i} for i in range(100)]}
+
+    @app.get("/_test/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/_test/stream")
+    def stream():
+        return json_list_response({"page": 1}, "items", ({"i": i} for i in range(500)))
+
+    return app.test_client()
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("gzip, deflate", "gzip"),
+    ("*", "gzip"),
+    ("gzip;q=0", None),
+    ("*;q=0", None),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_br_preferred_only_when_brotli_is_installed(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding("br, gzip") == "gzip"
+    assert choose_encoding("br") is None
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding("br, gzip") == "br"
+    assert choose_encoding("br;q=0.5, gzip") == "gzip"
+
+
+def test_large_json_is_gzipped_and_round_trips(client):
+    plain = client.get("/_test/big")
+    zipped = client.get("/_test/big", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in plain.headers
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in zipped.headers["Vary"]
+    assert len(zipped.data) < len(plain.data)
+    assert gzip.decompress(zipped.data) == plain.data
+
+
+def test_small_bodies_stay_uncompressed(client):
+    res = client.get("/_test/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in res.headers
+    assert res.get_json() == {"ok": True}
+
+
+def test_streamed_list_is_compressed_chunk_by_chunk(client):
+    plain = client.get("/_test/stream")
+    zipped = client.get("/_test/stream", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in zipped.headers
+    body = gzip.decompress(zipped.data)
+    assert body == plain.data
+    assert json.loads(body) == {"items": [{"i": i} for i in range(500)], "page": 1}
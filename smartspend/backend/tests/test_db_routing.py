@@ -0,0 +1,89 @@
+# tests/test_db_routing.py
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.utils import db_routing
+from conftest import bearer, signup
+
+
+@pytest.fixture
+def routed(tmp_path, monkeypatch):
+    """App with a file primary and a "replica" that is a copy taken on demand."""
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{primary}")
+    monkeypatch.setattr(Config, "SQLALCHEMY_BINDS", {"replica": f"sqlite:///{replica}"})
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+    def sync_replica():
+        src, dst = sqlite3.connect(primary), sqlite3.connect(replica)
+        src.backup(dst)
+        src.close()
+        dst.close()
+
+    def on_replica(sql, **params):
+        with app.app_context(), db.engines["replica"].begin() as conn:
+            conn.execute(text(sql), params)
+
+    yield app, app.test_client(), sync_replica, on_replica
+    # init_app registered an (empty) metadata for the bind on the shared db
+    db.metadatas.pop("replica", None)
+
+
+def _merchants(client, token):
+    res = client.get("/api/v1/transactions", headers=bearer(token))
+    assert res.status_code == 200
+    return sorted(t["merchant"] for t in res.get_json()["items"])
+
+
+def test_gets_read_the_replica_and_writers_stick_to_the_primary(routed):
+    app, client, sync_replica, on_replica = routed
+    token = signup(client)["access"]
+    res = client.post("/api/v1/transactions", headers=bearer(token),
+                      json={"type": "expense", "amount_cents": 500, "merchant": "Kroger"})
+    assert res.status_code == 201
+    sync_replica()
+    on_replica("UPDATE `transaction` SET merchant = 'Lagging copy'")
+    db_routing._recent_writers.clear()
+
+    assert _merchants(client, token) == ["Lagging copy"]
+
+    client.post("/api/v1/transactions", headers=bearer(token),
+                json={"type": "expense", "amount_cents": 700, "merchant": "Uber"})
+    # the write marked the user: their next GETs see the primary
+    assert _merchants(client, token) == ["Kroger", "Uber"]
+
+
+def test_signup_marks_the_new_user_sticky(routed):
+    app, client, sync_replica, _ = routed
+    sync_replica()      # replica without the user
+    body = signup(client)
+    assert db_routing._recent_writers.get(body["user"]["id"]) is not None
+    res = client.get("/api/v1/dashboard/kpis", headers=bearer(body["access"]))
+    assert res.status_code == 200
+
+
+def test_identity_miss_on_the_replica_retries_the_primary(routed):
+    app, client, sync_replica, _ = routed
+    sync_replica()
+    token = signup(client)["access"]
+    db_routing._recent_writers.clear()     # e.g. the GET lands on another worker
+    res = client.get("/api/v1/dashboard/kpis", headers=bearer(token))
+    assert res.status_code == 200
+
+
+def test_non_get_requests_never_use_the_replica(routed):
+    app, client, sync_replica, on_replica = routed
+    token = signup(client)["access"]
+    sync_replica()
+    on_replica("DELETE FROM user")
+    db_routing._recent_writers.clear()
+    res = client.post("/api/v1/transactions", headers=bearer(token),
+                      json={"type": "income", "amount_cents": 100})
+    assert res.status_code == 201
@@ -0,0 +1,85 @@
+# tests/test_json_provider.py
+import dataclasses
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils.json_provider import OrjsonProvider, orjson
+
+pytestmark = pytest.mark.skipif(orjson is None, reason="orjson not installed")
+
+COMPACT = (",", ":")
+
+
+@dataclasses.dataclass
+class Point:
+    d: str
+    burn_cents: int
+
+
+PAYLOAD = {
+    "zeta": 1,
+    "alpha": {"b": [1, 2.5, None, True, False], "a": "x"},
+    "when": datetime(2025, 3, 9, 23, 45, 1),
+    "when_utc": datetime(2025, 3, 9, 23, 45, 1, tzinfo=timezone.utc),
+    "day": date(2025, 3, 9),
+    "amount": Decimal("12.30"),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "point": Point("3/9", 1200),
+    "items": [{"id": i, "amount": i / 4, "merchant": f"m{i}"} for i in range(50)],
+    "big": 2 ** 53,
+    "empty": {},
+}
+
+
+@pytest.fixture
+def providers(app):
+    assert isinstance(app.json, OrjsonProvider)
+    return app.json, DefaultJSONProvider(app)
+
+
+def test_compact_dumps_match_stdlib_byte_for_byte(providers):
+    fast, std = providers
+    assert fast.dumps(PAYLOAD, separators=COMPACT) == std.dumps(PAYLOAD, separators=COMPACT)
+
+
+def test_responses_match_stdlib(app, providers):
+    fast, std = providers
+    with app.test_request_context():
+        a, b = fast.response(PAYLOAD), std.response(PAYLOAD)
+    assert a.data == b.data
+    assert a.mimetype == b.mimetype == "application/json"
+
+
+def test_non_ascii_is_utf8_but_parses_the_same(providers):
+    fast, std = providers
+    obj = {"merchant": "Café Ünïcode ✓"}
+    assert fast.dumps(obj, separators=COMPACT) == '{"merchant":"Café Ünïcode ✓"}'
+    assert json.loads(fast.dumps(obj)) == json.loads(std.dumps(obj))
+
+
+def test_numpy_values_serialize_like_python_numbers(providers):
+    fast, std = providers
+    obj = {"a": np.int64(7), "b": np.float64(0.25), "c": np.array([1, 2, 3])}
+    assert fast.dumps(obj, separators=COMPACT) == std.dumps({"a": 7, "b": 0.25, "c": [1, 2, 3]}, separators=COMPACT)
+
+
+def test_kwargs_and_indent_fall_back_to_stdlib(app, providers):
+    fast, std = providers
+    assert fast.dumps(PAYLOAD, indent=2) == std.dumps(PAYLOAD, indent=2)
+    assert fast.loads('{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+def test_view_output_is_identical_with_either_provider(app, client):
+    @app.get("/_test/payload")
+    def payload():
+        return PAYLOAD
+
+    fast = client.get("/_test/payload").data
+    app.json = DefaultJSONProvider(app)
+    assert client.get("/_test/payload").data == fast
@@ -0,0 +1,58 @@
+# tests/test_nwg_classifier.py
+import pytest
+
+from app.services.nwg_classifier import SpendClassifier, get_classifier
+
+NWG = {
+    "needs_keywords": ["rent", "food", "grocery", "bill", "insurance"],
+    "wants_keywords": ["movie", "shopping", "restaurant", "fun"],
+    "guilt_keywords": ["late night", "impulse", "regret"],
+}
+GUILT = {"threshold_amount": 50, "late_night_start": 22, "emotion_keywords": ["sad", "angry", "stressed"]}
+
+
+@pytest.fixture(scope="module")
+def clf():
+    return SpendClassifier(NWG, GUILT)
+
+
+@pytest.mark.parametrize("merchant, memo, expected", [
+    ("Kroger Grocery", None, "need"),
+    ("City", "monthly RENT", "need"),
+    ("AMC", "movies with friends", "want"),        # plural suffix
+    ("Shop", "impulse buy", "guilt"),
+    ("Bar", "late   night snack", "guilt"),        # any whitespace inside a phrase
+    ("Shop", "grocery run, regret it", "guilt"),   # guilt keywords beat needs
+    ("Funko", None, None),                         # whole words only
+    (None, None, None),
+])
+def test_keywords(clf, merchant, memo, expected):
+    assert clf.classify(merchant, memo) == expected
+
+
+def test_late_night_over_threshold_is_guilt_unless_a_need(clf):
+    assert clf.classify("AMC", "movie", 6000, local_hour=23) == "guilt"
+    assert clf.classify("AMC", "movie", 6000, local_hour=3) == "guilt"
+    assert clf.classify("AMC", "movie", 4999, local_hour=23) == "want"
+    assert clf.classify("AMC", "movie", 6000, local_hour=4) == "want"
+    assert clf.classify("Kroger", "grocery", 6000, local_hour=23) == "need"
+
+
+def test_emotion_keyword_or_mood_is_guilt(clf):
+    assert clf.classify("Mall", "shopping when sad") == "guilt"
+    assert clf.classify("Mall", "shopping", mood="stressed") == "guilt"
+    assert clf.classify("Mall", "shopping", mood="happy") == "want"
+
+
+def test_classify_many_reads_the_hour_from_local_occurred_at(clf):
+    rows = [
+        {"merchant": "AMC", "memo": "movie", "amount_cents": 6000, "local_occurred_at": "2025-01-01T23:30:00"},
+        {"merchant": "AMC", "memo": "movie", "amount_cents": 6000, "local_hour": 12},
+    ]
+    assert clf.classify_many(rows) == ["guilt", "want"]
+
+
+def test_shipped_rules_load():
+    clf = get_classifier()
+    assert clf.threshold_cents == 5000
+    assert clf.classify("Landlord", "rent") == "need"
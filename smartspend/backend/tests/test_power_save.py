@@ -0,0 +1,50 @@
+# tests/test_power_save.py
+import numpy as np
+
+from app.services.power_save import evaluate, trigger_threshold
+from conftest import bearer, signup
+
+
+def test_rule_triggers_at_or_below_the_threshold_ratio():
+    res = evaluate(
+        goal_days=np.array([30, 30, 30, 30]),
+        balance_cents=np.array([2100, 2200, 100_000, 5000]),
+        burn_cents=np.array([100, 100, 100, 0]),
+        threshold=0.3,
+    )
+    # runway 21, 22 and 1000 days against a 30-day goal; no burn never triggers
+    assert res["triggered"].tolist() == [True, False, False, False]
+    assert res["threshold_ratio"][0] == 0.7
+    assert res["suggested_daily_budget_cents"].tolist() == [70, 73, 3333, 166]
+
+
+def test_negative_balance_gets_no_budget():
+    res = evaluate(np.array([10]), np.array([-500]), np.array([50]), threshold=0.3)
+    assert res["triggered"].tolist() == [True]
+    assert res["suggested_daily_budget_cents"].tolist() == [0]
+
+
+def test_shipped_threshold():
+    assert trigger_threshold() == 0.3
+
+
+def test_transaction_writes_record_and_clear_the_event(client):
+    token = signup(client)["access"]
+
+    def post(kind, cents):
+        res = client.post("/api/v1/transactions", headers=bearer(token),
+                          json={"type": kind, "amount_cents": cents})
+        assert res.status_code == 201
+        return res.get_json()
+
+    post("income", 3000)
+    body = post("expense", 2700)
+    # balance 300, burn 2700 // 30 = 90 a day: 3.3 days against the default 30
+    assert body["power_save"]["triggered"] is True
+    state = client.get("/api/v1/goals/power-save", headers=bearer(token)).get_json()
+    assert state["triggered"] is True
+    assert state["suggested_daily_budget_cents"] == 10
+
+    body = post("income", 1_000_000)
+    assert body["power_save"] is None
+    assert client.get("/api/v1/goals/power-save", headers=bearer(token)).get_json()["triggered"] is False
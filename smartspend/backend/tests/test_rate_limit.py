@@ -0,0 +1,57 @@
+# tests/test_rate_limit.py
+from app.config import Config
+from app.services import rate_limit
+from app.services.rate_limit import MemoryBackend, RateLimiter
+
+
+def test_bucket_spends_burst_then_refills():
+    b = MemoryBackend()
+    assert b.take("k", 2, 1.0, now=0.0) == (True, 0.0)
+    assert b.take("k", 2, 1.0, now=0.0) == (True, 0.0)
+    ok, wait = b.take("k", 2, 1.0, now=0.0)
+    assert not ok and wait == 1.0
+    assert b.take("k", 2, 1.0, now=1.0)[0]
+    assert b.take("other", 2, 1.0, now=0.0)[0]
+
+
+def test_memory_backend_drops_least_recent_keys():
+    b = MemoryBackend(max_keys=2)
+    for key in ("a", "b", "c"):
+        b.take(key, 1, 1.0, now=0.0)
+    assert b.take("a", 1, 1.0, now=0.0)[0]          # "a" was evicted: full bucket again
+    assert not b.take("c", 1, 1.0, now=0.0)[0]
+
+
+def test_failing_shared_backend_falls_back_to_memory():
+    class Down:
+        def take(self, *args):
+            raise ConnectionError("redis down")
+
+    limiter = RateLimiter(Down())
+    assert limiter.check([("auth_ip", "1.2.3.4", 1, 60.0)]) == 0.0
+    assert limiter.check([("auth_ip", "1.2.3.4", 1, 60.0)]) > 0.0
+
+
+def test_check_reports_the_longest_wait():
+    limiter = RateLimiter()
+    rules = [("a", "k", 1, 60.0), ("b", "k", 1, 6.0)]
+    limiter.check(rules)
+    assert 9.0 < limiter.check(rules) <= 10.0
+
+
+def test_login_is_throttled_per_email(client, monkeypatch):
+    monkeypatch.setattr(Config, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(Config, "RATE_LIMIT_AUTH_EMAIL_BURST", 2)
+    body = {"email": "nobody@example.test", "password": "wrong"}
+    assert [client.post("/api/v1/auth/login", json=body).status_code for _ in range(2)] == [401, 401]
+    res = client.post("/api/v1/auth/login", json=body)
+    assert res.status_code == 429
+    assert int(res.headers["Retry-After"]) >= 1
+    # another account from the same client still gets through
+    assert client.post("/api/v1/auth/login", json={**body, "email": "else@example.test"}).status_code == 401
+
+
+def test_disabled_limiter_never_waits(monkeypatch):
+    monkeypatch.setattr(Config, "RATE_LIMIT_ENABLED", False)
+    rate_limit.set_backend(None)
+    assert all(rate_limit.auth_wait("1.2.3.4", "a@b.c") == 0 for _ in range(100))
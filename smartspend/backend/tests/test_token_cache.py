@@ -0,0 +1,65 @@
+# tests/test_token_cache.py
+import time
+
+import jwt
+import pytest
+
+from app import auth_utils
+from app.auth_utils import access_cache_stats, decode_access_cached, mint_access
+from app.config import Config
+from conftest import bearer, signup
+
+
+def _token(**claims) -> str:
+    now = int(time.time())
+    payload = {"sub": "7", "iss": Config.JWT_ISS, "iat": now, "exp": now + 60, "scope": "app", **claims}
+    return jwt.encode(payload, Config.SECRET_KEY, algorithm="HS256")
+
+
+def test_verified_tokens_are_cached():
+    token = mint_access(7)
+    first = decode_access_cached(token)
+    hits = access_cache_stats()["hits"]
+    second = decode_access_cached(token)
+    assert first == second and first["sub"] == "7"
+    assert access_cache_stats()["hits"] == hits + 1
+
+
+def test_callers_get_a_copy():
+    token = mint_access(7)
+    decode_access_cached(token)["sub"] = "8"
+    assert decode_access_cached(token)["sub"] == "7"
+
+
+def test_cache_entry_lives_no_longer_than_the_token():
+    token = _token(exp=int(time.time()) + 2)
+    decode_access_cached(token)
+    expires = auth_utils._claims_cache._data[token][1]
+    assert expires - time.monotonic() <= 2
+
+
+@pytest.mark.parametrize("token", [
+    _token(exp=int(time.time()) - 10),
+    _token(iss="someone-else"),
+    _token() + "x",
+])
+def test_bad_tokens_raise_and_are_not_cached(token):
+    for _ in range(2):
+        with pytest.raises(jwt.InvalidTokenError):
+            decode_access_cached(token)
+    assert token not in auth_utils._claims_cache._data
+
+
+def test_size_zero_disables_the_cache(monkeypatch):
+    monkeypatch.setattr(Config, "ACCESS_CACHE_SIZE", 0)
+    token = mint_access(7)
+    decode_access_cached(token)
+    assert token not in auth_utils._claims_cache._data
+
+
+def test_requests_reuse_the_decoded_token(client):
+    token = signup(client)["access"]
+    client.get("/api/v1/dashboard/kpis", headers=bearer(token))
+    hits = access_cache_stats()["hits"]
+    assert client.get("/api/v1/dashboard/kpis", headers=bearer(token)).status_code == 200
+    assert access_cache_stats()["hits"] == hits + 1
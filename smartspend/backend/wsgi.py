@@ -1,4 +1,4 @@
 from app import create_app
 app = create_app()
 
-# gunicorn entry: gunicorn -w 4 -b 0.0.0.0:5000 wsgi:app
+# gunicorn entry: gunicorn -c gunicorn.conf.py wsgi:app (preloads models, see gunicorn.conf.py)